@@ -0,0 +1,80 @@
+"""Benchmark: element and charge balance of all reactions with rmmd.composition.
+
+Builds a mechanism with N species (alkanes and alkyl radicals) and M H-abstraction
+reactions between them, some of which are made unbalanced, and checks the balance of
+all reactions with ``rmmd.composition.check_balance``, which caches the
+stoichiometry matrices of the schema (see ``Schema.stoichiometry``).
+
+usage: python benchmarks/bench_balance.py [--n-species 5000] [--n-reactions 100000]
+"""
+
+import argparse
+import random
+import time
+
+from rmmd.composition import check_balance, composition_matrix, molecular_weights
+from rmmd.metadata import Metadata
+from rmmd.schema import EntityRegistry, ReactionRegistry, Schema, SpeciesRegistry
+from rmmd.species import MolecularEntity, Reaction, Species
+from rmmd.stoichiometry import stoichiometry_matrices
+
+
+def _entity(n_carbon: int, radical: bool) -> MolecularEntity:
+    n_hydrogen = 2 * n_carbon + (1 if radical else 2)
+    return MolecularEntity(
+        # not a real InChI, but a valid formula layer, which is all that is needed here
+        inchi_fixedh={"value": f"InChI=1/C{n_carbon}H{n_hydrogen}/c{n_carbon}"},
+        electronic_spin="unkown-electronic-ground-state",
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n-species", type=int, default=5000)
+    parser.add_argument("--n-reactions", type=int, default=100_000)
+    parser.add_argument("--unbalanced", type=float, default=0.01)
+    args = parser.parse_args()
+    rng = random.Random(0)
+
+    n_carbon = args.n_species // 2
+    entities = {
+        f"C{n}{'j' if radical else ''}": _entity(n, radical)
+        for n in range(1, n_carbon + 1)
+        for radical in (False, True)
+    }
+    species = {key: Species(entities=[key]) for key in entities}
+
+    reactions = {}
+    for i in range(args.n_reactions):
+        a, b = rng.randint(1, n_carbon), rng.randint(1, n_carbon)
+        # RH + R'j -> Rj + R'H
+        products = [f"C{a}j", f"C{b}"]
+        if rng.random() < args.unbalanced:
+            products[1] = f"C{b}j"
+        reactions[f"R{i}"] = Reaction(reactants=[f"C{a}", f"C{b}j"], products=products)
+
+    schema = Schema(
+        metadata=Metadata(license="MIT", title="benchmark"),
+        species=SpeciesRegistry.model_construct(species),
+        entities=EntityRegistry.model_construct(entities),
+        reactions=ReactionRegistry.model_construct(reactions),
+    )
+
+    for label, func in [
+        ("composition_matrix", composition_matrix),
+        ("molecular_weights", molecular_weights),
+        ("stoichiometry", stoichiometry_matrices),
+        ("check_balance", check_balance),
+        ("cached stoichiometry", Schema.stoichiometry),
+    ]:
+        start = time.perf_counter()
+        func(schema)
+        print(f"{label:<20} {(time.perf_counter() - start) * 1e3:8.1f} ms")
+
+    print(
+        f"({len(species)} species, {len(reactions)} reactions, {len(check_balance(schema))} unbalanced)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Benchmark: equilibrium constants and reverse rates with rmmd.equilibrium.
+
+Builds a mechanism with N species with random two-range NASA7 polynomials and M
+bimolecular reactions with modified Arrhenius rate coefficients, then computes ΔG°,
+Kp, Kc and the reverse rate coefficients of all reactions at K temperatures.
+
+usage: python benchmarks/bench_equilibrium.py [--n-species 2000] [--n-reactions 20000]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from bench_thermo_eval import synthetic_thermo_schema
+from rmmd.equilibrium import EquilibriumBank
+from rmmd.schema import ReactionRegistry, SpeciesRegistry
+from rmmd.species import Reaction, Species
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n-species", type=int, default=2_000)
+    parser.add_argument("--n-reactions", type=int, default=20_000)
+    parser.add_argument("--n-temps", type=int, default=100)
+    args = parser.parse_args()
+    rng = np.random.default_rng(0)
+
+    schema = synthetic_thermo_schema(args.n_species)
+    schema.species = SpeciesRegistry.model_construct(
+        {
+            f"S{i}": Species(entities=[f"S{i}"], thermo=[key])
+            for i, key in enumerate(schema.thermo)
+        }
+    )
+    schema.rate_constants = type(schema.rate_constants).model_validate(
+        {"k": {"type": "modified Arrhenius", "A": 1e7, "b": 1.5, "Ea": 4e4}}
+    )
+    reactions = {}
+    for i, (a, b, c, d) in enumerate(
+        rng.integers(args.n_species, size=(args.n_reactions, 4)).tolist()
+    ):
+        reactions[f"R{i}"] = Reaction(
+            reactants=[f"S{a}", f"S{b}"],
+            products=[f"S{c}", f"S{d}"],
+            rate_constants=["k"],
+        )
+    schema.reactions = ReactionRegistry.model_construct(reactions)
+    T = np.linspace(300.0, 3000.0, args.n_temps)
+
+    start = time.perf_counter()
+    bank = EquilibriumBank.from_schema(schema)
+    print(f"{'from_schema':<26} {(time.perf_counter() - start) * 1e3:8.1f} ms")
+
+    start = time.perf_counter()
+    bank.evaluate(T)
+    print(f"{'evaluate':<26} {(time.perf_counter() - start) * 1e3:8.1f} ms")
+
+    start = time.perf_counter()
+    bank.reverse_rate_coefficients(T, p=1e5)
+    print(
+        f"{'reverse_rate_coefficients':<26} {(time.perf_counter() - start) * 1e3:8.1f} ms"
+    )
+    print(f"({args.n_species} species, {args.n_reactions} reactions, {args.n_temps} T)")
+
+
+if __name__ == "__main__":
+    main()
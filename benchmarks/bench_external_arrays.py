@@ -0,0 +1,48 @@
+"""Benchmark: loading RMMD files with inline vs. external (.npy) arrays.
+
+Uses the synthetic dataset from bench_yaml_loader.py (IRC scans and rate tables),
+writes it once with all arrays inline and once with arrays stored in .npy files, and
+reports the file sizes and the time for ``rmmd.io.load``.
+
+usage: python benchmarks/bench_external_arrays.py [--size-mb 5]
+"""
+
+import argparse
+import tempfile
+from pathlib import Path
+
+from bench_yaml_loader import _time, synthetic_rmmd_yaml
+
+from rmmd import io
+from rmmd.arrays import externalize_arrays
+
+
+def _size_mb(directory: Path) -> float:
+    return sum(p.stat().st_size for p in directory.rglob("*") if p.is_file()) / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=float, default=5.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--min-size", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        inline_dir, external_dir = Path(tmp, "inline"), Path(tmp, "external")
+        inline_dir.mkdir()
+        external_dir.mkdir()
+
+        (inline_dir / "data.yaml").write_text(synthetic_rmmd_yaml(args.size_mb))
+        schema = io.load(inline_dir / "data.yaml")
+        n_arrays = externalize_arrays(schema, external_dir, min_size=args.min_size)
+        io.dump(schema, external_dir / "data.yaml")
+
+        print(f"{n_arrays} arrays with at least {args.min_size} elements externalized")
+        for name, directory in [("inline", inline_dir), ("external", external_dir)]:
+            t = _time(lambda: io.load(directory / "data.yaml"), args.repeat)
+            print(f"{name:<9} size: {_size_mb(directory):7.2f} MB, io.load: {t:7.3f} s")
+
+
+if __name__ == "__main__":
+    main()
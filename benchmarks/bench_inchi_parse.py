@@ -0,0 +1,68 @@
+"""Benchmark: constitution and charge of many molecular entities.
+
+Builds N molecular entities with M distinct InChIs and sums up their constitutions
+and charges, once parsing the InChI of each entity separately (``parse_inchi``
+without its cache) and once with the interned results of ``rmmd.inchi.parse_inchi``.
+
+usage: python benchmarks/bench_inchi_parse.py [--n-items 100000] [--n-distinct 2000]
+"""
+
+import argparse
+import time
+from collections import Counter
+
+from rmmd.inchi import parse_inchi
+from rmmd.species import MolecularEntity
+
+
+def _inchi(i: int) -> str:
+    """InChI of a (hypothetical) charged alkane-like molecule with i carbon atoms"""
+    return f"InChI=1/C{i + 1}H{2 * i + 4}O2/c1-2(3)4/h1H3,(H,3,4)/p-1/fC2H3O2/h3h/q-1"
+
+
+def _total(entities: list[MolecularEntity], parse) -> tuple[Counter, int]:
+    elements: Counter = Counter()
+    charge = 0
+    for entity in entities:
+        parsed = parse(entity.inchi_fixedh.value)
+        elements.update(parsed.constitution)
+        charge += parsed.charge
+    return elements, charge
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n-items", type=int, default=100_000)
+    parser.add_argument("--n-distinct", type=int, default=2000)
+    args = parser.parse_args()
+
+    templates = [
+        MolecularEntity(
+            inchi_fixedh={"value": _inchi(i)},
+            electronic_spin="unkown-electronic-ground-state",
+        )
+        for i in range(args.n_distinct)
+    ]
+    entities = [
+        templates[i % args.n_distinct].model_copy() for i in range(args.n_items)
+    ]
+
+    start = time.perf_counter()
+    expected = _total(entities, parse_inchi.__wrapped__)
+    uncached = time.perf_counter() - start
+    print(f"{'parse every entity':<20} {uncached * 1e3:8.1f} ms")
+
+    parse_inchi.cache_clear()
+    start = time.perf_counter()
+    result = _total(entities, parse_inchi)
+    cached = time.perf_counter() - start
+    print(
+        f"{'interned':<20} {cached * 1e3:8.1f} ms  (speedup {uncached / cached:4.1f})"
+    )
+    assert result == expected
+
+    print(f"({args.n_items} entities, {args.n_distinct} distinct InChIs)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Benchmark: batched evaluation of rate coefficients with rmmd.kinetics_eval.
+
+Evaluates N rate coefficients (a mix of modified Arrhenius expressions, PLOG
+expressions and rate tables) at M state points with a KineticsBank and, for
+comparison, with a per-reaction Python loop over a subset of the reactions.
+
+usage: python benchmarks/bench_kinetics_eval.py [--n-reactions 10000] [--n-states 1000]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from rmmd.kinetics_eval import R, KineticsBank
+from rmmd.schema import Schema
+
+
+def synthetic_kinetics_schema(n_reactions: int) -> Schema:
+    """Dataset with *n_reactions* random rate coefficients of all evaluable types."""
+    rng = np.random.default_rng(0)
+    pressures = [1e3, 1e4, 1e5, 1e6]
+    T_grid = [300.0, 500.0, 1000.0, 1500.0, 2000.0, 2500.0]
+    rate_constants = {}
+    for i in range(n_reactions):
+        if i % 3 == 0:
+            item = {
+                "type": "modified Arrhenius",
+                "A": 10 ** rng.uniform(5, 13),
+                "b": rng.uniform(-1, 2),
+                "Ea": rng.uniform(0, 2e5),
+            }
+        elif i % 3 == 1:
+            item = {
+                "type": "pressure-dependent Arrhenius",
+                "p": pressures,
+                "A": (10 ** rng.uniform(5, 13, 4)).tolist(),
+                "b": rng.uniform(-1, 2, 4).tolist(),
+                "Ea": rng.uniform(0, 2e5, 4).tolist(),
+            }
+        else:
+            item = {
+                "type": "rate table",
+                "T": T_grid,
+                "p": pressures,
+                "k": (10 ** rng.uniform(0, 10, (4, 6))).tolist(),
+            }
+        rate_constants[f"rate-coefficient-{i:05d}"] = item
+    return Schema.model_validate(
+        {
+            "metadata": {"license": "MIT", "title": "benchmark"},
+            "rate_constants": rate_constants,
+        }
+    )
+
+
+def _loop(schema: Schema, keys: list[str], T: np.ndarray, p: np.ndarray):
+    """reference implementation: one reaction at a time"""
+    results = []
+    for key in keys:
+        item = schema.rate_constants[key]
+        if item.type == "modified Arrhenius":
+            k = item.A * T**item.b * np.exp(-item.Ea / (R * T))
+        elif item.type == "pressure-dependent Arrhenius":
+            ln_k = np.array(
+                [
+                    np.log(A * T**b * np.exp(-Ea / (R * T)))
+                    for A, b, Ea in zip(item.A, item.b, item.Ea)
+                ]
+            )
+            ln_p = np.log(item.p)
+            k = np.exp(
+                [np.interp(np.log(p[j]), ln_p, ln_k[:, j]) for j in range(T.size)]
+            )
+        else:
+            inv_T = 1 / np.asarray(item.T)[::-1]
+            ln_p = np.log(item.p)
+            ln_k = np.log(np.asarray(item.k))[:, ::-1]
+            k = np.empty_like(T)
+            for j in range(T.size):
+                at_p = [np.interp(1 / T[j], inv_T, row) for row in ln_k]
+                k[j] = np.exp(np.interp(np.log(p[j]), ln_p, at_p))
+        results.append(k)
+    return np.array(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n-reactions", type=int, default=10_000)
+    parser.add_argument("--n-states", type=int, default=1_000)
+    parser.add_argument("--n-loop", type=int, default=60)
+    args = parser.parse_args()
+
+    schema = synthetic_kinetics_schema(args.n_reactions)
+    rng = np.random.default_rng(1)
+    T = rng.uniform(300.0, 2500.0, args.n_states)
+    p = 10 ** rng.uniform(3, 6, args.n_states)
+
+    start = time.perf_counter()
+    bank = KineticsBank.from_schema(schema)
+    t_build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    k = bank.evaluate(T, p)
+    t_eval = time.perf_counter() - start
+
+    keys = bank.keys[: args.n_loop]
+    start = time.perf_counter()
+    reference = _loop(schema, keys, T, p)
+    t_loop = (time.perf_counter() - start) * args.n_reactions / len(keys)
+
+    np.testing.assert_allclose(k[: len(keys)], reference, rtol=1e-8)
+
+    print(f"{args.n_reactions} rate coefficients x {args.n_states} states")
+    print(f"build KineticsBank:       {t_build:8.3f} s")
+    print(f"evaluate k(T, p):         {t_eval:8.3f} s")
+    print(f"per-reaction loop (est.): {t_loop:8.3f} s ({t_loop / t_eval:.0f}x slower)")
+
+
+if __name__ == "__main__":
+    main()
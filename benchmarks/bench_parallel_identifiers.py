@@ -0,0 +1,78 @@
+"""Benchmark: full validation of identifiers in a process pool.
+
+Validates a dataset with N molecular entities whose fixed-H InChIs are checked with
+``validation_strategy: full``, once with ``Schema.model_validate`` and once with
+``rmmd.identifiers.validate_parallel`` for an increasing number of worker processes.
+
+usage: python benchmarks/bench_parallel_identifiers.py [--n-items 5000] [--jobs 1 2 4]
+"""
+
+import argparse
+import itertools
+import os
+import time
+
+from rdkit import RDLogger
+from rdkit.Chem import MolFromSmiles, MolToInchi
+
+from rmmd.identifiers import recalculate_identifier, validate_parallel
+from rmmd.schema import Schema
+
+
+def _inchis(n: int) -> list[str]:
+    """fixed-H InChIs of n distinct substituted chains"""
+    inchis: dict[str, None] = {}
+    for length in itertools.count(2):
+        for groups in itertools.product(["", "O", "N", "F", "Cl", "=O"], repeat=3):
+            atoms = ["C"] * length
+            for position, group in zip((0, length // 2, length - 1), groups):
+                if group:
+                    atoms[position] += f"({group})"
+            mol = MolFromSmiles("".join(atoms))
+            if mol is not None:
+                inchis[MolToInchi(mol, options="-FixedH")] = None
+            if len(inchis) == n:
+                return list(inchis)
+    raise AssertionError("unreachable")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n-items", type=int, default=5000)
+    parser.add_argument(
+        "--jobs", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1]
+    )
+    args = parser.parse_args()
+    RDLogger.DisableLog("rdApp.*")  # stereo warnings of the generated molecules
+
+    data = {
+        "metadata": {"license": "MIT", "title": "benchmark"},
+        "entities": {
+            f"entity-{i}": {
+                "inchi_fixedh": {"value": inchi, "validation_strategy": "full"},
+                "electronic_spin": "unkown-electronic-ground-state",
+            }
+            for i, inchi in enumerate(_inchis(args.n_items))
+        },
+    }
+
+    recalculate_identifier.cache_clear()
+    start = time.perf_counter()
+    expected = Schema.model_validate(data)
+    serial = time.perf_counter() - start
+    print(f"{'model_validate':<22} {serial:8.3f} s")
+
+    for jobs in sorted(set(args.jobs)):
+        recalculate_identifier.cache_clear()
+        start = time.perf_counter()
+        schema = validate_parallel(Schema, data, jobs=jobs)
+        elapsed = time.perf_counter() - start
+        label = f"validate_parallel({jobs})"
+        print(f"{label:<22} {elapsed:8.3f} s  (speedup {serial / elapsed:4.1f})")
+        assert schema == expected
+
+    print(f"({args.n_items} identifiers, {os.cpu_count()} CPU cores)")
+
+
+if __name__ == "__main__":
+    main()
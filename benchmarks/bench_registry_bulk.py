@@ -0,0 +1,60 @@
+"""Benchmark: bulk construction of registries with rmmd.registry.Registry.
+
+Builds a registry of N already validated species with auto-generated keys using
+``Registry.add`` in a loop, ``Registry.add_many``, ``Registry.from_trusted`` and,
+for comparison, ``model_validate`` of the dumped registry.
+
+usage: python benchmarks/bench_registry_bulk.py [--n-items 1000000]
+"""
+
+import argparse
+import time
+
+from rmmd.schema import SpeciesRegistry
+from rmmd.species import Species
+
+
+def _items(n: int) -> list[Species]:
+    template = Species(entities=["entity"], names=["name"])
+    return [template.model_copy() for _ in range(n)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n-items", type=int, default=1_000_000)
+    args = parser.parse_args()
+    n = args.n_items
+
+    def add_loop(items):
+        registry = SpeciesRegistry()
+        for item in items:
+            registry.add(item)
+        return registry
+
+    def add_many(items):
+        registry = SpeciesRegistry()
+        registry.add_many(items)
+        return registry
+
+    results = {}
+    for name, build in [
+        ("add() loop", add_loop),
+        ("add_many()", add_many),
+        ("from_trusted()", SpeciesRegistry.from_trusted),
+    ]:
+        items = _items(n)  # new items without keys for each method
+        start = time.perf_counter()
+        results[name] = build(items)
+        print(f"{name:<16} {time.perf_counter() - start:8.3f} s")
+
+    data = results["add_many()"].model_dump()
+    start = time.perf_counter()
+    validated = SpeciesRegistry.model_validate(data)
+    print(f"{'model_validate()':<16} {time.perf_counter() - start:8.3f} s")
+
+    assert all(registry == validated for registry in results.values())
+    print(f"({n} species)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Benchmark: secondary indexes of rmmd.registry.Registry.
+
+Looks up all NASA9 polynomials (1 % of the items) in a thermo registry with N items,
+once with a full scan and once with the "type" index, and measures the cost of
+building the index and of maintaining it on insertion.
+
+usage: python benchmarks/bench_registry_index.py [--n-items 1000000]
+"""
+
+import argparse
+import time
+
+from rmmd.schema import ThermoRegistry
+from rmmd.thermo import ConstantCp, Nasa7, Nasa9, Shomate
+
+_NASA7 = [[1.0] * 7]
+_NASA9 = [[1.0] * 9]
+
+
+def _item(i: int):
+    """thermo item (1 % NASA9), constructed without validation"""
+    if i % 100 == 0:
+        return Nasa9.model_construct(T_ranges=[[300, 3000]], coefficients=_NASA9)
+    match i % 3:
+        case 0:
+            return Nasa7.model_construct(T_ranges=[[300, 3000]], coefficients=_NASA7)
+        case 1:
+            return Shomate.model_construct(T_ranges=[[300, 3000]], coefficients=_NASA7)
+        case _:
+            return ConstantCp.model_construct(T_range=[300, 3000], H0=0, S0=0, Cp=1)
+
+
+def _timed(func, repeat: int = 1) -> tuple[float, object]:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n-items", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    registry = ThermoRegistry()
+    for i in range(args.n_items):
+        item = _item(i)
+        item.key = f"thermo-{i:07d}"
+        registry.root[item.key] = item
+
+    t_scan, scanned = _timed(
+        lambda: [item for item in registry.root.values() if item.type == "NASA9"]
+    )
+    t_build, _ = _timed(lambda: registry.lookup("type", "NASA9"))
+    t_lookup, found = _timed(lambda: registry.lookup("type", "NASA9"), repeat=20)
+    assert found == scanned
+
+    n_insert = min(args.n_items, 100_000)
+    new_items = [_item(i) for i in range(n_insert)]
+    t_insert, _ = _timed(lambda: [registry.add(item) for item in new_items])
+
+    plain = ThermoRegistry()
+    new_items = [_item(i) for i in range(n_insert)]
+    t_insert_plain, _ = _timed(lambda: [plain.add(item) for item in new_items])
+
+    print(f"registry with {args.n_items} items, {len(found)} NASA9 items")
+    print(f"full scan:                {t_scan:8.3f} s")
+    print(f"build index (1st lookup): {t_build:8.3f} s")
+    print(
+        f"indexed lookup:           {t_lookup:8.3f} s ({t_scan / t_lookup:.0f}x faster)"
+    )
+    print(f"insert {n_insert} items, indexed:     {t_insert:8.3f} s")
+    print(f"insert {n_insert} items, not indexed: {t_insert_plain:8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
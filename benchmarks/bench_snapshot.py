@@ -0,0 +1,52 @@
+"""Benchmark: snapshots of a changing dataset with rmmd.snapshot.
+
+Builds a dataset with N species, then repeatedly changes a few species and takes a
+snapshot, compared to a deep copy of the dataset with ``model_copy(deep=True)``.
+
+usage: python benchmarks/bench_snapshot.py [--n-items 200000] [--n-changes 10]
+"""
+
+import argparse
+import time
+
+from rmmd.metadata import Metadata
+from rmmd.schema import Schema, SpeciesRegistry
+from rmmd.species import Species
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n-items", type=int, default=200_000)
+    parser.add_argument("--n-changes", type=int, default=10)
+    parser.add_argument("--n-snapshots", type=int, default=100)
+    args = parser.parse_args()
+
+    template = Species(entities=["entity"], names=["name"])
+    schema = Schema(
+        metadata=Metadata(license="MIT", title="benchmark"),
+        species=SpeciesRegistry.from_trusted(
+            template.model_copy() for _ in range(args.n_items)
+        ),
+    )
+
+    start = time.perf_counter()
+    schema.snapshot()
+    print(f"{'first snapshot':<20} {(time.perf_counter() - start) * 1e3:8.2f} ms")
+
+    elapsed = 0.0
+    for _ in range(args.n_snapshots):
+        for _ in range(args.n_changes):
+            schema.species.add(template.model_copy())
+        start = time.perf_counter()
+        schema.snapshot()
+        elapsed += time.perf_counter() - start
+    print(f"{'snapshot':<20} {elapsed / args.n_snapshots * 1e3:8.2f} ms")
+
+    start = time.perf_counter()
+    schema.model_copy(deep=True)
+    print(f"{'deep copy':<20} {(time.perf_counter() - start) * 1e3:8.2f} ms")
+    print(f"({args.n_items} species, {args.n_changes} changes per snapshot)")
+
+
+if __name__ == "__main__":
+    main()
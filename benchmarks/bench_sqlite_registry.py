@@ -0,0 +1,63 @@
+"""Benchmark: registries stored in a SQLite database with rmmd.sqlite.
+
+Writes N species to a SQLite-backed registry with ``Registry.add_many`` (one
+transaction) and reads them back with a cold and a warm item cache, once in random
+order by key and once in a single scan with ``values()``.
+
+usage: python benchmarks/bench_sqlite_registry.py [--n-items 100000]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from rmmd.schema import SpeciesRegistry
+from rmmd.species import Species
+from rmmd.sqlite import SqliteDatabase
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n-items", type=int, default=100_000)
+    parser.add_argument("--cache-size", type=int, default=1024)
+    args = parser.parse_args()
+    n = args.n_items
+
+    template = Species(entities=["entity"], names=["name"])
+    items = [template.model_copy() for _ in range(n)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database = SqliteDatabase(
+            Path(tmp) / "bench.sqlite", cache_size=args.cache_size
+        )
+        registry = database.registry(SpeciesRegistry, "species")
+
+        start = time.perf_counter()
+        keys = registry.add_many(items)
+        print(f"{'add_many()':<24} {time.perf_counter() - start:8.3f} s")
+
+        sample = random.sample(keys, min(n, 10_000))
+        for label in ("random reads (cold)", "random reads (warm)"):
+            registry.root.clear_cache()
+            if label.endswith("(warm)"):
+                for key in sample[-args.cache_size :]:
+                    registry[key]
+                sample = sample[-args.cache_size :]
+            start = time.perf_counter()
+            for key in sample:
+                registry[key]
+            elapsed = time.perf_counter() - start
+            print(f"{label:<24} {elapsed / len(sample) * 1e6:8.1f} us/item")
+
+        start = time.perf_counter()
+        assert sum(1 for _ in registry.values()) == n
+        print(f"{'values() scan':<24} {time.perf_counter() - start:8.3f} s")
+        database.close()
+
+    print(f"({n} species)")
+
+
+if __name__ == "__main__":
+    main()
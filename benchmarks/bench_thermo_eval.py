@@ -0,0 +1,92 @@
+"""Benchmark: batched evaluation of NASA7 polynomials with rmmd.thermo_eval.
+
+Evaluates Cp, H, S and G of N species with two-range NASA7 polynomials at M
+temperatures with a ThermoBank and, for comparison, with a per-species Python loop
+over a subset of the species.
+
+usage: python benchmarks/bench_thermo_eval.py [--n-species 10000] [--n-temps 1000]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from rmmd.schema import Schema
+from rmmd.thermo_eval import R, ThermoBank
+
+
+def synthetic_thermo_schema(n_species: int) -> Schema:
+    """Dataset with *n_species* random two-range NASA7 polynomials."""
+    rng = np.random.default_rng(0)
+    scale = np.array([1, 1e-3, 1e-6, 1e-9, 1e-12, 1e4, 1])
+    thermo = {
+        f"thermo-{i:05d}": {
+            "type": "NASA7",
+            "T_ranges": [[200.0, 1000.0], [1000.0, 3500.0]],
+            "coefficients": (rng.uniform(-5, 5, (2, 7)) * scale).tolist(),
+        }
+        for i in range(n_species)
+    }
+    return Schema.model_validate(
+        {"metadata": {"license": "MIT", "title": "benchmark"}, "thermo": thermo}
+    )
+
+
+def _loop(schema: Schema, keys: list[str], T: np.ndarray):
+    """reference implementation: one species at a time"""
+    results = []
+    for key in keys:
+        model = schema.thermo[key]
+        cp, h, s = np.empty_like(T), np.empty_like(T), np.empty_like(T)
+        # reversed: at a common bound, the lower range is used
+        for (T_lo, T_hi), a in reversed(list(zip(model.T_ranges, model.coefficients))):
+            mask = (T >= T_lo) & (T <= T_hi)
+            t = T[mask]
+            cp[mask] = R * (a[0] + a[1] * t + a[2] * t**2 + a[3] * t**3 + a[4] * t**4)
+            h[mask] = R * (
+                a[0] * t + a[1] * t**2 / 2 + a[2] * t**3 / 3 + a[3] * t**4 / 4
+                + a[4] * t**5 / 5 + a[5]
+            )  # fmt: skip
+            s[mask] = R * (
+                a[0] * np.log(t) + a[1] * t + a[2] * t**2 / 2 + a[3] * t**3 / 3
+                + a[4] * t**4 / 4 + a[6]
+            )  # fmt: skip
+        results.append((cp, h, s, h - T * s))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n-species", type=int, default=10_000)
+    parser.add_argument("--n-temps", type=int, default=1_000)
+    parser.add_argument("--n-loop", type=int, default=500)
+    args = parser.parse_args()
+
+    schema = synthetic_thermo_schema(args.n_species)
+    T = np.linspace(300.0, 3000.0, args.n_temps)
+
+    start = time.perf_counter()
+    bank = ThermoBank.from_schema(schema)
+    t_build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    props = bank.evaluate(T)
+    t_eval = time.perf_counter() - start
+
+    keys = bank.keys[: args.n_loop]
+    start = time.perf_counter()
+    reference = _loop(schema, keys, T)
+    t_loop = (time.perf_counter() - start) * args.n_species / len(keys)
+
+    for prop, ref in zip(props, zip(*reference)):
+        np.testing.assert_allclose(prop[: len(keys)], ref, rtol=1e-8, atol=1e-8)
+
+    print(f"{args.n_species} species x {args.n_temps} temperatures")
+    print(f"build ThermoBank:        {t_build:8.3f} s")
+    print(f"evaluate Cp, H, S, G:    {t_eval:8.3f} s")
+    print(f"per-species loop (est.): {t_loop:8.3f} s ({t_loop / t_eval:.0f}x slower)")
+
+
+if __name__ == "__main__":
+    main()
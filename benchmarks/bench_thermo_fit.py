@@ -0,0 +1,59 @@
+"""Benchmark: batched fitting of NASA7 polynomials with rmmd.thermo_fit.
+
+Computes H and S tables of N species from random two-range NASA7 polynomials at
+M temperatures and fits new polynomials to all tables with ``fit_nasa``, once table
+by table (``batch_size=1``) for a subset and once batched for an increasing number of
+worker processes.
+
+usage: python benchmarks/bench_thermo_fit.py [--n-species 10000] [--jobs 1 2 4]
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from bench_thermo_eval import synthetic_thermo_schema
+from rmmd.thermo import ThermoTable
+from rmmd.thermo_eval import ThermoBank
+from rmmd.thermo_fit import fit_nasa
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n-species", type=int, default=10_000)
+    parser.add_argument("--n-temps", type=int, default=50)
+    parser.add_argument("--n-loop", type=int, default=500)
+    parser.add_argument(
+        "--jobs", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1]
+    )
+    args = parser.parse_args()
+
+    T = np.linspace(300.0, 3000.0, args.n_temps)
+    props = ThermoBank.from_schema(synthetic_thermo_schema(args.n_species)).evaluate(T)
+    tables = {
+        f"table-{i}": ThermoTable.model_construct(
+            T=T.tolist(), p=[1e5], H=props.h[i : i + 1], S=props.s[i : i + 1],
+        )
+        for i in range(args.n_species)
+    }  # fmt: skip
+
+    subset = dict(list(tables.items())[: args.n_loop])
+    start = time.perf_counter()
+    fit_nasa(subset, batch_size=1, jobs=1)
+    loop = (time.perf_counter() - start) * args.n_species / len(subset)
+    print(f"{'one table at a time':<22} {loop:8.3f} s  (extrapolated)")
+
+    for jobs in sorted(set(args.jobs)):
+        start = time.perf_counter()
+        fit_nasa(tables, jobs=jobs)
+        elapsed = time.perf_counter() - start
+        label = f"batched, {jobs} job(s)"
+        print(f"{label:<22} {elapsed:8.3f} s  (speedup {loop / elapsed:5.1f})")
+
+    print(f"({args.n_species} tables, {args.n_temps} temperatures each)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Benchmark: YAML parse time per MB for the pure-Python and libyaml loaders.
+
+For comparison, the time for loading the same data from JSON is reported as well.
+All times are given per MB of the YAML file.
+
+The synthetic RMMD file consists of the blocks that dominate the size of real
+datasets: IRC scans with many geometries and large rate tables.
+
+usage: python benchmarks/bench_yaml_loader.py [--size-mb 5]
+"""
+
+import argparse
+import random
+import time
+
+import yaml
+
+from rmmd import io
+from rmmd.schema import Schema
+
+
+def synthetic_rmmd_yaml(size_mb: float, n_atoms: int = 20, n_points: int = 50) -> str:
+    """Create an RMMD file of roughly *size_mb* MB with IRC scans and rate tables."""
+    rng = random.Random(0)
+    data = {
+        "schema_version": "0.1.0b0",
+        "metadata": {"license": "MIT", "title": "benchmark"},
+        "calculations": {},
+        "rate_constants": {},
+    }
+    text = ""
+    i = 0
+    while len(text) < size_mb * 1e6:
+        # grow in chunks and only serialize occasionally to keep setup time low
+        for _ in range(20):
+            i += 1
+            data["calculations"][f"calc-{i:04d}"] = {
+                "type": "qm-irc",
+                "software": {"name": "ORCA", "version": "6.0.1"},
+                "output": {
+                    "points": {
+                        "atoms": ["C"] * n_atoms,
+                        "coordinates": [
+                            [[rng.uniform(-5, 5) for _ in range(3)]] * n_atoms
+                            for _ in range(n_points)
+                        ],
+                    },
+                    "total_electronic_energies": [
+                        rng.uniform(-500, -100) for _ in range(n_points)
+                    ],
+                },
+            }
+            data["rate_constants"][f"rate-coefficient-{i:04d}"] = {
+                "type": "rate table",
+                "T": [200.0 + 50 * j for j in range(20)],
+                "p": [10.0**j for j in range(8)],
+                "k": [[rng.lognormvariate(10, 3) for _ in range(20)] for _ in range(8)],
+            }
+        text = io.dump_yaml(data)
+    return text
+
+
+def _time(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=float, default=5.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    text = synthetic_rmmd_yaml(args.size_mb)
+    size_mb = len(text.encode("utf-8")) / 1e6
+    print(f"file size: {size_mb:.2f} MB, libyaml available: {io.HAS_LIBYAML}")
+
+    t_py = _time(lambda: yaml.load(text, Loader=yaml.SafeLoader), args.repeat)
+    print(f"pure-Python SafeLoader: {t_py / size_mb:8.3f} s/MB")
+
+    if io.HAS_LIBYAML:
+        t_c = _time(lambda: io.load_yaml(text), args.repeat)
+        print(f"libyaml CSafeLoader:    {t_c / size_mb:8.3f} s/MB")
+        print(f"speed-up:               {t_py / t_c:8.1f}x")
+
+    data = io.load_yaml(text)
+    t_val = _time(lambda: Schema.model_validate(data), args.repeat)
+    print(f"Schema.model_validate:  {t_val / size_mb:8.3f} s/MB (for reference)")
+
+    # the same data as JSON is validated by pydantic-core without a Python dict
+    json_text = Schema.model_validate(data).model_dump_json(exclude_none=True)
+    t_json = _time(lambda: Schema.model_validate_json(json_text), args.repeat)
+    print(
+        f"JSON (parse+validate):  {t_json / size_mb:8.3f} s/MB "
+        f"(YAML: {(t_c if io.HAS_LIBYAML else t_py) / size_mb + t_val / size_mb:.3f})"
+    )
+
+
+if __name__ == "__main__":
+    main()
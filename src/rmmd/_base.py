@@ -1,3 +1,5 @@
+from typing import Self
+
 from pydantic import BaseModel, ConfigDict
 
 RMMD_DEFAULT_CONFIG = ConfigDict(
@@ -19,3 +21,30 @@ class RmmdFrozenBaseModel(BaseModel, frozen=True):
     model_config = RMMD_DEFAULT_CONFIG | ConfigDict(
         frozen=True,
     )
+
+
+class LocalState:
+    """Base class for state of a single model object kept in a private attribute,
+    e.g., caches or change listeners.
+
+    The state is neither compared, copied nor pickled with the model: copies and
+    unpickled models start with a fresh state, and all states are equal. Unlike
+    module-level dicts keyed by ``id(model)``, the state lives exactly as long as
+    the model object.
+    """
+
+    __slots__ = ()
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, LocalState)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __copy__(self) -> Self:
+        return type(self)()
+
+    def __deepcopy__(self, memo: dict) -> Self:
+        return type(self)()
+
+    def __reduce__(self):
+        return type(self), ()
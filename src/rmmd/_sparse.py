@@ -0,0 +1,127 @@
+"""Minimal sparse matrices for stoichiometry and composition computations."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass(frozen=True, eq=False)
+class CsrMatrix:
+    """Sparse matrix in compressed sparse row (CSR) format.
+
+    Uses the same arrays as ``scipy.sparse.csr_array``: the column indices and values of
+    row ``i`` are ``indices[indptr[i]:indptr[i + 1]]`` and ``data[indptr[i]:indptr[i +
+    1]]``. Column indices are sorted within each row and there are no explicit zeros.
+    """
+
+    data: np.ndarray
+    """(nnz,) non-zero values"""
+    indices: np.ndarray
+    """(nnz,) column index of each value"""
+    indptr: np.ndarray
+    """(n_rows + 1,) start of each row in *data* and *indices*"""
+    shape: tuple[int, int]
+    """number of rows and columns"""
+
+    @classmethod
+    def from_coo(
+        cls,
+        rows: np.ndarray,
+        cols: np.ndarray,
+        values: np.ndarray,
+        shape: tuple[int, int],
+    ) -> CsrMatrix:
+        """Build a matrix from coordinates. Duplicate entries are summed up.
+
+        :param rows: (n,) row index of each entry
+        :param cols: (n,) column index of each entry
+        :param values: (n,) value of each entry
+        :param shape: number of rows and columns
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        values = np.asarray(values)
+
+        linear = rows * shape[1] + cols
+        order = np.argsort(linear, kind="stable")
+        linear = linear[order]
+        if linear.size:
+            starts = np.flatnonzero(np.r_[True, linear[1:] != linear[:-1]])
+            summed = np.add.reduceat(values[order], starts)
+            linear = linear[starts]
+        else:
+            summed = values[order]
+
+        nonzero = summed != 0
+        summed, linear = summed[nonzero], linear[nonzero]
+        row_counts = np.bincount(linear // shape[1], minlength=shape[0])
+        indptr = np.zeros(shape[0] + 1, dtype=np.int64)
+        np.cumsum(row_counts, out=indptr[1:])
+        return cls(summed, linear % shape[1], indptr, shape)
+
+    @property
+    def nnz(self) -> int:
+        """number of non-zero values"""
+        return self.data.size
+
+    def row_indices(self) -> np.ndarray:
+        """(nnz,) row index of each value"""
+        return np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+
+    def __add__(self, other: CsrMatrix) -> CsrMatrix:
+        if not isinstance(other, CsrMatrix):
+            return NotImplemented
+        if other.shape != self.shape:
+            raise ValueError(f"Shapes {self.shape} and {other.shape} do not match.")
+        return CsrMatrix.from_coo(
+            np.concatenate([self.row_indices(), other.row_indices()]),
+            np.concatenate([self.indices, other.indices]),
+            np.concatenate([self.data, other.data]),
+            self.shape,
+        )
+
+    def __neg__(self) -> CsrMatrix:
+        return CsrMatrix(-self.data, self.indices, self.indptr, self.shape)
+
+    def __sub__(self, other: CsrMatrix) -> CsrMatrix:
+        if not isinstance(other, CsrMatrix):
+            return NotImplemented
+        return self + (-other)
+
+    def __matmul__(self, other: np.ndarray) -> np.ndarray:
+        """product with a dense (n_cols,) vector or (n_cols, k) matrix"""
+        other = np.asarray(other)
+        if other.shape[0] != self.shape[1]:
+            raise ValueError(
+                f"Shapes {self.shape} and {other.shape} are not aligned for matmul."
+            )
+
+        products = (
+            self.data.reshape((-1,) + (1,) * (other.ndim - 1)) * other[self.indices]
+        )
+        result = np.zeros((self.shape[0],) + other.shape[1:], dtype=products.dtype)
+        nonempty = np.diff(self.indptr) > 0
+        if products.size:
+            # reduceat sums from each start up to the next one, i.e., over one row
+            result[nonempty] = np.add.reduceat(
+                products, self.indptr[:-1][nonempty], axis=0
+            )
+        return result
+
+    def to_scipy(self):
+        """``scipy.sparse.csr_array`` sharing the arrays of this matrix (requires
+        SciPy)"""
+        try:
+            from scipy.sparse import csr_array
+        except ImportError as err:
+            raise ImportError("Exporting sparse matrices requires SciPy.") from err
+
+        return csr_array((self.data, self.indices, self.indptr), self.shape, copy=False)
+
+    def toarray(self) -> np.ndarray:
+        """dense copy of the matrix"""
+        dense = np.zeros(self.shape, dtype=self.data.dtype)
+        dense[self.row_indices(), self.indices] = self.data
+        return dense
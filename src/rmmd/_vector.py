@@ -0,0 +1,96 @@
+"""Vectorized helpers for batched evaluation of models."""
+
+from __future__ import annotations
+
+from typing import Literal
+
+import numpy as np
+
+
+def rowwise_searchsorted(
+    a: np.ndarray, v: np.ndarray, side: Literal["left", "right"] = "left"
+) -> np.ndarray:
+    """``np.searchsorted`` applied to each row of *a* in a single call.
+
+    Each row is shifted by a row-dependent offset that is larger than the range of
+    all values, so that the rows can be concatenated into one sorted array.
+
+    :param a: (n, m) array with sorted rows of finite values
+    :param v: values to insert, either (k,) for all rows or (n, k)
+    :param side: see ``np.searchsorted``
+    :return: (n, k) array of indices into the rows of *a*
+    """
+    a = np.asarray(a, dtype=np.float64)
+    v = np.asarray(v, dtype=np.float64)
+    n, m = a.shape
+    v = np.broadcast_to(v, (n, v.shape[-1]))
+    if a.size == 0 or v.size == 0:
+        return np.zeros(v.shape, dtype=np.intp)
+
+    low = min(a.min(), v.min())
+    span = max(a.max(), v.max()) - low + 1.0
+    offsets = (np.arange(n) * span)[:, None]
+
+    idx = np.searchsorted(
+        (a - low + offsets).ravel(), (v - low + offsets).ravel(), side=side
+    )
+    return idx.reshape(v.shape) - (np.arange(n) * m)[:, None]
+
+
+def interpolation_weights(
+    grid: np.ndarray, n_points: np.ndarray, x: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Segments and weights for linear interpolation on a different grid per row.
+
+    Values of *x* outside of a grid are clamped to the first/last grid point.
+
+    :param grid: (n, m) array with ascending grid points in each row. Rows with less
+        than m points are padded by repeating the last point.
+    :param n_points: (n,) number of grid points in each row
+    :param x: (k,) or (n, k) points to interpolate at
+    :return: index ``i`` of the left grid point and weight ``w`` of the right grid
+        point, each as (n, k) array, i.e., ``y(x) = (1 - w) y[i] + w y[i + 1]``.
+        For rows with a single grid point, ``i = 0`` and ``w = 0``.
+    """
+    n_segments = np.maximum(n_points - 1, 1)[:, None]
+    idx = rowwise_searchsorted(grid, x, side="right") - 1
+    idx = np.clip(idx, 0, n_segments - 1)
+
+    left = np.take_along_axis(grid, idx, axis=1)
+    right = np.take_along_axis(grid, np.minimum(idx + 1, grid.shape[1] - 1), axis=1)
+    width = right - left
+    with np.errstate(divide="ignore", invalid="ignore"):
+        weight = np.where(width > 0, (x - left) / width, 0.0)
+    return idx, np.clip(weight, 0.0, 1.0)
+
+
+class SharedGrids:
+    """Grids of many rows, deduplicated for :func:`interpolation_weights`.
+
+    Many models use the same grid, e.g., all rate tables of a dataset computed at the
+    same temperatures and pressures. The segments and weights are then computed once
+    per distinct grid and shared by all rows using it.
+    """
+
+    def __init__(self, grid: np.ndarray, n_points: np.ndarray):
+        """
+        :param grid: (n, m) array with ascending grid points in each row, padded by
+            repeating the last point
+        :param n_points: (n,) number of grid points in each row
+        """
+        keys = np.column_stack([grid, n_points])
+        unique, inverse = np.unique(keys, axis=0, return_inverse=True)
+        self.grid: np.ndarray = unique[:, :-1]
+        """(n_unique, m) distinct grids"""
+        self.n_points: np.ndarray = unique[:, -1].astype(np.intp)
+        """(n_unique,) number of grid points of the distinct grids"""
+        self.inverse: np.ndarray = inverse.ravel()
+        """(n,) distinct grid of each row"""
+
+    def interpolation_weights(self, x: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """:func:`interpolation_weights` for all rows at the (k,) points *x*"""
+        idx, weight = interpolation_weights(self.grid, self.n_points, x)
+        if len(self.grid) == 1:
+            shape = (len(self.inverse), idx.shape[1])
+            return np.broadcast_to(idx, shape), np.broadcast_to(weight, shape)
+        return idx[self.inverse], weight[self.inverse]
@@ -0,0 +1,434 @@
+"""Large numerical arrays stored in binary sidecar files.
+
+Fields holding large arrays, e.g., Hessians, geometries along a scan or rate tables,
+can reference a NumPy ``.npy`` file or a member of an ``.npz`` archive instead of
+listing all numbers in the RMMD file::
+
+    hessian: ./arrays/calc-0001.npy
+    k: ./arrays/rate-tables.npz#rate-0001
+
+Like other local files (see :data:`rmmd.metadata.LocalFile`), the path is relative to
+the RMMD file. During validation, only the header of the file is read to check the
+number of dimensions and the data type. The data itself is read when the array is
+used, e.g., via ``np.asarray(calc.output.hessian)``. ``.npy`` files are memory-mapped.
+
+:func:`externalize_arrays` moves large inline arrays of a schema to ``.npy`` files,
+:func:`inline_arrays` reverts this.
+
+Inline geometries are held as contiguous float64 arrays (see :class:`NdArraySpec`)
+instead of nested lists of Python floats.
+"""
+
+from __future__ import annotations
+
+import re
+import zipfile
+from dataclasses import dataclass
+from itertools import chain
+from pathlib import Path
+from typing import TYPE_CHECKING, Annotated, Any, Iterator, get_args
+
+import numpy as np
+from numpy.lib import format as npy_format
+from pydantic import BaseModel, GetCoreSchemaHandler, GetJsonSchemaHandler
+from pydantic_core import core_schema
+
+if TYPE_CHECKING:
+    from .schema import Schema
+
+ARRAY_FILE_PATTERN = r"^\.\/.*(\.npy|\.npz#[^\/#]+)$"
+"""pattern of references to arrays in .npy files or members of .npz archives"""
+
+ARRAYS_DIR = "arrays"
+"""default directory for array files written by :func:`externalize_arrays`"""
+
+
+class ExternalArray:
+    """Reference to an array stored in a ``.npy`` file or a member of an ``.npz`` file.
+
+    Instances are created when validating a reference like ``./arrays/x.npy``. Use
+    ``np.asarray()`` or :meth:`load` to access the data.
+    """
+
+    def __init__(self, ref: str, path: Path, shape: tuple[int, ...], dtype: np.dtype):
+        self.ref = ref
+        """reference as given in the RMMD file, e.g., ``./arrays/x.npz#hessian``"""
+        self.path = path
+        """absolute path to the .npy or .npz file"""
+        self.shape = shape
+        """shape of the array according to the file header"""
+        self.dtype = dtype
+        """data type of the array according to the file header"""
+
+    @property
+    def member(self) -> str | None:
+        """name of the array in the .npz archive or None for .npy files"""
+        _, _, member = self.ref.partition("#")
+        return member or None
+
+    @property
+    def ndim(self) -> int:
+        return len(self.shape)
+
+    def load(self) -> np.ndarray:
+        """read the array; .npy files are memory-mapped (read-only)"""
+        if self.member is None:
+            return np.load(self.path, mmap_mode="r", allow_pickle=False)
+        with np.load(self.path, allow_pickle=False) as archive:
+            return archive[self.member]
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        array = self.load()
+        return array if dtype is None else array.astype(dtype)
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ExternalArray):
+            return NotImplemented
+        return (self.ref, self.shape, self.dtype) == (
+            other.ref,
+            other.shape,
+            other.dtype,
+        )
+
+    def __repr__(self) -> str:
+        return f"ExternalArray({self.ref!r}, shape={self.shape}, dtype={self.dtype})"
+
+    @classmethod
+    def from_reference(cls, ref: str, base_path: Path) -> ExternalArray:
+        """Read the header of the referenced array file.
+
+        :param ref: reference to the array relative to *base_path*, see
+            :data:`ARRAY_FILE_PATTERN`
+        :param base_path: directory of the RMMD file
+        :raises ValueError: if the file does not exist or is not a valid array file
+        """
+        if not re.match(ARRAY_FILE_PATTERN, ref):
+            raise ValueError(
+                f"'{ref}' is not a reference to a .npy file or a member of an .npz "
+                "file, e.g., './arrays/x.npy' or './arrays/x.npz#name'"
+            )
+        file, _, member = ref.partition("#")
+        path = (base_path / file).resolve()
+
+        try:
+            if member:
+                with zipfile.ZipFile(path) as archive:
+                    with archive.open(f"{member}.npy") as f:
+                        shape, dtype = _read_header(f)
+            else:
+                with open(path, "rb") as f:
+                    shape, dtype = _read_header(f)
+        except FileNotFoundError:
+            raise ValueError(f"Array file '{path}' not found") from None
+        except KeyError:
+            raise ValueError(f"'{path}' does not contain an array '{member}'") from None
+        except (OSError, zipfile.BadZipFile) as err:
+            raise ValueError(f"Could not read array header of '{ref}': {err}") from None
+
+        return cls(ref, path, shape, dtype)
+
+
+def _read_header(f) -> tuple[tuple[int, ...], np.dtype]:
+    """shape and data type from the header of a .npy file without reading the data"""
+    try:
+        version = npy_format.read_magic(f)
+        if version == (1, 0):
+            shape, _, dtype = npy_format.read_array_header_1_0(f)
+        elif version == (2, 0):
+            shape, _, dtype = npy_format.read_array_header_2_0(f)
+        else:  # 3.0 is only used for structured arrays with unicode field names
+            raise ValueError(f"unsupported .npy format version {version}")
+    except ValueError as err:
+        raise OSError(str(err)) from None
+    return shape, dtype
+
+
+@dataclass(frozen=True)
+class ArraySpec:
+    """Annotation for :class:`ExternalArray` fields with the expected number of
+    dimensions, e.g., ``Annotated[ExternalArray, ArraySpec(ndim=2)]``.
+
+    The referenced file is resolved relative to the ``base_path`` in the validation
+    context (set by :func:`rmmd.io.load`) or the current working directory.
+    """
+
+    ndim: int
+    """number of dimensions of the array"""
+
+    def _validate(self, value: Any, info: core_schema.ValidationInfo) -> ExternalArray:
+        if isinstance(value, ExternalArray):
+            array = value
+        else:
+            context = info.context or {}
+            base_path = Path(context.get("base_path", "."))
+            array = ExternalArray.from_reference(value, base_path)
+
+        if array.ndim != self.ndim:
+            raise ValueError(
+                f"Array '{array.ref}' must have {self.ndim} dimension(s), "
+                f"but has shape {array.shape}"
+            )
+        if array.dtype.kind != "f":
+            raise ValueError(
+                f"Array '{array.ref}' must contain floats, not {array.dtype}"
+            )
+        return array
+
+    def __get_pydantic_core_schema__(
+        self, source: type[Any], handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        from_str = core_schema.with_info_after_validator_function(
+            self._validate, core_schema.str_schema()
+        )
+        return core_schema.json_or_python_schema(
+            json_schema=from_str,
+            python_schema=core_schema.union_schema(
+                [
+                    core_schema.with_info_after_validator_function(
+                        self._validate,
+                        core_schema.is_instance_schema(ExternalArray),
+                    ),
+                    from_str,
+                ]
+            ),
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                lambda array: array.ref
+            ),
+        )
+
+    def __get_pydantic_json_schema__(
+        self, schema: core_schema.CoreSchema, handler: GetJsonSchemaHandler
+    ) -> dict[str, Any]:
+        return {
+            "type": "string",
+            "pattern": ARRAY_FILE_PATTERN,
+            "examples": ["./arrays/calc-0001.npy", "./arrays/data.npz#hessian"],
+            "description": f"reference to a {self.ndim}D float array in a .npy file "
+            "or a member of an .npz file, relative to the RMMD file",
+        }
+
+
+ExternalArray1D = Annotated[ExternalArray, ArraySpec(ndim=1)]
+"""reference to a 1D array of floats"""
+ExternalArray2D = Annotated[ExternalArray, ArraySpec(ndim=2)]
+"""reference to a 2D array of floats"""
+ExternalArray3D = Annotated[ExternalArray, ArraySpec(ndim=3)]
+"""reference to a 3D array of floats"""
+
+
+###############################################################################
+# in-memory arrays
+###############################################################################
+
+
+@dataclass(frozen=True)
+class NdArraySpec:
+    """Annotation for float64 ``np.ndarray`` fields with the expected number of
+    dimensions, e.g., ``Annotated[np.ndarray, NdArraySpec(ndim=2)]``.
+
+    Accepts arrays and nested lists of finite numbers and serializes to nested lists,
+    i.e., the YAML/JSON representation is the same as for ``list[list[float]]``.
+    Nested lists of real numbers are converted by NumPy directly; pydantic's
+    element-wise validation is used for any other input, e.g., numbers as strings,
+    and to report errors for invalid input such as None or booleans.
+    """
+
+    ndim: int
+    """number of dimensions of the array"""
+
+    def _validate(
+        self, value: Any, handler: core_schema.ValidatorFunctionWrapHandler
+    ) -> np.ndarray:
+        array = _real_array(value)
+        if array is not None and array.ndim == self.ndim:
+            return array
+        if array is not None and array.shape == (0,):  # empty list
+            return array.reshape((0,) * self.ndim)
+
+        # invalid input -> let pydantic report where the problem is
+        if isinstance(value, np.ndarray):
+            value = value.tolist()
+        value = handler(value)
+        try:
+            return np.asarray(value, dtype=np.float64)
+        except ValueError:
+            raise ValueError(f"Input should be a regular {self.ndim}D array") from None
+
+    def __get_pydantic_core_schema__(
+        self, source: type[Any], handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        nested_lists = core_schema.no_info_before_validator_function(
+            _reject_bool, core_schema.float_schema(allow_inf_nan=False)
+        )
+        for _ in range(self.ndim):
+            nested_lists = core_schema.list_schema(nested_lists)
+
+        return core_schema.no_info_wrap_validator_function(
+            self._validate,
+            nested_lists,
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                lambda array: array.tolist()
+            ),
+        )
+
+
+def _reject_bool(value: Any) -> Any:
+    """booleans are numbers for pydantic, but not valid array elements"""
+    if isinstance(value, (bool, np.bool_)):
+        raise ValueError("Input should be a number, not a boolean")
+    return value
+
+
+def _is_real_type(type_: type) -> bool:
+    return issubclass(type_, (int, float, np.integer, np.floating)) and not (
+        issubclass(type_, (bool, np.bool_))
+    )
+
+
+def _real_array(value: Any) -> np.ndarray | None:
+    """*value* as float64 array, if it is a numeric array or regular nested lists of
+    real numbers and all values are finite. Otherwise None, because NumPy would
+    convert None to NaN, booleans to 1.0/0.0 and parse strings.
+    """
+    if isinstance(value, np.ndarray):
+        if value.dtype.kind not in "iuf":
+            return None
+        array = value.astype(np.float64, copy=False)
+    elif isinstance(value, (list, tuple)):
+        try:
+            array = np.asarray(value, dtype=np.float64)
+        except (ValueError, TypeError):
+            return None
+        elements = value
+        for _ in range(array.ndim - 1):
+            elements = chain.from_iterable(elements)
+        if not all(map(_is_real_type, set(map(type, elements)))):
+            return None
+    else:
+        return None
+    return array if np.isfinite(array).all() else None
+
+
+NdArray2D = Annotated[np.ndarray, NdArraySpec(ndim=2)]
+"""2D array of float64, represented as nested lists of floats in RMMD files"""
+NdArray3D = Annotated[np.ndarray, NdArraySpec(ndim=3)]
+"""3D array of float64, represented as nested lists of floats in RMMD files"""
+
+
+def array_equal(a: Any, b: Any) -> bool:
+    """compare array-valued fields, which may be arrays, lists or external arrays"""
+    if isinstance(a, np.ndarray) and isinstance(b, np.ndarray):
+        return np.array_equal(a, b)
+    if isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+        return False
+    return a == b
+
+
+###############################################################################
+# conversion between inline and external arrays
+###############################################################################
+
+
+def _accepts_external_array(annotation: Any) -> bool:
+    return annotation is ExternalArray or any(
+        _accepts_external_array(arg) for arg in get_args(annotation)
+    )
+
+
+def _array_fields(model: BaseModel) -> Iterator[tuple[str, Any]]:
+    """fields of *model* that may hold an ExternalArray and their values"""
+    for name, field in type(model).model_fields.items():
+        if _accepts_external_array(field.annotation):
+            yield name, getattr(model, name)
+
+
+def _iter_models(value: Any, loc: tuple[str, ...]) -> Iterator[tuple[tuple, Any]]:
+    """all pydantic models in *value* (recursively) and their locations"""
+    if isinstance(value, BaseModel):
+        if hasattr(value, "root"):  # registries
+            yield from _iter_models(value.root, loc)
+            return
+        yield loc, value
+        for name in type(value).model_fields:
+            yield from _iter_models(getattr(value, name), (*loc, name))
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            yield from _iter_models(item, (*loc, str(key)))
+    elif isinstance(value, (list, tuple)):
+        for i, item in enumerate(value):
+            yield from _iter_models(item, (*loc, str(i)))
+
+
+def array_files(schema: Schema) -> set[Path]:
+    """absolute paths of the files of all external arrays in *schema*"""
+    return {
+        value.path
+        for _, model in _iter_models(schema, ())
+        for _, value in _array_fields(model)
+        if isinstance(value, ExternalArray)
+    }
+
+
+def externalize_arrays(
+    schema: Schema,
+    base_path: str | Path,
+    *,
+    min_size: int = 1000,
+    directory: str = ARRAYS_DIR,
+) -> int:
+    """Move large inline arrays of *schema* to ``.npy`` files.
+
+    The files are named after the location of the array in the schema, e.g.,
+    ``arrays/calculations.calc-0001.output.hessian.npy``, and are written as float64.
+
+    :param schema: RMMD data, modified in place
+    :param base_path: directory of the RMMD file that *schema* will be written to
+    :param min_size: minimum number of elements of an array to be moved
+    :param directory: directory for the array files, relative to *base_path*
+    :return: number of arrays written
+    """
+    base_path = Path(base_path)
+    n_written = 0
+
+    for loc, model in _iter_models(schema, ()):
+        for name, value in _array_fields(model):
+            if value is None or isinstance(value, ExternalArray):
+                continue
+            array = np.asarray(value, dtype=np.float64)
+            if array.size < min_size:
+                continue
+
+            ref = f"./{directory}/{'.'.join((*loc, name))}.npy"
+            path = base_path / ref
+            path.parent.mkdir(parents=True, exist_ok=True)
+            np.save(path, array, allow_pickle=False)
+
+            setattr(
+                model,
+                name,
+                ExternalArray(ref, path.resolve(), array.shape, array.dtype),
+            )
+            n_written += 1
+
+    return n_written
+
+
+def inline_arrays(schema: Schema) -> int:
+    """Replace all external arrays of *schema* by nested lists of floats.
+
+    :param schema: RMMD data, modified in place
+    :return: number of arrays replaced
+    """
+    n_replaced = 0
+    for _, model in _iter_models(schema, ()):
+        for name, value in _array_fields(model):
+            if isinstance(value, ExternalArray):
+                # validate to convert to the in-memory type of the field
+                type(model).__pydantic_validator__.validate_assignment(
+                    model, name, value.load().tolist()
+                )
+                n_replaced += 1
+    return n_replaced
@@ -0,0 +1,253 @@
+"""On-disk cache for validated RMMD data.
+
+Validating a large RMMD file runs every pydantic validator of the schema. If the file
+did not change, the validated result is the same, so it can be stored in a fast binary
+form (pickle) and reloaded without validation. Entries are keyed by a hash of the
+source bytes and the directory of the file together with the schema version and the
+versions of RMMD and pydantic, so changes to any of them invalidate the cache. Each
+entry also records the size and modification time of the array files referenced by
+the schema (see :mod:`rmmd.arrays`); if one of them changed, the entry is not used.
+
+.. warning::
+
+    Cache files are unpickled on a hit. Only use cache directories that are not
+    writable by untrusted users.
+
+:class:`IdentifierCache` stores identifiers recalculated with RDKit during full
+validation (see :mod:`rmmd.identifiers`) in a SQLite database, so that identifiers
+shared by many datasets are only recalculated once per RDKit version.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import sqlite3
+import tempfile
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable
+
+import pydantic
+import rdkit
+
+from .arrays import array_files
+
+if TYPE_CHECKING:
+    from .schema import Schema
+
+DEFAULT_MAX_BYTES = 2**30
+"""default size limit of a schema cache directory (1 GiB)"""
+
+_SUFFIX = ".pickle"
+
+
+def default_cache_dir() -> Path:
+    """Directory for RMMD caches.
+
+    ``$RMMD_CACHE_DIR`` if set, otherwise ``rmmd`` in ``$XDG_CACHE_HOME`` (defaults
+    to ``~/.cache``).
+    """
+    if env_dir := os.environ.get("RMMD_CACHE_DIR"):
+        return Path(env_dir)
+
+    xdg_cache = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(xdg_cache) / "rmmd"
+
+
+def _rmmd_version() -> str:
+    try:
+        return version("rmmd")
+    except PackageNotFoundError:  # e.g., running from a source checkout
+        return "unknown"
+
+
+class SchemaCache:
+    """Size-bounded cache of validated ``Schema`` objects in a directory.
+
+    When the total size of the cache files exceeds ``max_bytes``, the least
+    recently used entries are removed. The modification time of a cache file is
+    used to track its last use.
+    """
+
+    def __init__(
+        self, directory: str | Path | None = None, max_bytes: int = DEFAULT_MAX_BYTES
+    ):
+        """
+        :param directory: cache directory, defaults to ``schemas`` in
+            :func:`default_cache_dir`
+        :param max_bytes: maximum total size of all cache files in bytes
+        """
+        if directory is None:
+            directory = default_cache_dir() / "schemas"
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def key(source: bytes, base_path: str | Path | None = None) -> str:
+        """cache key for the RMMD file content *source*
+
+        :param source: content of the RMMD file
+        :param base_path: directory of the RMMD file. Local files, e.g., external
+            arrays, are resolved relative to it, so the same content in another
+            directory gets another key.
+        """
+        from .schema import Schema
+
+        h = hashlib.blake2b(source, digest_size=32)
+        for part in (
+            Schema.model_fields["schema_version"].default,
+            _rmmd_version(),
+            pydantic.VERSION,
+            "" if base_path is None else Path(base_path).resolve(),
+        ):
+            h.update(b"\0" + str(part).encode())
+        return h.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{_SUFFIX}"
+
+    def get(self, key: str) -> Schema | None:
+        """Return the cached schema for *key* or None on a cache miss.
+
+        Entries whose array files changed after they were stored are misses.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                files, schema = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:  # noqa: BLE001
+            # corrupted or incompatible entry (e.g., after a change of the models
+            # without a version change) -> treat as miss and drop it
+            path.unlink(missing_ok=True)
+            return None
+
+        if _file_stats(files) != files:
+            return None  # stale shapes or dtypes of external arrays
+
+        path.touch()  # mark as recently used
+        return schema
+
+    def put(self, key: str, schema: Schema) -> None:
+        """Store *schema* under *key* and evict old entries if necessary."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        files = _file_stats(array_files(schema))
+
+        # write to a temporary file first, so that concurrent readers never see
+        # partially written entries
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump((files, schema), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove least recently used entries until the size limit is met."""
+        entries = []
+        for path in self.directory.glob(f"*{_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:  # removed concurrently
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        for path in self.directory.glob(f"*{_SUFFIX}"):
+            path.unlink(missing_ok=True)
+
+
+def _file_stats(paths: Iterable[Path]) -> dict[Path, tuple[int, int] | None]:
+    """modification time in ns and size of each file, None if it does not exist"""
+    stats = {}
+    for path in paths:
+        try:
+            stat = path.stat()
+        except OSError:
+            stats[path] = None
+        else:
+            stats[path] = (stat.st_mtime_ns, stat.st_size)
+    return stats
+
+
+class IdentifierCache:
+    """On-disk cache of identifiers recalculated with RDKit.
+
+    Entries are keyed by the RDKit version, the identifier type and the original
+    identifier. The database can be shared by several processes.
+    """
+
+    def __init__(self, path: str | Path | None = None):
+        """
+        :param path: path of the SQLite database, defaults to ``identifiers.sqlite``
+            in :func:`default_cache_dir`
+        """
+        if path is None:
+            path = default_cache_dir() / "identifiers.sqlite"
+        self.path = Path(path)
+        self._connection: sqlite3.Connection | None = None
+        self._pid: int | None = None
+        self.rdkit_version: str = rdkit.__version__
+
+    def _connect(self) -> sqlite3.Connection:
+        # connections must not be shared with forked worker processes
+        if self._connection is None or self._pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30)
+            # losing the last entries on a crash is harmless for a cache
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute("PRAGMA synchronous = OFF")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS identifiers (rdkit TEXT, type TEXT, "
+                "value TEXT, result TEXT, PRIMARY KEY (rdkit, type, value))"
+            )
+            connection.commit()
+            self._connection, self._pid = connection, os.getpid()
+        return self._connection
+
+    def get(self, type_: str, value: str) -> str | None:
+        """Return the recalculated identifier or None on a cache miss."""
+        row = (
+            self._connect()
+            .execute(
+                "SELECT result FROM identifiers WHERE rdkit = ? AND type = ? "
+                "AND value = ?",
+                (self.rdkit_version, type_, value),
+            )
+            .fetchone()
+        )
+        return None if row is None else row[0]
+
+    def put(self, type_: str, value: str, result: str) -> None:
+        """Store the recalculated identifier *result* of *value*."""
+        connection = self._connect()
+        connection.execute(
+            "INSERT OR REPLACE INTO identifiers VALUES (?, ?, ?, ?)",
+            (self.rdkit_version, type_, value, result),
+        )
+        connection.commit()
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        connection = self._connect()
+        connection.execute("DELETE FROM identifiers")
+        connection.commit()
+
+    def __getstate__(self) -> dict:
+        # connections cannot be pickled, e.g., to send the cache to worker processes
+        return self.__dict__ | {"_connection": None, "_pid": None}
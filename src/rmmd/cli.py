@@ -1,8 +1,23 @@
 """Command-line interface."""
 
+from __future__ import annotations
+
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Iterable, Iterator, NamedTuple
+
 import click
 from pydantic import ValidationError
-from .schema import Schema
+from .arrays import externalize_arrays, inline_arrays
+from .composition import check_balance as _check_balance
+from .dataset import dump_dataset, find_root_file, load_dataset
+from .identifiers import use_identifier_cache
+from .io import dump, is_rmmd_file, load
+from .refs import check_references
+from .streaming import format_error, iter_errors
 import yaml
 
 
@@ -12,27 +27,315 @@ def rmmd():
     pass
 
 
+##############################################################################
+# validate
+##############################################################################
+
+
+class FileResult(NamedTuple):
+    """result of validating a single file"""
+
+    path: str
+    """path of the validated file"""
+    ok: bool
+    """whether the file is a valid RMMD file"""
+    error: str | None
+    """error message, if the file could not be read or is invalid"""
+    seconds: float
+    """wall time needed to load and validate the file in seconds"""
+
+
+def validate_file(
+    path: str | Path,
+    stream: bool = False,
+    check_refs: bool = False,
+    check_balance: bool = False,
+) -> FileResult:
+    """Load and validate a single RMMD file.
+
+    Errors are returned as part of the result instead of being raised, so that
+    this function can be used in worker processes to validate many files.
+
+    :param path: path to the RMMD file or dataset directory
+    :param stream: validate YAML files item by item with bounded memory (see
+        :mod:`rmmd.streaming`). JSON files and datasets are always loaded
+        completely.
+    :param check_refs: also check that all keys referencing registry items exist
+        (see :mod:`rmmd.refs`). This requires loading the complete file, even if
+        *stream* is set.
+    :param check_balance: also check that all reactions conserve atoms and charge
+        (see :mod:`rmmd.composition`). This requires loading the complete file, even
+        if *stream* is set.
+    """
+    start = time.perf_counter()
+    try:
+        if Path(path).is_dir():
+            schema = load_dataset(path, lazy=False)
+        elif (
+            stream
+            and not (check_refs or check_balance)
+            and Path(path).suffix in (".yaml", ".yml")
+        ):
+            errors = [format_error(err) for err in iter_errors(path)]
+            if errors:
+                msg = f"{len(errors)} validation error(s):\n" + "\n".join(errors)
+                return FileResult(str(path), False, msg, time.perf_counter() - start)
+        else:
+            schema = load(path)
+
+        if check_refs:
+            dangling = [str(ref) for ref in check_references(schema)]
+            if dangling:
+                msg = f"{len(dangling)} dangling reference(s):\n" + "\n".join(dangling)
+                return FileResult(str(path), False, msg, time.perf_counter() - start)
+
+        if check_balance:
+            unbalanced = [str(imbalance) for imbalance in _check_balance(schema)]
+            if unbalanced:
+                msg = f"{len(unbalanced)} unbalanced reaction(s):\n" + "\n".join(
+                    unbalanced
+                )
+                return FileResult(str(path), False, msg, time.perf_counter() - start)
+    except (OSError, ValueError, yaml.YAMLError, ValidationError) as err:
+        return FileResult(str(path), False, str(err), time.perf_counter() - start)
+
+    return FileResult(str(path), True, None, time.perf_counter() - start)
+
+
+def _find_rmmd_files(directory: Path) -> list[Path]:
+    """RMMD files and datasets in *directory* and its subdirectories"""
+    if find_root_file(directory) is not None:
+        return [directory]  # shards are not valid RMMD files on their own
+
+    files = []
+    for path in sorted(directory.iterdir()):
+        if path.is_dir():
+            files += _find_rmmd_files(path)
+        elif is_rmmd_file(path):
+            files.append(path)
+    return files
+
+
+def _expand_paths(patterns: Iterable[str]) -> list[Path]:
+    """Expand files, directories and glob patterns into a list of files.
+
+    Directories are searched recursively for RMMD files. Dataset directories
+    (see :mod:`rmmd.dataset`) are returned as a single entry. Each file is only
+    returned once, in the order in which it was first encountered.
+    """
+    files: dict[Path, None] = {}  # dict as ordered set
+
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            candidates = _find_rmmd_files(path)
+        elif path.exists():
+            candidates = [path]
+        elif glob.has_magic(pattern):
+            candidates = sorted(Path(p) for p in glob.glob(pattern, recursive=True))
+            candidates = [p for p in candidates if p.is_file()]
+        else:
+            raise click.BadParameter(
+                f"'{pattern}' does not exist.", param_hint="'PATHS...'"
+            )
+
+        if not candidates:
+            raise click.BadParameter(
+                f"'{pattern}' does not match any RMMD file.", param_hint="'PATHS...'"
+            )
+
+        files.update(dict.fromkeys(candidates))
+
+    return list(files)
+
+
+def _validate_files(
+    files: list[Path],
+    jobs: int,
+    stream: bool,
+    check_refs: bool,
+    identifier_cache: bool = False,
+    check_balance: bool = False,
+) -> Iterator[FileResult]:
+    """Validate files, yielding results as soon as they are available."""
+    if identifier_cache:
+        use_identifier_cache(True)
+    if jobs == 1 or len(files) == 1:
+        # no need to pay the start-up cost of a process pool
+        for file in files:
+            yield validate_file(file, stream, check_refs, check_balance)
+        return
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=use_identifier_cache if identifier_cache else None,
+        initargs=(True,) if identifier_cache else (),
+    ) as pool:
+        futures = {
+            pool.submit(validate_file, file, stream, check_refs, check_balance): file
+            for file in files
+        }
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as err:  # e.g. BrokenProcessPool if a worker crashed
+                msg = f"validation did not finish: {type(err).__name__}: {err}"
+                result = FileResult(
+                    str(futures[future]), False, msg, time.perf_counter() - start
+                )
+            yield result
+
+
+def _print_summary(results: list[FileResult], wall_time: float) -> None:
+    """Print a table with the status and wall time of each file."""
+    width = max(len(result.path) for result in results)
+    n_failed = sum(not result.ok for result in results)
+
+    click.echo("")
+    click.echo(f"{'file':<{width}}  {'status':<6}  {'time [s]':>9}")
+    click.echo(f"{'-' * width}  {'-' * 6}  {'-' * 9}")
+    for result in results:
+        status = "ok" if result.ok else "FAILED"
+        click.echo(f"{result.path:<{width}}  {status:<6}  {result.seconds:>9.3f}")
+    click.echo("")
+    click.echo(
+        f"{len(results) - n_failed} of {len(results)} file(s) valid, "
+        f"{n_failed} failed ({wall_time:.3f} s)"
+    )
+
+
 @rmmd.command("validate")
-@click.argument("model_file", type=click.File("r", encoding="utf-8"))
+@click.argument("paths", nargs=-1, required=True)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=0),
+    default=1,
+    show_default=True,
+    help="Number of worker processes. Use 0 for one process per CPU core.",
+)
+@click.option(
+    "--stream",
+    is_flag=True,
+    help="Validate YAML files item by item to limit memory usage for huge files.",
+)
+@click.option(
+    "--check-refs",
+    is_flag=True,
+    help="Report keys that reference non-existent items, e.g., unknown species.",
+)
+@click.option(
+    "--check-balance",
+    is_flag=True,
+    help="Report reactions whose reactants and products differ in atoms or charge.",
+)
+@click.option(
+    "--identifier-cache",
+    is_flag=True,
+    help="Cache identifiers recalculated with RDKit on disk for later runs.",
+)
+@click.pass_context
+def validate(
+    ctx: click.Context,
+    paths: tuple[str, ...],
+    jobs: int,
+    stream: bool,
+    check_refs: bool,
+    check_balance: bool,
+    identifier_cache: bool,
+):
+    """Validate RMMD files against the RMMD schema.
+
+    PATHS can be files, directories (searched recursively for *.yaml, *.yml,
+    *.json and *.json.gz files and split-file datasets) or glob patterns. The exit
+    code is 0 if all files are valid and 1 otherwise.
+    """
+    files = _expand_paths(paths)
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+
+    start = time.perf_counter()
+    results: dict[str, FileResult] = {}
+
+    for result in _validate_files(
+        files, jobs, stream, check_refs, identifier_cache, check_balance
+    ):
+        results[result.path] = result
+        if result.ok:
+            click.echo(f"ok      {result.path} ({result.seconds:.3f} s)")
+        else:
+            click.echo(f"FAILED  {result.path} ({result.seconds:.3f} s)")
+            click.echo(result.error)
+
+    # report in input order, not in order of completion
+    ordered = [results[str(file)] for file in files]
+    _print_summary(ordered, time.perf_counter() - start)
+
+    ctx.exit(0 if all(result.ok for result in ordered) else 1)
+
+
+##############################################################################
+# convert
+##############################################################################
+
+
+@rmmd.command("convert")
+@click.argument("source", type=click.Path(exists=True, path_type=Path))
+@click.argument("target", type=click.Path(path_type=Path))
 @click.option(
-    "-o",
-    "--option",
-    default=0,
+    "--shard-format",
+    type=click.Choice([".yaml", ".json", ".json.gz"]),
+    default=".yaml",
     show_default=True,
-    help="This is a dummy option to show how to add them with click.",
+    help="File format of the shards, if TARGET is a dataset directory.",
+)
+@click.option(
+    "--externalize-arrays",
+    "min_array_size",
+    type=click.IntRange(min=1),
+    default=None,
+    metavar="MIN_SIZE",
+    help="Store numerical arrays with at least MIN_SIZE elements, e.g., Hessians or "
+    "rate tables, in binary .npy files in an 'arrays' directory next to TARGET.",
 )
-def validate(model_file, option: int):
-    """Validate MODEL_FILE against RMMD schema."""
-    print(f"You requested to validate {model_file}...")
-    print(f"Option value: {option}")
+@click.pass_context
+def convert(
+    ctx: click.Context,
+    source: Path,
+    target: Path,
+    shard_format: str,
+    min_array_size: int | None,
+):
+    """Convert the RMMD file or dataset SOURCE to TARGET.
 
-    content = yaml.safe_load(model_file)
+    The formats are determined by the file suffixes: .yaml/.yml (YAML), .json
+    (JSON) or .json.gz (gzip-compressed JSON). If TARGET has none of these
+    suffixes, it is written as a dataset directory with one shard per registry.
+    SOURCE is validated before it is written to TARGET.
+    """
     try:
-        Schema.model_validate(content)
-    except ValidationError as e:
-        print("Validation failed:")
-        print(e)
-        return 1
-    else:
-        print("Validation succeeded.")
-        return 0
+        if source.is_dir():
+            schema = load_dataset(source, lazy=False)
+        else:
+            schema = load(source)
+
+        # array files are referenced relative to the RMMD file
+        source_dir = source if source.is_dir() else source.parent
+        target_dir = target.parent if is_rmmd_file(target) else target
+        target_dir.mkdir(parents=True, exist_ok=True)
+        if source_dir.resolve() != target_dir.resolve():
+            inline_arrays(schema)
+        if min_array_size is not None:
+            externalize_arrays(schema, target_dir, min_size=min_array_size)
+
+        if is_rmmd_file(target):
+            dump(schema, target)
+        else:
+            dump_dataset(schema, target, suffix=shard_format)
+    except (OSError, ValueError, yaml.YAMLError, ValidationError) as err:
+        click.echo(f"Could not convert {source}:", err=True)
+        click.echo(str(err), err=True)
+        ctx.exit(1)
+
+    click.echo(f"Converted {source} to {target}.")
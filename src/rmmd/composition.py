@@ -0,0 +1,171 @@
+"""Element and charge balance of the reactions in a dataset.
+
+The element counts and charges of all species are collected in a species × element
+matrix, and the reactants and products of all reactions in sparse reaction × species
+stoichiometry matrices (see :mod:`rmmd.stoichiometry`). The balance of all
+reactions is then computed with one sparse matrix product::
+
+    for imbalance in check_balance(schema):
+        print(imbalance)  # reactions.R1: H: -1, charge: +1 (products - reactants)
+
+The composition of a species is the constitution of its first molecular entity, i.e.,
+all entities of a species are assumed to have the same constitution, e.g., different
+conformers or spin states. Catalysts and solvents are not part of the balance.
+Reactions referencing unknown species and species with unknown entities are skipped,
+because they are reported by :func:`rmmd.refs.check_references`.
+"""
+
+from __future__ import annotations
+
+from typing import Literal, NamedTuple
+
+import numpy as np
+
+from .elements import element_table
+from .keys import EntityKey, ReactionIndex, SpeciesName
+from .schema import Schema
+from .species import MolecularEntity
+from .stoichiometry import stoichiometry
+
+
+class Composition(NamedTuple):
+    """element counts and charges of all species (or entities) of a dataset"""
+
+    keys: tuple[SpeciesName | EntityKey, ...]
+    """row labels, in the order of the species (or entity) registry"""
+    elements: tuple[str, ...]
+    """column labels, ordered by atomic number"""
+    counts: np.ndarray
+    """(n_rows, n_elements) number of atoms of each element in each species,
+    isotopes included, e.g., D2O has two H atoms"""
+    charges: np.ndarray
+    """(n_rows,) total charge of each species"""
+    known: np.ndarray
+    """(n_rows,) whether the composition of the species is known, i.e., its
+    molecular entity exists. Rows of unknown species are zero."""
+
+
+class Imbalance(NamedTuple):
+    """difference between the products and reactants of an unbalanced reaction"""
+
+    reaction: ReactionIndex
+    """key of the reaction"""
+    elements: dict[str, int]
+    """difference of the atom count of each unbalanced element"""
+    charge: int
+    """difference of the total charge"""
+
+    def __str__(self) -> str:
+        diffs = [f"{element}: {diff:+d}" for element, diff in self.elements.items()]
+        if self.charge:
+            diffs.append(f"charge: {self.charge:+d}")
+        return f"reactions.{self.reaction}: {', '.join(diffs)} (products - reactants)"
+
+
+def _rows(
+    schema: Schema, of: Literal["species", "entities"]
+) -> tuple[tuple[SpeciesName | EntityKey, ...], list[MolecularEntity | None]]:
+    """keys and molecular entities (None if unknown) of the rows of a matrix"""
+    entities = schema.entities.root
+    if of == "species":
+        keys = tuple(schema.species.root)
+        items = [
+            entities.get(item.entities[0]) for item in schema.species.root.values()
+        ]
+        return keys, items
+    return tuple(entities), list(entities.values())
+
+
+def composition_matrix(
+    schema: Schema, of: Literal["species", "entities"] = "species"
+) -> Composition:
+    """Element counts and charges of all species or molecular entities in *schema*.
+
+    The InChI of each molecular entity is only parsed once (see
+    :func:`rmmd.inchi.parse_inchi`). Isotopes are counted as their element.
+
+    :param of: registry whose items are the rows of the matrix
+    """
+    keys, items = _rows(schema, of)
+
+    columns: dict[str, int] = {}
+    rows, cols, values = [], [], []
+    charges = np.zeros(len(keys), dtype=np.int64)
+    known = np.zeros(len(keys), dtype=bool)
+
+    for i, entity in enumerate(items):
+        if entity is None:
+            continue
+        parsed = entity.parsed_inchi
+        for element, count in parsed.constitution.items():
+            rows.append(i)
+            cols.append(columns.setdefault(element, len(columns)))
+            values.append(count)
+        charges[i] = parsed.charge
+        known[i] = True
+
+    order = element_table().index
+    elements = sorted(columns, key=lambda el: (order.get(el, len(order)), el))
+    permutation = np.array([columns[element] for element in elements], dtype=np.int64)
+    counts = np.zeros((len(keys), len(columns)), dtype=np.int64)
+    counts[rows, cols] = values
+    return Composition(keys, tuple(elements), counts[:, permutation], charges, known)
+
+
+def molecular_weights(
+    schema: Schema, of: Literal["species", "entities"] = "species"
+) -> np.ndarray:
+    """Molecular weights of all species or molecular entities in *schema*.
+
+    Computed from the standard atomic weights (see :func:`rmmd.elements.element_table`)
+    in one matrix-vector product. Isotopic labels of the InChIs, e.g., of D2O, are
+    then taken into account with the masses of the respective isotopes. The mass of
+    missing or excess electrons of ions is neglected.
+
+    :param of: registry whose items are weighted
+    :return: molecular weight of each item in g/mol in the order of the registry, NaN
+        for species with unknown entities
+    """
+    composition = composition_matrix(schema, of)
+    table = element_table()
+    masses = table.atomic_masses[[table.index[el] for el in composition.elements]]
+    weights = composition.counts @ masses
+    weights[~composition.known] = np.nan
+
+    _, items = _rows(schema, of)
+    for i, entity in enumerate(items):
+        if entity is None:
+            continue
+        for element, shift in entity.parsed_inchi.isotopic_atoms:
+            weight = table.atomic_masses[table.index[element]]
+            mass_number = round(weight) + shift
+            weights[i] += table.isotope_mass(element, mass_number) - weight
+    return weights
+
+
+def check_balance(schema: Schema) -> list[Imbalance]:
+    """All reactions in *schema* that do not conserve the atoms or the charge.
+
+    :return: unbalanced reactions in the order of the reaction registry
+    """
+    composition = composition_matrix(schema)
+    reactions = stoichiometry(schema)
+    net = reactions.net
+
+    element_diffs = net @ composition.counts
+    charge_diffs = net @ composition.charges
+    unknown = (~composition.known).astype(np.int64)
+    checkable = (reactions.reactants @ unknown + reactions.products @ unknown) == 0
+
+    unbalanced = checkable & (np.any(element_diffs, axis=1) | (charge_diffs != 0))
+    imbalances = []
+    for i in np.flatnonzero(unbalanced):
+        diffs = element_diffs[i]
+        imbalances.append(
+            Imbalance(
+                reactions.reactions[i],
+                {composition.elements[j]: int(diffs[j]) for j in np.flatnonzero(diffs)},
+                int(charge_diffs[i]),
+            )
+        )
+    return imbalances
@@ -0,0 +1,263 @@
+"""RMMD datasets split over multiple files.
+
+Instead of a single RMMD file, a dataset can be stored in a directory::
+
+    my-dataset/
+        rmmd.yaml             # root file: schema_version, metadata, literature, ...
+        species.yaml          # items of the species registry
+        reactions.json.gz     # items of the reactions registry
+        calculations/         # items of the calculations registry, in several shards
+            optimizations.yaml
+            irc-scans.yaml
+
+The root file ``rmmd.<suffix>`` contains all fields of the root schema that are not
+registries and may contain registries as well. The items of a registry can be stored
+in a shard file named like the registry field of the root schema and/or in any number
+of shard files in a directory of that name. Each shard contains a mapping of keys to
+items. All RMMD file formats (see :data:`rmmd.io.RMMD_FILE_SUFFIXES`) can be used.
+
+By default, a registry is only parsed and validated when it is accessed for the first
+time, so tools that only use the mechanism view do not pay for loading, e.g.,
+quantum chemistry calculations.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+from pydantic import PrivateAttr, ValidationError
+
+from .io import RMMD_FILE_SUFFIXES, dump_data, is_rmmd_file, load_data
+from .registry import Registry
+from .schema import REGISTRY_NAMES, Schema
+
+ROOT_FILE_STEM = "rmmd"
+"""name of the root file of a dataset directory without suffix"""
+
+
+def find_root_file(directory: str | Path) -> Path | None:
+    """root file of the dataset in *directory* or None, if it is not a dataset"""
+    for suffix in RMMD_FILE_SUFFIXES:
+        path = Path(directory) / f"{ROOT_FILE_STEM}{suffix}"
+        if path.is_file():
+            return path
+    return None
+
+
+def _find_shards(directory: Path, name: str) -> list[Path]:
+    shards = [
+        directory / f"{name}{suffix}"
+        for suffix in RMMD_FILE_SUFFIXES
+        if (directory / f"{name}{suffix}").is_file()
+    ]
+    if (directory / name).is_dir():
+        shards += sorted(
+            p for p in (directory / name).rglob("*") if p.is_file() and is_rmmd_file(p)
+        )
+    return shards
+
+
+def _load_registry(name: str, sources: list[Path | dict], directory: Path) -> Registry:
+    """merge the items from all shards of a registry and validate them"""
+    items: dict[str, Any] = {}
+    origin: dict[str, Path | str] = {}
+
+    for source in sources:
+        if isinstance(source, dict):  # inline in the root file
+            shard, location = source, "root file"
+        else:
+            shard, location = load_data(source), source
+        if shard is None:  # empty file
+            continue
+        if not isinstance(shard, dict):
+            raise ValueError(f"Shard {location} of '{name}' must contain a mapping.")
+
+        for key, item in shard.items():
+            if key in items:
+                raise ValueError(
+                    f"Duplicate key '{key}' in '{name}': found in {origin[key]} "
+                    f"and {location}."
+                )
+            items[key] = item
+            origin[key] = location
+
+    registry_type = Schema.model_fields[name].annotation
+    try:
+        return registry_type.model_validate(items, context={"base_path": directory})
+    except ValidationError as err:
+        # locate the errors like for a single-file dataset and name the shards
+        errors = err.errors(include_url=False)
+        shards = dict.fromkeys(
+            str(_relative(origin[loc[0]], directory))
+            for loc in (error["loc"] for error in errors)
+            if loc and loc[0] in origin
+        )
+        title = registry_type.__name__
+        if shards:
+            title += f" ({', '.join(shards)})"
+        raise ValidationError.from_exception_data(
+            title,
+            [
+                {
+                    "type": error["type"],
+                    "loc": (name, *error["loc"]),
+                    "input": error["input"],
+                    **({"ctx": error["ctx"]} if "ctx" in error else {}),
+                }
+                for error in errors
+            ],
+        ) from None
+
+
+def _relative(location: Path | str, directory: Path) -> Path | str:
+    if isinstance(location, Path) and location.is_relative_to(directory):
+        return location.relative_to(directory)
+    return location
+
+
+class _LazyRegistry:
+    """descriptor loading a registry of a :class:`LazySchema` on first access"""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __get__(self, instance: LazySchema | None, owner: type | None = None):
+        if instance is None:
+            return self
+        if self.name not in instance.__dict__:
+            # keep the sources until the registry is valid, so that errors are
+            # raised again on the next access
+            registry = _load_registry(
+                self.name, instance._unloaded[self.name], instance._directory
+            )
+            instance.__dict__[self.name] = registry
+            del instance._unloaded[self.name]
+        return instance.__dict__[self.name]
+
+    def __set__(self, instance: LazySchema, value: Registry) -> None:
+        # only called for direct assignments to __dict__ bypassing pydantic
+        instance._unloaded.pop(self.name, None)
+        instance.__dict__[self.name] = value
+
+
+class LazySchema(Schema):
+    """Root schema whose registries are loaded from shard files on first access.
+
+    Apart from lazy loading, a ``LazySchema`` behaves like a :class:`Schema`.
+    Serializing, comparing or copying it loads all registries.
+    """
+
+    _unloaded: dict[str, list[Path | dict]] = PrivateAttr(default_factory=dict)
+    """sources of registries that were not loaded yet"""
+    _directory: Path = PrivateAttr(default=Path("."))
+    """dataset directory"""
+
+    @property
+    def loaded_registries(self) -> list[str]:
+        """names of the registries that have been loaded"""
+        return [name for name in REGISTRY_NAMES if name not in self._unloaded]
+
+    def load_all(self) -> None:
+        """load all registries that were not accessed yet"""
+        for name in list(self._unloaded):
+            getattr(self, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        self._unloaded.pop(name, None)  # replaced before it was loaded
+        super().__setattr__(name, value)
+
+    # methods accessing the fields via __dict__ instead of attribute access
+    def model_dump(self, *args, **kwargs):
+        self.load_all()
+        return super().model_dump(*args, **kwargs)
+
+    def model_dump_json(self, *args, **kwargs):
+        self.load_all()
+        return super().model_dump_json(*args, **kwargs)
+
+    def model_copy(self, *args, **kwargs):
+        self.load_all()
+        return super().model_copy(*args, **kwargs)
+
+    def __eq__(self, other: object) -> bool:
+        self.load_all()
+        if isinstance(other, LazySchema):
+            other.load_all()
+        # allow comparison with eagerly loaded schemas
+        if isinstance(other, Schema):
+            return self.__dict__ == other.__dict__
+        return NotImplemented
+
+    def __getstate__(self) -> dict[Any, Any]:
+        self.load_all()
+        return super().__getstate__()
+
+    def __repr_args__(self):
+        self.load_all()
+        return super().__repr_args__()
+
+
+for _name in REGISTRY_NAMES:
+    setattr(LazySchema, _name, _LazyRegistry(_name))
+
+
+def load_dataset(directory: str | Path, *, lazy: bool = True) -> Schema:
+    """Load an RMMD dataset from a directory.
+
+    :param directory: dataset directory containing the root file and the shards
+    :param lazy: only load and validate each registry when it is first accessed. If
+        False, all registries are loaded and validated immediately.
+    :raises pydantic.ValidationError: if the root file or a registry is invalid.
+        With ``lazy=True``, errors in registries are raised on first access.
+    :raises ValueError: if the dataset layout is invalid, e.g., a key is used in
+        multiple shards of the same registry
+    """
+    directory = Path(directory)
+    root_file = find_root_file(directory)
+    if root_file is None:
+        raise ValueError(f"'{directory}' does not contain a root file 'rmmd.*'.")
+
+    root = load_data(root_file)
+    if not isinstance(root, dict):
+        # let the schema produce a helpful error
+        return Schema.model_validate(root, context={"base_path": directory})
+
+    sources: dict[str, list[Path | dict]] = {}
+    for name in REGISTRY_NAMES:
+        shards: list[Path | dict] = list(_find_shards(directory, name))
+        if shards:
+            if isinstance(root.get(name), dict):
+                shards.insert(0, root.pop(name))
+            sources[name] = shards
+        # registries without shards are validated with the root file
+
+    schema = LazySchema.model_validate(root, context={"base_path": directory})
+    schema._directory = directory
+    for name, shards in sources.items():
+        del schema.__dict__[name]
+        schema.__pydantic_fields_set__.add(name)
+        schema._unloaded[name] = shards
+
+    if not lazy:
+        schema.load_all()
+    return schema
+
+
+def dump_dataset(schema: Schema, directory: str | Path, suffix: str = ".yaml") -> None:
+    """Write *schema* as a dataset with one shard per non-empty registry.
+
+    :param schema: RMMD data to write
+    :param directory: dataset directory, created if necessary
+    :param suffix: file suffix determining the format of all files, see
+        :data:`rmmd.io.RMMD_FILE_SUFFIXES`
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    data = schema.model_dump(mode="json", by_alias=True, exclude_none=True)
+    for name in REGISTRY_NAMES:
+        # empty registries are kept in the root file
+        if data.get(name):
+            dump_data(data.pop(name), directory / f"{name}{suffix}")
+    dump_data(data, directory / f"{ROOT_FILE_STEM}{suffix}")
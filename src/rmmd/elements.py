@@ -1,7 +1,20 @@
-"""elements of the periodic table"""
+"""elements of the periodic table
+
+Besides the symbols, the module provides an array-based table of element and isotope
+properties taken from RDKit's periodic table::
+
+    table = element_table()
+    table.atomic_masses[table.index["C"]]  # 12.011
+    table.isotope_mass("C", 13)  # 13.00335484
+"""
 
 from __future__ import annotations
-from typing import Literal, TypeAlias
+
+from functools import cache
+from typing import Literal, NamedTuple, TypeAlias, get_args
+
+import numpy as np
+from rdkit.Chem import GetPeriodicTable
 
 
 ElementSymbol: TypeAlias = Literal[
@@ -124,3 +137,89 @@ ElementSymbol: TypeAlias = Literal[
     "Ts",
     "Og",
 ]
+
+
+########################################################################################
+# element and isotope properties
+########################################################################################
+
+
+class ElementTable(NamedTuple):
+    """properties of all elements, one array entry per element ordered by atomic
+    number, and of all known isotopes"""
+
+    symbols: tuple[ElementSymbol, ...]
+    """element symbols, i.e., ``symbols[Z - 1]`` is the element with atomic number Z"""
+    index: dict[str, int]
+    """index of each element symbol in the arrays"""
+    atomic_numbers: np.ndarray
+    """(n_elements,) atomic number of each element"""
+    atomic_masses: np.ndarray
+    """(n_elements,) standard atomic weight in u (g/mol). For elements without
+    stable isotopes, the mass number of the most stable isotope."""
+    most_common_isotopes: np.ndarray
+    """(n_elements,) mass number of the most abundant (or most stable) isotope"""
+    isotope_indptr: np.ndarray
+    """(n_elements + 1,) isotopes of element i are at ``isotope_indptr[i]`` to
+    ``isotope_indptr[i + 1]`` (exclusive) in the isotope arrays"""
+    isotope_mass_numbers: np.ndarray
+    """(n_isotopes,) mass number of each isotope, ascending per element"""
+    isotope_masses: np.ndarray
+    """(n_isotopes,) mass of each isotope in u"""
+    isotope_abundances: np.ndarray
+    """(n_isotopes,) natural abundance of each isotope in percent"""
+
+    def isotopes(self, symbol: str) -> slice:
+        """positions of the isotopes of *symbol* in the isotope arrays"""
+        i = self.index[symbol]
+        return slice(self.isotope_indptr[i], self.isotope_indptr[i + 1])
+
+    def isotope_mass(self, symbol: str, mass_number: int) -> float:
+        """mass of an isotope in u
+
+        :raises KeyError: if the isotope is unknown
+        """
+        isotopes = self.isotopes(symbol)
+        mass_numbers = self.isotope_mass_numbers[isotopes]
+        i = np.searchsorted(mass_numbers, mass_number)
+        if i == mass_numbers.size or mass_numbers[i] != mass_number:
+            raise KeyError(f"Unknown isotope: {mass_number}{symbol}")
+        return float(self.isotope_masses[isotopes][i])
+
+
+@cache
+def element_table() -> ElementTable:
+    """The table of element and isotope properties, built on first use."""
+    periodic_table = GetPeriodicTable()
+    symbols: tuple[ElementSymbol, ...] = get_args(ElementSymbol)
+    atomic_numbers = np.arange(1, len(symbols) + 1)
+
+    indptr, mass_numbers, masses, abundances = [0], [], [], []
+    for z in atomic_numbers.tolist():
+        # RDKit has no list of isotopes, but returns a mass of 0 for unknown ones
+        for mass_number in range(z, 3 * z + 20):
+            mass = periodic_table.GetMassForIsotope(z, mass_number)
+            if mass > 0:
+                mass_numbers.append(mass_number)
+                masses.append(mass)
+                abundances.append(periodic_table.GetAbundanceForIsotope(z, mass_number))
+        indptr.append(len(mass_numbers))
+
+    table = ElementTable(
+        symbols=symbols,
+        index={symbol: i for i, symbol in enumerate(symbols)},
+        atomic_numbers=atomic_numbers,
+        atomic_masses=np.array(
+            [periodic_table.GetAtomicWeight(z) for z in atomic_numbers.tolist()]
+        ),
+        most_common_isotopes=np.array(
+            [periodic_table.GetMostCommonIsotope(z) for z in atomic_numbers.tolist()]
+        ),
+        isotope_indptr=np.array(indptr),
+        isotope_mass_numbers=np.array(mass_numbers),
+        isotope_masses=np.array(masses),
+        isotope_abundances=np.array(abundances),
+    )
+    for array in table[2:]:
+        array.flags.writeable = False  # shared by all users of the table
+    return table
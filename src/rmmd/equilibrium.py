@@ -0,0 +1,253 @@
+"""Batched evaluation of equilibrium constants and reverse rate coefficients.
+
+An :class:`EquilibriumBank` combines the thermochemistry models of all species (see
+:class:`rmmd.thermo_eval.ThermoBank`) with the net stoichiometry of all reactions (see
+:mod:`rmmd.stoichiometry`) to compute reaction Gibbs free energies and equilibrium
+constants of all reactions at many temperatures at once::
+
+    bank = EquilibriumBank.from_schema(schema)
+    T = np.linspace(300, 2000, 100)
+    eq = bank.evaluate(T)  # eq.dG, eq.Kp, eq.Kc: (n_reactions, 100) arrays
+    k_rev = bank.reverse_rate_coefficients(T, p=1e5)
+    k_rev_1 = k_rev[bank.index["R1"]]
+
+The Gibbs free energy of each species is taken from the first of its thermo items that
+can be evaluated. Each model is given relative to its reference state (or the dataset
+default), so that the Gibbs free energies are first converted to a common standard
+pressure assuming ideal gases, ``G(T, p°) = G(T, p_ref) + R T ln(p° / p_ref)``. Then,
+
+- ``ΔG° = ν G°`` with the net stoichiometric coefficients ν,
+- ``Kp = exp(-ΔG° / (R T))`` and
+- ``Kc = Kp (p° / (R T))^Δn`` in SI units, i.e., (mol/m³)^Δn, with ``Δn = Σ ν``.
+
+Results are NaN for reactions with species without an evaluable thermo model, with
+species in solute reference states, or with species whose models use different element
+references (e.g., "most stable form" and "quantum chemistry"), because their energies
+cannot be combined.
+"""
+
+from __future__ import annotations
+
+from typing import NamedTuple
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from .kinetics_eval import KineticsBank
+from .schema import Schema
+from .stoichiometry import Stoichiometry
+from .thermo import ReferenceStatePure
+from .thermo_eval import R, EvaluableThermo, ThermoBank
+
+
+class EquilibriumProperties(NamedTuple):
+    """equilibrium properties of all reactions at all temperatures
+
+    Each property is an (n_reactions, n_temperatures) array.
+    """
+
+    dG: np.ndarray
+    """standard Gibbs free energy of reaction in J/mol"""
+    Kp: np.ndarray
+    """pressure-based equilibrium constant (dimensionless)"""
+    Kc: np.ndarray
+    """concentration-based equilibrium constant in (mol/m³)^Δn"""
+
+
+class EquilibriumBank:
+    """Thermochemistry of the species of all reactions packed for batched evaluation.
+
+    The rows of all results follow the order of :attr:`reactions`.
+    """
+
+    def __init__(
+        self,
+        stoichiometry: Stoichiometry,
+        thermo: ThermoBank,
+        species_thermo: list[str | None],
+        standard_pressure: float = 1e5,
+        rate_coefficients: list[str | None] | None = None,
+        kinetics: KineticsBank | None = None,
+    ):
+        """
+        :param stoichiometry: reactions whose equilibrium constants are computed
+        :param thermo: thermochemistry models of the species
+        :param species_thermo: key of the model in *thermo* for each species (column of
+            the stoichiometry), None for species without a model
+        :param standard_pressure: standard pressure p° of the results in Pa
+        :param rate_coefficients: key of the forward rate coefficient in *kinetics* for
+            each reaction, None for reactions without one. Only needed for
+            :meth:`reverse_rate_coefficients`.
+        :param kinetics: forward rate coefficients of the reactions
+        """
+        self.reactions = stoichiometry.reactions
+        """keys of the reactions, in the order of the rows"""
+        self.index = stoichiometry.reaction_index
+        """row of each reaction by its key"""
+        self.standard_pressure = standard_pressure
+        """standard pressure p° in Pa"""
+        self._stoichiometry = stoichiometry
+        self._thermo = thermo
+        self._kinetics = kinetics
+        self._kinetics_rows = None
+        """row of the forward rate coefficient of each reaction, -1 if there is none"""
+        if kinetics is not None and rate_coefficients is not None:
+            self._kinetics_rows = np.array(
+                [
+                    -1 if key is None else kinetics.index[key]
+                    for key in rate_coefficients
+                ],
+                dtype=np.int64,
+            )
+
+        n_species = len(stoichiometry.species)
+        self._thermo_rows = np.array(
+            [-1 if key is None else thermo.index[key] for key in species_thermo],
+            dtype=np.int64,
+        )
+        """row of each species in the thermo bank, -1 without model"""
+        self._ln_p_ratio = np.full(n_species, np.nan)
+        """ln(p° / p_ref) of each species, NaN if its energy cannot be used"""
+        element_reference = np.zeros(n_species, dtype=np.int64)
+        for j, row in enumerate(self._thermo_rows.tolist()):
+            if row < 0:
+                continue
+            state = thermo.reference_states[row]
+            if isinstance(state, ReferenceStatePure):
+                self._ln_p_ratio[j] = np.log(standard_pressure / state.p)
+                element_reference[j] = (
+                    1 if state.element_reference == "most stable form" else 2
+                )
+
+        # reactions combining different element references cannot be evaluated
+        incidence = stoichiometry.reactants + stoichiometry.products
+        mixed = ((incidence @ (element_reference == 1)) > 0) & (
+            (incidence @ (element_reference == 2)) > 0
+        )
+        self._mixed_references = mixed
+        self._delta_n = stoichiometry.net @ np.ones(n_species, dtype=np.int64)
+
+    @classmethod
+    def from_schema(
+        cls, schema: Schema, standard_pressure: float | None = None
+    ) -> EquilibriumBank:
+        """Collect the reactions, thermochemistry models and forward rate coefficients
+        of *schema*.
+
+        :param schema: dataset containing the reactions
+        :param standard_pressure: standard pressure p° of the results in Pa, by
+            default the pressure of the dataset's default reference state
+        """
+        stoichiometry = schema.stoichiometry()
+        species_thermo: list[str | None] = []
+        for name in stoichiometry.species:
+            species_thermo.append(
+                next(
+                    (
+                        key
+                        for key in schema.species[name].thermo
+                        if isinstance(schema.thermo.get(key), EvaluableThermo)
+                    ),
+                    None,
+                )
+            )
+        thermo = ThermoBank.from_schema(
+            schema, dict.fromkeys(key for key in species_thermo if key is not None)
+        )
+
+        rate_coefficients = [
+            next(
+                (
+                    key
+                    for key in schema.reactions[reaction].rate_constants
+                    if key in schema.rate_constants
+                ),
+                None,
+            )
+            for reaction in stoichiometry.reactions
+        ]
+        kinetics = KineticsBank.from_schema(
+            schema, dict.fromkeys(key for key in rate_coefficients if key is not None)
+        )
+
+        if standard_pressure is None:
+            standard_pressure = schema.default_reference_state.p
+        return cls(
+            stoichiometry,
+            thermo,
+            species_thermo,
+            standard_pressure,
+            rate_coefficients,
+            kinetics,
+        )
+
+    def __len__(self) -> int:
+        return len(self.reactions)
+
+    def evaluate(
+        self, T: ArrayLike, extrapolate: bool = False
+    ) -> EquilibriumProperties:
+        """Evaluate ΔG°, Kp and Kc of all reactions at the temperatures *T*.
+
+        :param T: temperatures in K, scalar or 1D array
+        :param extrapolate: extrapolate the thermochemistry models outside of their
+            temperature ranges (see :meth:`ThermoBank.evaluate`). Otherwise, the
+            results are NaN there.
+        :return: properties as (n_reactions, n_temperatures) arrays
+        """
+        T = np.atleast_1d(np.asarray(T, dtype=np.float64))
+        RT = R * T
+
+        g = np.full((len(self._thermo_rows), T.size), np.nan)
+        has_model = self._thermo_rows >= 0
+        g[has_model] = self._thermo.g(T, extrapolate)[self._thermo_rows[has_model]]
+        g += self._ln_p_ratio[:, None] * RT
+
+        dG = self._stoichiometry.net @ g
+        dG[self._mixed_references] = np.nan
+        Kp = np.exp(-dG / RT)
+        Kc = Kp * (self.standard_pressure / RT) ** self._delta_n[:, None]
+        return EquilibriumProperties(dG, Kp, Kc)
+
+    def dG(self, T: ArrayLike, extrapolate: bool = False) -> np.ndarray:
+        """standard Gibbs free energies of reaction in J/mol as (n_reactions,
+        n_temperatures) array"""
+        return self.evaluate(T, extrapolate).dG
+
+    def Kp(self, T: ArrayLike, extrapolate: bool = False) -> np.ndarray:
+        """pressure-based equilibrium constants as (n_reactions, n_temperatures)
+        array"""
+        return self.evaluate(T, extrapolate).Kp
+
+    def Kc(self, T: ArrayLike, extrapolate: bool = False) -> np.ndarray:
+        """concentration-based equilibrium constants in SI units as (n_reactions,
+        n_temperatures) array"""
+        return self.evaluate(T, extrapolate).Kc
+
+    def reverse_rate_coefficients(
+        self, T: ArrayLike, p: ArrayLike, extrapolate: bool = False
+    ) -> np.ndarray:
+        """Rate coefficients of the reverse reactions, ``k_rev = k_fwd / Kc``.
+
+        The forward rate coefficient of a reaction is the first of its
+        ``rate_constants``.
+
+        :param T: temperatures in K, scalar or 1D array
+        :param p: pressures in Pa, scalar or 1D array broadcastable to *T*
+        :param extrapolate: see :meth:`evaluate`
+        :return: (n_reactions, n_states) array of rate coefficients in SI units, NaN
+            for reactions without forward rate coefficient or equilibrium constant
+        :raises ValueError: if the bank was created without rate coefficients
+        """
+        if self._kinetics is None or self._kinetics_rows is None:
+            raise ValueError("No forward rate coefficients were given.")
+        T, p = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(T, dtype=np.float64)),
+            np.atleast_1d(np.asarray(p, dtype=np.float64)),
+        )
+
+        rows = self._kinetics_rows
+        k_forward = np.full((len(self.reactions), T.size), np.nan)
+        has_rate = rows >= 0
+        k_forward[has_rate] = self._kinetics.evaluate(T, p)[rows[has_rate]]
+        return k_forward / self.evaluate(T, extrapolate).Kc
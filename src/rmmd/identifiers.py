@@ -1,11 +1,40 @@
-"""Identifiers for molecular entities and species."""
+"""Identifiers for molecular entities and species.
+
+With ``validation_strategy="full"`` or ``"recalculate"``, InChIs and SMILES are
+recalculated with RDKit. Recalculated values are cached in memory (see
+:data:`RECALCULATION_CACHE_SIZE`) and, after :func:`use_identifier_cache`, on disk,
+so that validating the same identifiers again, e.g., in other datasets, does not run
+RDKit again.
+
+:func:`validate_parallel` defers the recalculation of all identifiers of a dataset
+until the rest of the dataset is validated and then recalculates them in a process
+pool. Validation errors are the same as with ``model_validate``.
+"""
 
 from __future__ import annotations
 
+import os
 from abc import ABC, abstractmethod
-from typing import Annotated, Literal, Self, TypeAlias
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import (
+    TYPE_CHECKING,
+    Annotated,
+    Any,
+    Callable,
+    Literal,
+    Self,
+    TypeAlias,
+    TypeVar,
+)
 
-from pydantic import Field, model_validator
+from pydantic import (
+    BaseModel,
+    Field,
+    ValidationError,
+    ValidationInfo,
+    model_validator,
+)
 from rdkit.Chem import (
     MolBlockToInchi,
     MolFromInchi,
@@ -16,6 +45,187 @@ from rdkit.Chem import (
 
 from ._base import RmmdBaseModel
 
+if TYPE_CHECKING:
+    from .cache import IdentifierCache
+
+##############################################################################
+# recalculation with RDKit
+##############################################################################
+
+RECALCULATION_CACHE_SIZE = 2**16
+"""number of recalculated identifiers kept in memory"""
+
+
+def _inchi_from_inchi(value: str, options: str = "") -> str:
+    mol = MolFromInchi(value)
+    mol_block = MolToMolBlock(mol)
+    return MolBlockToInchi(mol_block, options=options)  # type: ignore
+
+
+def _smiles_from_smiles(value: str) -> str:
+    mol = MolFromSmiles(value)
+    return MolToSmiles(mol)
+
+
+_RECALCULATIONS: dict[str, Callable[[str], str]] = {
+    "InChI": _inchi_from_inchi,
+    "InChI-fixedH": lambda value: _inchi_from_inchi(value, options="-FixedH"),
+    "SMILES": _smiles_from_smiles,
+}
+"""RDKit round trip of each identifier type"""
+
+_disk_cache: IdentifierCache | None = None
+
+
+def use_identifier_cache(cache: IdentifierCache | bool = True) -> None:
+    """Enable or disable the on-disk cache of recalculated identifiers.
+
+    :param cache: cache to use, True for an :class:`~rmmd.cache.IdentifierCache` in
+        the default cache directory or False to disable the on-disk cache
+    """
+    global _disk_cache
+    if cache is True:
+        from .cache import IdentifierCache  # avoid circular import
+
+        cache = IdentifierCache()
+    _disk_cache = cache or None
+
+
+@lru_cache(maxsize=RECALCULATION_CACHE_SIZE)
+def recalculate_identifier(type_: str, value: str) -> str:
+    """Recalculate an identifier with RDKit, using the in-memory and on-disk caches.
+
+    :param type_: identifier type, e.g., "InChI" or "SMILES"
+    :param value: identifier
+    :raises NotImplementedError: if recalculation is not supported for *type_*
+    """
+    try:
+        recalculate = _RECALCULATIONS[type_]
+    except KeyError:
+        msg = f"Recalculation is not implemented for type {type_}"
+        raise NotImplementedError(msg) from None
+
+    disk_cache = _disk_cache
+    if disk_cache is not None:
+        cached = disk_cache.get(type_, value)
+        if cached is not None:
+            return cached
+
+    result = recalculate(value)
+    if disk_cache is not None:
+        disk_cache.put(type_, value, result)
+    return result
+
+
+##############################################################################
+# deferred recalculation in a process pool
+##############################################################################
+
+_DEFERRED = "rmmd_deferred_identifiers"
+"""context key of the list collecting the identifiers to recalculate later"""
+_RESULTS = "rmmd_recalculated_identifiers"
+"""context key of the recalculated identifiers by (type, value)"""
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def _recalculate_many(identifiers: list[tuple[str, str]]) -> list[str | None]:
+    """recalculate identifiers in a worker process, None if RDKit fails"""
+    results = []
+    for type_, value in identifiers:
+        try:
+            results.append(recalculate_identifier(type_, value))
+        except Exception:  # noqa: BLE001
+            # the error is raised again by the serial validation
+            results.append(None)
+    return results
+
+
+def recalculate_parallel(
+    identifiers: list[tuple[str, str]], jobs: int | None = None, chunk_size: int = 64
+) -> dict[tuple[str, str], str | None]:
+    """Recalculate many identifiers in a process pool.
+
+    :param identifiers: pairs of identifier type and value
+    :param jobs: number of worker processes, one per CPU core by default
+    :param chunk_size: number of identifiers sent to a worker at once
+    :return: recalculated identifiers by (type, value), None if RDKit failed
+    """
+    unique = list(dict.fromkeys(identifiers))
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(unique) <= chunk_size:
+        return dict(zip(unique, _recalculate_many(unique)))
+
+    chunks = [unique[i : i + chunk_size] for i in range(0, len(unique), chunk_size)]
+    # workers use the same on-disk cache (the in-memory cache is per process)
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=use_identifier_cache if _disk_cache else None,
+        initargs=(_disk_cache,) if _disk_cache else (),
+    ) as pool:
+        results = [
+            result for chunk in pool.map(_recalculate_many, chunks) for result in chunk
+        ]
+    return dict(zip(unique, results))
+
+
+def validate_parallel(
+    model: type[M],
+    data: Any,
+    *,
+    jobs: int | None = None,
+    context: dict[str, Any] | None = None,
+) -> M:
+    """Validate *data* and recalculate its identifiers in a process pool.
+
+    Identifiers with ``validation_strategy="full"`` or ``"recalculate"`` are
+    collected during validation and recalculated in parallel afterwards. If any of
+    them is invalid, *data* is validated again with the recalculated identifiers, so
+    that the raised errors are exactly those of ``model.model_validate``.
+
+    :param model: model to validate, e.g., :class:`rmmd.schema.Schema`
+    :param data: Python data or JSON (str or bytes)
+    :param jobs: number of worker processes, one per CPU core by default
+    :param context: validation context, e.g., ``{"base_path": ...}``
+    :raises pydantic.ValidationError: if *data* is invalid
+    """
+
+    def validate(extra_context: dict[str, Any]) -> M:
+        ctx = {**(context or {}), **extra_context}
+        if isinstance(data, (str, bytes)):
+            return model.model_validate_json(data, context=ctx)
+        return model.model_validate(data, context=ctx)
+
+    deferred: list[_ValidationStrategyMixin] = []
+    try:
+        result = validate({_DEFERRED: deferred})
+    except ValidationError:  # invalid, independent of the identifiers
+        result = None
+
+    keys = [(identifier.type, identifier.value) for identifier in deferred]
+    recalculated = recalculate_parallel(keys, jobs)
+
+    if result is not None:
+        valid = True
+        for identifier, key in zip(deferred, keys):
+            value = recalculated[key]
+            if value is None:
+                valid = False
+            elif identifier.validation_strategy == "recalculate":
+                identifier.value = value
+            elif value != identifier.value:
+                valid = False
+        if valid:
+            return result
+
+    # raise the same errors as the serial validation
+    return validate({_RESULTS: recalculated})
+
+
+##############################################################################
+# string identifiers
+##############################################################################
+
 
 class _StringIdentifierBase(RmmdBaseModel, ABC):
     """Base class for string identifiers with a type field."""
@@ -32,14 +242,22 @@ class _ValidationStrategyMixin(ABC):
     validation_strategy: Literal["quick", "full", "recalculate"] = "quick"
 
     @model_validator(mode="after")
-    def validate_string_identifier(self) -> Self:
+    def validate_string_identifier(self, info: ValidationInfo) -> Self:
         """Validate string identifier value."""
         if self.validation_strategy == "quick":
             self.quick_validate()
-        elif self.validation_strategy == "recalculate":
-            self.value = self.recalculate()
+            return self
+
+        context = info.context if isinstance(info.context, dict) else {}
+        if _DEFERRED in context:  # see validate_parallel
+            context[_DEFERRED].append(self)
+            return self
+        recalculated = context.get(_RESULTS, {}).get((self.type, self.value))
+
+        if self.validation_strategy == "recalculate":
+            self.value = recalculated or self.recalculate()
         elif self.validation_strategy == "full":
-            self.full_validate()
+            self.full_validate(recalculated)
         return self
 
     def quick_validate(self) -> None:
@@ -52,10 +270,14 @@ class _ValidationStrategyMixin(ABC):
         msg = f"Recalculation is not implemented for type {self.type}"
         raise NotImplementedError(msg)
 
-    def full_validate(self) -> None:
-        """Validate string identifier value (full)."""
+    def full_validate(self, recalculated_value: str | None = None) -> None:
+        """Validate string identifier value (full).
+
+        :param recalculated_value: result of :meth:`recalculate`, if it is known
+        """
         try:
-            recalculated_value = self.recalculate()
+            if recalculated_value is None:
+                recalculated_value = self.recalculate()
         except NotImplementedError:
             msg = f"Full validation is not implemented for type {self.type}"
             raise NotImplementedError(msg)
@@ -82,9 +304,7 @@ class _StandardInChI(_StringIdentifierBase, _ValidationStrategyMixin):
 
     def recalculate(self) -> str:
         """Recalculate string identifier value (no validation)."""
-        mol = MolFromInchi(self.value)
-        mol_block = MolToMolBlock(mol)
-        return MolBlockToInchi(mol_block)  # type: ignore
+        return recalculate_identifier(self.type, self.value)
 
 
 # public, as this is an important identifier type used in other modules
@@ -101,9 +321,7 @@ class FixedHInChI(_StringIdentifierBase, _ValidationStrategyMixin):
 
     def recalculate(self) -> str:
         """Recalculate string identifier value (no validation)."""
-        mol = MolFromInchi(self.value)
-        mol_block = MolToMolBlock(mol)
-        return MolBlockToInchi(mol_block, options="-FixedH")  # type: ignore
+        return recalculate_identifier(self.type, self.value)
 
 
 class _StandardInChIKey(_StringIdentifierBase):
@@ -125,8 +343,7 @@ class _SMILES(_StringIdentifierBase, _ValidationStrategyMixin):
 
     def recalculate(self) -> str:
         """Recalculate string identifier value (no validation)."""
-        mol = MolFromSmiles(self.value)
-        return MolToSmiles(mol)
+        return recalculate_identifier(self.type, self.value)
 
 
 class _CustomStringIdentifier(_StringIdentifierBase):
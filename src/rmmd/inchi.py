@@ -0,0 +1,180 @@
+"""Parsing of InChI strings into their layers.
+
+:func:`parse_inchi` splits an InChI into its layers once and derives the
+constitution (element counts) and the total charge from them. Results are interned,
+i.e., all molecular entities with the same InChI share one :class:`ParsedInChI`, so
+that, e.g., balance checks over many reactions do not parse the same InChI again::
+
+    parsed = parse_inchi("InChI=1/C2H4O2/c1-2(3)4/h1H3,(H,3,4)/p-1/fC2H3O2/h3h/q-1")
+    parsed.formula  # "C2H4O2"
+    parsed.constitution  # {"C": 2, "H": 3, "O": 2}
+    parsed.charge  # -1
+
+Isotopic labels of the main layer are listed per atom, e.g., heavy water::
+
+    parse_inchi("InChI=1S/H2O/h1H2/i/hD2").isotopic_atoms  # (("H", 1), ("H", 1))
+
+Assumptions (as for all InChIs in RMMD): the InChI is valid, there is no reconnected
+layer and only the main layer (up to the first stereo, isotope or fixed-H layer)
+determines the constitution and charge.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping
+
+INCHI_CACHE_SIZE = 2**18
+"""number of parsed InChIs kept in memory"""
+
+_LAYER = re.compile(r"/([a-z]?)([^/]*)")
+"""prefix and content of each layer after the version"""
+_FRAGMENT = re.compile(r"(\d*)(.*)")
+"""multiplier and formula of each fragment, e.g., "2H2O" in "C2H4O2.2H2O" """
+_ELEMENT = re.compile(r"([A-Z][a-z]?)(\d*)")
+_ISOTOPIC_ATOM = re.compile(r"(\d+)([+-]\d+)?((?:[HDT]\d*)*)")
+"""atom number, mass shift and isotopic hydrogens of an atom, e.g., "1+1D" """
+_HYDROGEN_ISOTOPE = re.compile(r"([HDT])(\d*)")
+_HYDROGEN_SHIFTS = {"H": 0, "D": 1, "T": 2}
+"""mass shift of each hydrogen isotope relative to the rounded atomic mass of H"""
+
+_END_OF_MAIN_LAYER = frozenset("btmsif")
+"""prefixes of the layers after the charge layers of the main layer"""
+
+
+@dataclass(frozen=True, slots=True)
+class ParsedInChI:
+    """layers of an InChI and the properties derived from them"""
+
+    inchi: str
+    """the parsed InChI"""
+    version: str
+    """version of the InChI, e.g., "1S" (standard) or "1" (non-standard)"""
+    formula: str
+    """chemical formula of the main layer, e.g., "C2H4O2" """
+    layers: tuple[tuple[str, str], ...]
+    """prefix and content of all layers after the formula in order, e.g.,
+    ``("c", "1-2(3)4")``. Prefixes may repeat, e.g., after the fixed-H layer."""
+    protonation: int
+    """number of protons added (positive) or removed (negative) by the /p layer"""
+    charge: int
+    """total charge of the main layer (/q layer and /p layer)"""
+    constitution: Mapping[str, int]
+    """element counts including the protonation, e.g., {"C": 2, "H": 3, "O": 2}.
+    Read-only, because it is shared by all entities with the same InChI."""
+    isotopic_atoms: tuple[tuple[str, int], ...]
+    """element and mass shift of each atom with an isotopic label in the main
+    layer, e.g., ``("C", 1)`` for 13C or ``("H", 1)`` for D. As in the InChI, the
+    shift is relative to the rounded standard atomic weight of the element. The
+    atoms are also part of :attr:`constitution`."""
+
+
+def _formula_counts(formula: str) -> dict[str, int]:
+    counts: dict[str, int] = {}
+    for fragment in formula.split("."):
+        multiplier, elements = _FRAGMENT.fullmatch(fragment).groups()  # type: ignore[union-attr]
+        factor = int(multiplier) if multiplier else 1
+        for element, count in _ELEMENT.findall(elements):
+            counts[element] = counts.get(element, 0) + factor * int(count or 1)
+    return counts
+
+
+def _per_component(content: str) -> list[str]:
+    """content of a layer for each component, with multipliers expanded, e.g.,
+    ["+1", "+1", ""] for "2*+1;" """
+    parts = []
+    for part in content.split(";"):
+        multiplier, _, part = part.rpartition("*")
+        parts += [part] * int(multiplier or 1)
+    return parts
+
+
+def _hydrogen_isotopes(labels: str) -> list[tuple[str, int]]:
+    return [
+        ("H", _HYDROGEN_SHIFTS[isotope])
+        for isotope, count in _HYDROGEN_ISOTOPE.findall(labels)
+        for _ in range(int(count or 1))
+    ]
+
+
+def _isotopic_atoms(
+    formula: str, layers: tuple[tuple[str, str], ...]
+) -> tuple[tuple[str, int], ...]:
+    """labeled atoms of the isotopic layer (and its mobile-H sublayer) of the main
+    layer, see :attr:`ParsedInChI.isotopic_atoms`"""
+    prefixes = [prefix for prefix, _ in layers]
+    if "f" in prefixes:
+        prefixes = prefixes[: prefixes.index("f")]  # fixed-H layer
+    if "i" not in prefixes:
+        return ()
+    i = prefixes.index("i")
+    labels = layers[i][1]
+    mobile = layers[i + 1][1] if prefixes[i + 1 : i + 2] == ["h"] else ""
+
+    # atoms are numbered per component without hydrogen, except for H2 and H
+    components: list[list[str]] = []
+    for fragment in formula.split("."):
+        multiplier, elements = _FRAGMENT.fullmatch(fragment).groups()  # type: ignore[union-attr]
+        atoms = [
+            element
+            for element, count in _ELEMENT.findall(elements)
+            if element != "H"
+            for _ in range(int(count or 1))
+        ]
+        components += [atoms or ["H"]] * int(multiplier or 1)
+
+    isotopic: list[tuple[str, int]] = []
+    for atoms, part in zip(components, _per_component(labels)):
+        for number, shift, hydrogens in _ISOTOPIC_ATOM.findall(part):
+            if shift:
+                isotopic.append((atoms[int(number) - 1], int(shift)))
+            isotopic += _hydrogen_isotopes(hydrogens)
+    isotopic += _hydrogen_isotopes(mobile)
+    return tuple(isotopic)
+
+
+@lru_cache(maxsize=INCHI_CACHE_SIZE)
+def parse_inchi(inchi: str) -> ParsedInChI:
+    """Parse an InChI (standard or non-standard) into its layers.
+
+    :param inchi: valid InChI, e.g., ``inchi_fixedh.value`` of a molecular entity
+    :return: parsed InChI, shared by all calls with the same InChI
+    :raises ValueError: if *inchi* does not start with "InChI="
+    """
+    if not inchi.startswith("InChI="):
+        raise ValueError(f"Not an InChI: {inchi}")
+
+    version, _, rest = inchi[len("InChI=") :].partition("/")
+    if rest[:1].islower():  # no formula, e.g., the proton "InChI=1S/p+1"
+        formula = ""
+    else:
+        formula, _, rest = rest.partition("/")
+    layers = tuple(_LAYER.findall("/" + rest)) if rest else ()
+
+    protonation, charge, in_main_layer = 0, 0, True
+    for prefix, content in layers:
+        if prefix in _END_OF_MAIN_LAYER:
+            in_main_layer = False
+        elif in_main_layer and prefix in ("p", "q"):
+            value = sum(int(part) for part in _per_component(content) if part)
+            charge += value
+            if prefix == "p":
+                protonation = value
+
+    constitution = _formula_counts(formula)
+    if protonation:
+        constitution["H"] = constitution.get("H", 0) + protonation
+
+    return ParsedInChI(
+        inchi=inchi,
+        version=version,
+        formula=formula,
+        layers=layers,
+        protonation=protonation,
+        charge=charge,
+        constitution=MappingProxyType(constitution),
+        isotopic_atoms=_isotopic_atoms(formula, layers),
+    )
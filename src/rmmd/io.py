@@ -0,0 +1,220 @@
+"""Reading and writing RMMD files.
+
+YAML is parsed with the libyaml-based ``CSafeLoader`` if PyYAML was built with
+libyaml support and with the pure-Python ``SafeLoader`` otherwise. Both loaders
+share PyYAML's Python implementation of the YAML 1.1 resolver and constructor, so the
+parsed content is identical, e.g., an unquoted ``NO`` is a boolean, a quoted ``"NO"``
+is a string and ``100_000`` is an integer in either case.
+
+:func:`load` reads and validates a complete RMMD file and can optionally reuse
+validated results from an on-disk cache (see :mod:`rmmd.cache`). Besides YAML, RMMD
+files can be stored as JSON (``.json``) or gzip-compressed JSON (``.json.gz``). JSON
+files are validated directly by pydantic-core, i.e., without building an intermediate
+Python object graph, which makes them the fastest format for machine-generated data.
+
+Large datasets can also be split into several files in a directory, see
+:mod:`rmmd.dataset`, or stored out-of-core in a SQLite database, see :mod:`rmmd.sqlite`.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+from pathlib import Path
+from typing import IO, Any, Iterator
+
+import yaml
+
+from .cache import SchemaCache
+from .schema import Schema
+
+try:
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+
+    HAS_LIBYAML = True
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper, SafeLoader  # type: ignore[assignment]
+
+    HAS_LIBYAML = False
+
+
+def load_yaml(stream: str | bytes | IO[str] | IO[bytes]) -> Any:
+    """Parse the first YAML document in *stream* using the fastest safe loader.
+
+    :param stream: YAML string or file object
+    """
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+def load_yaml_all(stream: str | bytes | IO[str] | IO[bytes]) -> Iterator[Any]:
+    """Parse all YAML documents in *stream* using the fastest safe loader.
+
+    :param stream: YAML string or file object
+    """
+    return yaml.load_all(stream, Loader=SafeLoader)
+
+
+def dump_yaml(data: Any, stream: IO[str] | None = None) -> str | None:
+    """Serialize *data* as YAML using the fastest safe dumper.
+
+    Keys are written in insertion order, i.e., in the order of the fields of the
+    RMMD models, to keep the output close to hand-written RMMD files.
+
+    :param data: plain Python data, e.g., the output of ``Schema.model_dump``
+    :param stream: file object to write to. If None, the YAML string is returned.
+    """
+    return yaml.dump(
+        data,
+        stream,
+        Dumper=SafeDumper,
+        sort_keys=False,
+        allow_unicode=True,
+    )
+
+
+##############################################################################
+# RMMD files
+##############################################################################
+
+RMMD_FILE_SUFFIXES = (".yaml", ".yml", ".json", ".json.gz")
+"""file name suffixes of RMMD files; the suffix determines the file format"""
+
+
+def _file_format(path: Path) -> str:
+    """format of an RMMD file (YAML, JSON or gzip-compressed JSON) by its suffix"""
+    name = path.name.lower()
+    if name.endswith(".json.gz"):
+        return "json.gz"
+    elif name.endswith(".json"):
+        return "json"
+    elif name.endswith((".yaml", ".yml")):
+        return "yaml"
+
+    raise ValueError(
+        f"Unknown RMMD file format of '{path}'. Supported suffixes: "
+        + ", ".join(RMMD_FILE_SUFFIXES)
+    )
+
+
+def is_rmmd_file(path: str | Path) -> bool:
+    """whether *path* has the suffix of a (supported) RMMD file format"""
+    return Path(path).name.lower().endswith(RMMD_FILE_SUFFIXES)
+
+
+def load_data(path: str | Path) -> Any:
+    """Read an RMMD file as plain Python data without validating it.
+
+    :param path: path to a file in any of the formats in :data:`RMMD_FILE_SUFFIXES`
+    """
+    path = Path(path)
+    file_format = _file_format(path)
+    source = path.read_bytes()
+    if file_format == "json.gz":
+        return json.loads(gzip.decompress(source))
+    elif file_format == "json":
+        return json.loads(source)
+    return load_yaml(source)
+
+
+def dump_data(data: Any, path: str | Path) -> None:
+    """Write plain Python data in the format given by the suffix of *path*.
+
+    :param data: JSON-compatible data, e.g., ``model_dump(mode="json")`` output
+    :param path: path of the file, see :data:`RMMD_FILE_SUFFIXES`
+    """
+    path = Path(path)
+    file_format = _file_format(path)
+
+    if file_format == "yaml":
+        with open(path, "w", encoding="utf-8") as f:
+            dump_yaml(data, f)
+        return
+
+    content = json.dumps(data, ensure_ascii=False).encode()
+    if file_format == "json.gz":
+        content = gzip.compress(content)
+    path.write_bytes(content)
+
+
+def _validate(source: bytes, file_format: str, base_path: Path) -> Schema:
+    # local files, e.g., external arrays, are relative to the RMMD file
+    context = {"base_path": base_path}
+    if file_format == "json.gz":
+        return Schema.model_validate_json(gzip.decompress(source), context=context)
+    elif file_format == "json":
+        return Schema.model_validate_json(source, context=context)
+    else:
+        return Schema.model_validate(load_yaml(source), context=context)
+
+
+def load(path: str | Path, *, cache: bool | SchemaCache = False) -> Schema:
+    """Read and validate an RMMD file.
+
+    The file format is determined by the suffix of *path*, see
+    :data:`RMMD_FILE_SUFFIXES`. Directories are loaded as split-file datasets, see
+    :func:`rmmd.dataset.load_dataset`, and ``.sqlite`` files as out-of-core datasets,
+    see :func:`rmmd.sqlite.load_sqlite`.
+
+    :param path: path to the RMMD file or dataset directory
+    :param cache: reuse validated results from an on-disk cache. If True, a
+        :class:`~rmmd.cache.SchemaCache` in the default cache directory is used.
+        On a cache hit, the schema is reconstructed without running any
+        validators. Not supported for dataset directories and SQLite databases.
+    :raises pydantic.ValidationError: if the file is not a valid RMMD file
+    """
+    path = Path(path)
+    if path.is_dir():
+        from .dataset import load_dataset  # avoid circular import
+
+        if cache is not False:
+            raise ValueError("Caching is not supported for dataset directories.")
+        return load_dataset(path)
+
+    if path.suffix.lower() == ".sqlite":
+        from .sqlite import load_sqlite  # avoid circular import
+
+        if cache is not False:
+            raise ValueError("Caching is not supported for SQLite databases.")
+        return load_sqlite(path)
+
+    file_format = _file_format(path)
+    source = path.read_bytes()
+
+    if cache is False:
+        return _validate(source, file_format, path.parent)
+
+    if cache is True:
+        cache = SchemaCache()
+
+    key = cache.key(source, path.parent)
+    schema = cache.get(key)
+    if schema is None:
+        schema = _validate(source, file_format, path.parent)
+        cache.put(key, schema)
+
+    return schema
+
+
+def dump(schema: Schema, path: str | Path) -> None:
+    """Write *schema* to an RMMD file.
+
+    The file format is determined by the suffix of *path*, see
+    :data:`RMMD_FILE_SUFFIXES`. Fields that are None are omitted.
+
+    :param schema: RMMD data to write
+    :param path: path of the RMMD file
+    """
+    path = Path(path)
+    file_format = _file_format(path)
+
+    if file_format == "yaml":
+        data = schema.model_dump(mode="json", by_alias=True, exclude_none=True)
+        with open(path, "w", encoding="utf-8") as f:
+            dump_yaml(data, f)
+        return
+
+    content = schema.model_dump_json(by_alias=True, exclude_none=True).encode()
+    if file_format == "json.gz":
+        content = gzip.compress(content)
+    path.write_bytes(content)
@@ -4,6 +4,7 @@ The use of local names/ids/keys is an implementation detail of the validation sc
 """
 
 from __future__ import annotations
+from dataclasses import dataclass
 from typing import Annotated
 
 from pydantic import Field
@@ -52,30 +53,43 @@ RegistryKey = Annotated[
 ]
 """keys for items in the registries of the root schema"""
 
-SpeciesName = RegistryKey
-"""name of a species in the dataset"""
 
-EntityKey = RegistryKey
-"""key for a canonical representation of a species in the dataset"""
+@dataclass(frozen=True)
+class RefersTo:
+    """marks a key type as reference to an item in a registry of the root schema
+
+    The marker is only metadata for tools such as :mod:`rmmd.refs` and does not affect
+    validation.
+    """
+
+    registry: str
+    """name of the registry in the root schema, e.g., `calculations`"""
+
 
 ##############################################################################
-# Cross-reference key types (aliases of RegistryKey)
+# Cross-reference key types (RegistryKey with RefersTo marker)
 ##############################################################################
 
-CalcIndex = RegistryKey
+SpeciesName = Annotated[RegistryKey, RefersTo("species")]
+"""name of a species in the dataset"""
+
+EntityKey = Annotated[RegistryKey, RefersTo("entities")]
+"""key for a canonical representation of a species in the dataset"""
+
+CalcIndex = Annotated[RegistryKey, RefersTo("calculations")]
 """key referencing a calculation in the calculations registry"""
 
-ConformationIndex = RegistryKey
+ConformationIndex = Annotated[RegistryKey, RefersTo("conformations")]
 """key referencing a conformation in the conformations registry"""
 
-ThermoIndex = RegistryKey
+ThermoIndex = Annotated[RegistryKey, RefersTo("thermo")]
 """key referencing a thermo item in the thermo registry"""
 
-KineticsIndex = RegistryKey
-"""key referencing a kinetics item in the rate_coefficients registry"""
+KineticsIndex = Annotated[RegistryKey, RefersTo("rate_constants")]
+"""key referencing a kinetics item in the rate_constants registry"""
 
-TransportIndex = RegistryKey
+TransportIndex = Annotated[RegistryKey, RefersTo("transport")]
 """key referencing a transport property in the transport registry"""
 
-ReactionIndex = RegistryKey
+ReactionIndex = Annotated[RegistryKey, RefersTo("reactions")]
 """key referencing a reaction in the reactions registry"""
@@ -4,6 +4,7 @@ from pydantic import Discriminator, Field, Tag, model_validator
 from .calc import CalculationBase, CalculationInputBase, CalculationOutputBase
 from .thermo import FittedToLiterature, FittedToOtherCalculation
 from ._base import RmmdBaseModel
+from .arrays import ExternalArray2D
 
 from .keys import CitationKey, KineticsIndex
 from .registry import HasKeyMixin
@@ -54,6 +55,10 @@ class PressureDependentArrhenius(_RateCoefficientBase):
             raise ValueError(
                 "The lengths of A, b, Ea, and p must be the same for pressure-dependent Arrhenius."
             )
+        if not self.p:
+            raise ValueError(
+                "A pressure-dependent Arrhenius rate coefficient needs at least one pressure point."
+            )
         return self
 
 
@@ -66,11 +71,12 @@ class RateTable(_RateCoefficientBase):
     """Temperature points in K"""
     p: list[float]
     """Pressure points in Pa"""
-    k: list[list[float]]
+    k: list[list[float]] | ExternalArray2D
     """rate coefficients in SI units
 
     n x m array of rate constants where n is the number of pressure points and m is the
-    number of temperature points.
+    number of temperature points. Can be stored in a binary file, see
+    :mod:`rmmd.arrays`.
     """
 
 
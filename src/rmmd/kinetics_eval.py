@@ -0,0 +1,276 @@
+"""Batched evaluation of rate coefficients.
+
+A :class:`KineticsBank` packs all rate coefficients of a dataset into arrays grouped
+by type and evaluates k(T, p) of all of them at many state points at once::
+
+    bank = KineticsBank.from_schema(schema)
+    k = bank.evaluate(T=[1000, 1200], p=[1e5, 1e5])  # (n_rate_coefficients, 2)
+    k_1 = k[bank.index["rate-coefficient-0001"]]
+
+- :class:`~rmmd.kinetics.ModifiedArrhenius`: ``k = A T^b exp(-Ea / (R T))``
+- :class:`~rmmd.kinetics.PressureDependentArrhenius` (PLOG): ``ln k`` is
+  interpolated linearly in ``ln p`` between the Arrhenius expressions at the given
+  pressures. Expressions given for the same pressure are summed.
+- :class:`~rmmd.kinetics.RateTable`: ``ln k`` is interpolated bilinearly in
+  ``1/T`` and ``ln p``.
+
+Outside of the pressure (and temperature) ranges of PLOG expressions and rate tables,
+the values at the closest pressure (and temperature) are used. The interpolation
+segments are located once per distinct grid, e.g., once for all rate tables
+tabulated at the same temperatures.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from ._vector import SharedGrids
+from .kinetics import ModifiedArrhenius, PressureDependentArrhenius, RateTable
+from .schema import Schema
+
+R = 8.314462618
+"""molar gas constant in J/(mol K)"""
+
+
+def _arrhenius(
+    A: np.ndarray, b: np.ndarray, Ea: np.ndarray, T: np.ndarray
+) -> np.ndarray:
+    """(n, n_states) rate coefficients of n modified Arrhenius expressions"""
+    ln_T, inv_RT = np.log(T), 1 / (R * T)
+    return A[:, None] * np.exp(np.outer(b, ln_T) - np.outer(Ea, inv_RT))
+
+
+def _pad(arrays: list[np.ndarray], width: int, axis: int = 0) -> list[np.ndarray]:
+    """pad *arrays* to *width* along *axis* by repeating the last element"""
+    padded = []
+    for array in arrays:
+        pad_width = [(0, 0)] * array.ndim
+        pad_width[axis] = (0, width - array.shape[axis])
+        padded.append(np.pad(array, pad_width, mode="edge"))
+    return padded
+
+
+@dataclass
+class _Arrhenius:
+    rows: np.ndarray
+    A: np.ndarray
+    b: np.ndarray
+    Ea: np.ndarray
+
+    @classmethod
+    def pack(cls, rows: list[int], items: list[ModifiedArrhenius]) -> _Arrhenius:
+        return cls(
+            rows=np.asarray(rows),
+            A=np.array([item.A for item in items]),
+            b=np.array([item.b for item in items]),
+            Ea=np.array([item.Ea for item in items]),
+        )
+
+    def evaluate(self, T: np.ndarray, p: np.ndarray) -> np.ndarray:
+        return _arrhenius(self.A, self.b, self.Ea, T)
+
+
+@dataclass
+class _Plog:
+    rows: np.ndarray
+    A: np.ndarray
+    b: np.ndarray
+    Ea: np.ndarray
+    """(n_terms,) parameters of all Arrhenius expressions"""
+    level_starts: np.ndarray
+    """(n_levels,) first term of each pressure level (terms at one level are summed)"""
+    level_index: tuple[np.ndarray, np.ndarray]
+    """row and column of each level in the padded ln p grid"""
+    ln_p: SharedGrids
+    """ln p of the pressure levels"""
+    n_levels: np.ndarray
+    """(n,) number of pressure levels of each rate coefficient"""
+
+    @classmethod
+    def pack(cls, rows: list[int], items: list[PressureDependentArrhenius]) -> _Plog:
+        A, b, Ea, level_starts, level_rows, level_cols, ln_p = (
+            [],
+            [],
+            [],
+            [],
+            [],
+            [],
+            [],
+        )
+        for i, item in enumerate(items):
+            terms = sorted(zip(item.p, item.A, item.b, item.Ea))
+            pressures = sorted(set(item.p))
+            for p_i, A_i, b_i, Ea_i in terms:
+                level = pressures.index(p_i)
+                if not level_rows or (level_rows[-1], level_cols[-1]) != (i, level):
+                    level_starts.append(len(A))
+                    level_rows.append(i)
+                    level_cols.append(level)
+                A.append(A_i)
+                b.append(b_i)
+                Ea.append(Ea_i)
+            ln_p.append(np.log(pressures))
+
+        n_levels = np.array([len(levels) for levels in ln_p])
+        return cls(
+            rows=np.asarray(rows),
+            A=np.array(A),
+            b=np.array(b),
+            Ea=np.array(Ea),
+            level_starts=np.array(level_starts),
+            level_index=(np.array(level_rows), np.array(level_cols)),
+            ln_p=SharedGrids(np.stack(_pad(ln_p, n_levels.max())), n_levels),
+            n_levels=n_levels,
+        )
+
+    def evaluate(self, T: np.ndarray, p: np.ndarray) -> np.ndarray:
+        k_terms = _arrhenius(self.A, self.b, self.Ea, T)
+        if len(self.level_starts) == len(self.A):
+            k_levels = k_terms  # one expression per pressure level
+        else:
+            k_levels = np.add.reduceat(k_terms, self.level_starts, axis=0)
+
+        n, max_levels = len(self.n_levels), self.ln_p.grid.shape[1]
+        ln_k = np.empty((n, max_levels, T.size))
+        ln_k[self.level_index] = np.log(k_levels)
+        # pad by repeating the last level (consistent with the padded ln p grid)
+        for col in range(1, max_levels):
+            padded = self.n_levels <= col
+            ln_k[padded, col] = ln_k[padded, col - 1]
+
+        idx, w = self.ln_p.interpolation_weights(np.log(p))
+        left = np.take_along_axis(ln_k, idx[:, None, :], axis=1)[:, 0]
+        right = np.take_along_axis(
+            ln_k, np.minimum(idx + 1, max_levels - 1)[:, None, :], axis=1
+        )[:, 0]
+        return np.exp((1 - w) * left + w * right)
+
+
+@dataclass
+class _Tables:
+    rows: np.ndarray
+    inv_T: SharedGrids
+    """ascending 1/T grids"""
+    ln_p: SharedGrids
+    """ascending ln p grids"""
+    ln_k: np.ndarray
+    """(n, max_p, max_T) ln k on the grids, padded by repetition"""
+
+    @classmethod
+    def pack(cls, rows: list[int], items: list[RateTable]) -> _Tables:
+        inv_T, ln_p, ln_k = [], [], []
+        for item in items:
+            T_order = np.argsort(1 / np.asarray(item.T))
+            p_order = np.argsort(item.p)
+            inv_T.append(1 / np.asarray(item.T)[T_order])
+            ln_p.append(np.log(np.asarray(item.p)[p_order]))
+            ln_k.append(
+                np.log(np.asarray(item.k, dtype=np.float64))[p_order][:, T_order]
+            )
+
+        n_T = np.array([len(grid) for grid in inv_T])
+        n_p = np.array([len(grid) for grid in ln_p])
+        ln_k = _pad(_pad(ln_k, n_T.max(), axis=1), n_p.max(), axis=0)
+        return cls(
+            rows=np.asarray(rows),
+            inv_T=SharedGrids(np.stack(_pad(inv_T, n_T.max())), n_T),
+            ln_p=SharedGrids(np.stack(_pad(ln_p, n_p.max())), n_p),
+            ln_k=np.stack(ln_k),
+        )
+
+    def evaluate(self, T: np.ndarray, p: np.ndarray) -> np.ndarray:
+        n, max_p, max_T = self.ln_k.shape
+        i_T, w_T = self.inv_T.interpolation_weights(1 / T)
+        i_p, w_p = self.ln_p.interpolation_weights(np.log(p))
+
+        # flat indices into ln_k of the four corners
+        rows = (np.arange(n) * max_p * max_T)[:, None]
+        i_T1 = np.minimum(i_T + 1, max_T - 1)
+        i_p1 = np.minimum(i_p + 1, max_p - 1)
+        flat = self.ln_k.ravel()
+        ln_k = (
+            (1 - w_p) * (1 - w_T) * flat[rows + i_p * max_T + i_T]
+            + (1 - w_p) * w_T * flat[rows + i_p * max_T + i_T1]
+            + w_p * (1 - w_T) * flat[rows + i_p1 * max_T + i_T]
+            + w_p * w_T * flat[rows + i_p1 * max_T + i_T1]
+        )
+        return np.exp(ln_k)
+
+
+_PACKERS = {
+    "modified Arrhenius": _Arrhenius.pack,
+    "pressure-dependent Arrhenius": _Plog.pack,
+    "rate table": _Tables.pack,
+}
+
+
+class KineticsBank:
+    """Rate coefficients packed into arrays for batched evaluation.
+
+    The rows of all results follow the order of :attr:`keys`.
+    """
+
+    def __init__(
+        self,
+        rate_coefficients: dict[
+            str, ModifiedArrhenius | PressureDependentArrhenius | RateTable
+        ],
+    ):
+        """
+        :param rate_coefficients: rate coefficients by their key in the
+            ``rate_constants`` registry
+        """
+        self.keys: list[str] = list(rate_coefficients)
+        """keys of the rate coefficients, in the order of the rows"""
+        self.index: dict[str, int] = {key: i for i, key in enumerate(self.keys)}
+        """row of each rate coefficient by its key"""
+
+        by_type: dict[str, list[str]] = {}
+        for key, item in rate_coefficients.items():
+            by_type.setdefault(item.type, []).append(key)
+
+        self._groups = [
+            _PACKERS[type_](
+                [self.index[key] for key in keys],
+                [rate_coefficients[key] for key in keys],
+            )
+            for type_, keys in by_type.items()
+        ]
+
+    @classmethod
+    def from_schema(cls, schema: Schema, keys: Iterable[str] | None = None):
+        """Collect rate coefficients from ``schema.rate_constants``.
+
+        :param schema: dataset containing the rate coefficients
+        :param keys: keys of the rate coefficients to include, all by default
+        """
+        if keys is None:
+            keys = schema.rate_constants.keys()
+        return cls({key: schema.rate_constants[key] for key in keys})
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def evaluate(self, T: ArrayLike, p: ArrayLike) -> np.ndarray:
+        """Evaluate all rate coefficients at the state points (T, p).
+
+        :param T: temperatures in K, scalar or 1D array
+        :param p: pressures in Pa, scalar or 1D array broadcastable to *T*
+        :return: (n_rate_coefficients, n_states) array of rate coefficients in SI
+            units
+        """
+        T, p = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(T, dtype=np.float64)),
+            np.atleast_1d(np.asarray(p, dtype=np.float64)),
+        )
+        if T.ndim != 1:
+            raise ValueError("T and p must be scalars or 1D arrays")
+
+        k = np.empty((len(self.keys), T.size))
+        for group in self._groups:
+            k[group.rows] = group.evaluate(T, p)
+        return k
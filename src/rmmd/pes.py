@@ -6,7 +6,7 @@ https://docs.pydantic.dev/latest/concepts/json_schema/#generating-json-schema
 
 from __future__ import annotations
 
-from typing import Annotated, Literal, TypeAlias
+from typing import Annotated, Any, Literal, TypeAlias
 
 from annotated_types import MinLen
 from pydantic import (
@@ -19,6 +19,15 @@ from pydantic import (
 )
 
 from ._base import RmmdBaseModel, RmmdFrozenBaseModel
+from .arrays import (
+    ExternalArray1D,
+    ExternalArray2D,
+    ExternalArray3D,
+    NdArray2D,
+    NdArray3D,
+    _real_array,
+    array_equal,
+)
 from .calc import CalculationBase, CalculationInputBase, CalculationOutputBase, OutputOf
 from .elements import ElementSymbol
 from .identifiers import StringIdentifier
@@ -57,57 +66,104 @@ LevelOfTheory = Annotated[
 ###############################################################################
 
 
+def _coordinates_to_array(data: Any, ndim: int) -> Any:
+    """convert nested lists of coordinates in *data* to an array before validation
+
+    Ragged lists and lists with other elements than real numbers are not converted
+    (see :func:`rmmd.arrays._real_array`). For ragged lists, the same errors as for
+    the shape checks of the models are raised.
+    """
+    if not isinstance(data, dict) or not isinstance(data.get("coordinates"), list):
+        return data
+
+    coordinates = _real_array(data["coordinates"])
+    if coordinates is None:
+        frames = data["coordinates"] if ndim == 3 else [data["coordinates"]]
+        frames = [frame for frame in frames if isinstance(frame, list)]
+        atoms = data.get("atoms")
+        if isinstance(atoms, list) and any(len(f) != len(atoms) for f in frames):
+            raise ValueError("Number of atoms and coordinates must match")
+        if any(isinstance(xyz, list) and len(xyz) != 3 for f in frames for xyz in f):
+            raise ValueError("Each atom must have 3 cartesian coordinates")
+        return data  # invalid elements are reported by the field validation
+
+    return data | {"coordinates": coordinates}
+
+
 class Geometry(RmmdBaseModel):
     """molecular structure/geometry"""
 
     atoms: list[ElementSymbol]
     """list of atoms in the molecule, in the same order as the coordinates"""
-    coordinates: list[list[float]]
-    """list of coordinates of the atoms in the molecule, in the same order as
-    the atoms [Ångström]"""
+    coordinates: NdArray2D
+    """coordinates of the atoms in the molecule, in the same order as the atoms
+    [Ångström]. Array with the shape (n_atoms, 3)."""
+
+    @model_validator(mode="before")
+    @classmethod
+    def _convert_coordinates(cls, data: Any) -> Any:
+        return _coordinates_to_array(data, ndim=2)
 
     @model_validator(mode="after")
     def check_n_atoms(self):
         """check that the number of atoms matches the number of coordinates"""
-        if len(self.atoms) != len(self.coordinates):
+        if len(self.atoms) != self.coordinates.shape[0]:
             raise ValueError("Number of atoms and coordinates must match")
         return self
 
     @model_validator(mode="after")
     def check_geometry_dimensions(self):
         """check that all atoms have 3 cartesian coordinates"""
-        for coord in self.coordinates:
-            if len(coord) != 3:
-                raise ValueError("Each atom must have 3 cartesian coordinates")
+        if self.coordinates.shape[0] and self.coordinates.shape[1] != 3:
+            raise ValueError("Each atom must have 3 cartesian coordinates")
         return self
 
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Geometry):
+            return NotImplemented
+        return self.atoms == other.atoms and array_equal(
+            self.coordinates, other.coordinates
+        )
+
 
 class Geometries(RmmdBaseModel):
     """list of geometries with the same order of atoms"""
 
     atoms: list[ElementSymbol]
     """list of atoms in the molecule, in the same order as the coordinates"""
-    coordinates: list[list[list[float]]]
-    """list of coordinates of the atoms in the molecule, in the same order as
-    the atoms [Ångström]"""
+    coordinates: NdArray3D | ExternalArray3D
+    """coordinates of the atoms in the molecule, in the same order as the atoms
+    [Ångström]. Array with the shape (n_geometries, n_atoms, 3), which can also be
+    stored in a binary file, see :mod:`rmmd.arrays`."""
+
+    @model_validator(mode="before")
+    @classmethod
+    def _convert_coordinates(cls, data: Any) -> Any:
+        return _coordinates_to_array(data, ndim=3)
 
     @model_validator(mode="after")
     def check_n_atoms(self):
         """check that the number of atoms matches the number of coordinates"""
-        for coords in self.coordinates:
-            if len(self.atoms) != len(coords):
-                raise ValueError("Number of atoms and coordinates must match")
+        n_geometries, n_atoms, _ = self.coordinates.shape
+        if n_geometries and n_atoms != len(self.atoms):
+            raise ValueError("Number of atoms and coordinates must match")
         return self
 
     @model_validator(mode="after")
     def check_geometry_dimensions(self):
         """check that all atoms have 3 cartesian coordinates"""
-        for coords in self.coordinates:
-            for coord in coords:
-                if len(coord) != 3:
-                    raise ValueError("Each atom must have 3 cartesian coordinates")
+        n_geometries, n_atoms, n_dims = self.coordinates.shape
+        if n_geometries and n_atoms and n_dims != 3:
+            raise ValueError("Each atom must have 3 cartesian coordinates")
         return self
 
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Geometries):
+            return NotImplemented
+        return self.atoms == other.atoms and array_equal(
+            self.coordinates, other.coordinates
+        )
+
 
 _DistanceDef: TypeAlias = tuple[NonNegativeInt, NonNegativeInt]
 """definition of a distance internal coordinate, i.e., a bond length, by the indices of
@@ -186,7 +242,7 @@ class _QmScanData(CalculationOutputBase):
 
     geometries: Geometries | None = None
     """geometries of the scan"""
-    total_electronic_energies: list[float] | None = None
+    total_electronic_energies: list[float] | ExternalArray1D | None = None
     """total electronic energy in Hartree"""
 
     # TODO add steps, boundary, etc.
@@ -209,7 +265,7 @@ class _QmFreqData(CalculationOutputBase):
     rot_symmetry_nr: int | None = None
     """rotational symmetry number"""
     # TODO: use Å or Bohr radii?
-    hessian: list[list[float]] | None = None
+    hessian: list[list[float]] | ExternalArray2D | None = None
     """Hessian matrix in atomic units, i.e. second derivatives of the energy
     w.r.t. the coordinates [Hartree/Å]"""
 
@@ -264,7 +320,7 @@ class _QmIrcScanData(CalculationOutputBase):
 
     points: Geometries | None = None
     """geometries along the IRC path (inlcuding the transition state)"""
-    total_electronic_energies: list[float] | None = None
+    total_electronic_energies: list[float] | ExternalArray1D | None = None
     """list of total electronic energies in Hartree for each point in the IRC path"""
 
     @model_validator(mode="after")
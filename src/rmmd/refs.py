@@ -0,0 +1,332 @@
+"""Cross-references between the registries of a dataset.
+
+Items reference each other by their keys, e.g., ``Species.thermo`` contains keys of the
+``thermo`` registry. Such key types are marked with :class:`~rmmd.keys.RefersTo` in
+:mod:`rmmd.keys`. Validating a single item cannot check if the referenced items exist,
+because the registries are not available at that point. This module checks all
+references of a dataset at once::
+
+    for dangling in check_references(schema):
+        print(dangling)  # species.CH4.thermo[0]: 'thermo-0042' not found in thermo
+
+The fields containing references are determined once per model class from the type
+annotations, so that checking a dataset only visits the fields that may contain
+references. Each reference is looked up in the dict of the registry it refers to, i.e.,
+the check is linear in the number of references.
+"""
+
+from __future__ import annotations
+
+from functools import cache
+from types import UnionType
+from typing import (
+    Annotated,
+    Any,
+    Callable,
+    Iterator,
+    Literal,
+    NamedTuple,
+    Union,
+    get_args,
+    get_origin,
+)
+from collections.abc import Mapping, Sequence, Set
+
+from pydantic import BaseModel
+
+from .keys import RefersTo
+from .registry import Registry
+from .schema import REGISTRY_NAMES, DerivedData, Schema
+
+Location = tuple[str | int, ...]
+"""location of a value in the dataset, e.g., ``("species", "CH4", "thermo", 0)``"""
+
+
+class KeyReference(NamedTuple):
+    """reference to an item in a registry"""
+
+    location: Location
+    """location of the key in the dataset"""
+    registry: str
+    """name of the registry the key refers to"""
+    key: str
+    """key of the referenced item"""
+
+
+class DanglingReference(KeyReference):
+    """reference to an item that does not exist"""
+
+    def __str__(self) -> str:
+        location = format_location(self.location)
+        return f"{location}: '{self.key}' not found in {self.registry}"
+
+
+def format_location(location: Location) -> str:
+    """format a location like validation errors, e.g., ``species.CH4.thermo[0]``"""
+    loc = ""
+    for entry in location:
+        loc += f"[{entry}]" if isinstance(entry, int) else f".{entry}"
+    return loc.removeprefix(".")
+
+
+###############################################################################
+# reference walkers compiled from type annotations
+###############################################################################
+
+_Walk = Callable[[Any, Location], Iterator[KeyReference]]
+
+
+class _Walker(NamedTuple):
+    """finds references in values of one type"""
+
+    accepts: Callable[[Any], bool]
+    """whether a value is of the type (used to select the member of a union)"""
+    walk: _Walk
+    registry: str | None = None
+    """registry referenced by the value itself, if it is a key"""
+
+
+def _no_references(value: Any, loc: Location) -> Iterator[KeyReference]:
+    return iter(())
+
+
+def _is_str(value: Any) -> bool:
+    return isinstance(value, str)
+
+
+def _is_collection(value: Any) -> bool:
+    return isinstance(value, (list, tuple, set, frozenset))
+
+
+def _key_walker(registry: str) -> _Walker:
+    def walk(value: str, loc: Location) -> Iterator[KeyReference]:
+        yield KeyReference(loc, registry, value)
+
+    return _Walker(_is_str, walk, registry)
+
+
+def _sequence_walker(item: _Walker) -> _Walker:
+    if item.registry is not None:
+        # fast path for the most common case: a list of keys
+        registry = item.registry
+
+        def walk(value: Any, loc: Location) -> Iterator[KeyReference]:
+            for i, entry in enumerate(value):
+                if isinstance(entry, str):
+                    yield KeyReference((*loc, i), registry, entry)
+
+        return _Walker(_is_collection, walk)
+
+    def walk(value: Any, loc: Location) -> Iterator[KeyReference]:
+        for i, entry in enumerate(value):
+            if item.accepts(entry):
+                yield from item.walk(entry, (*loc, i))
+
+    return _Walker(_is_collection, walk)
+
+
+def _tuple_walker(items: list[_Walker | None]) -> _Walker:
+    def walk(value: tuple, loc: Location) -> Iterator[KeyReference]:
+        for i, (entry, item) in enumerate(zip(value, items)):
+            if item is not None and item.accepts(entry):
+                yield from item.walk(entry, (*loc, i))
+
+    return _Walker(_is_collection, walk)
+
+
+def _mapping_walker(key: _Walker | None, item: _Walker | None) -> _Walker:
+    def walk(value: Mapping, loc: Location) -> Iterator[KeyReference]:
+        for k, entry in value.items():
+            if key is not None and key.accepts(k):
+                yield from key.walk(k, (*loc, k))
+            if item is not None and item.accepts(entry):
+                yield from item.walk(entry, (*loc, k))
+
+    return _Walker(lambda value: isinstance(value, dict), walk)
+
+
+def _union_walker(members: list[_Walker]) -> _Walker:
+    def walk(value: Any, loc: Location) -> Iterator[KeyReference]:
+        for member in members:
+            if member.accepts(value):
+                yield from member.walk(value, loc)
+                return
+
+    return _Walker(lambda value: any(m.accepts(value) for m in members), walk)
+
+
+_MODEL_WALKER = _Walker(
+    lambda value: isinstance(value, BaseModel),
+    lambda value, loc: iter_item_references(value, loc),
+)
+
+
+def _walker(annotation: Any) -> _Walker | None:
+    """walker for values of type *annotation*, None if they cannot contain references"""
+    origin = get_origin(annotation)
+    args = get_args(annotation)
+
+    if origin is Annotated:
+        for metadata in args[1:]:
+            if isinstance(metadata, RefersTo):
+                return _key_walker(metadata.registry)
+        return _walker(args[0])
+
+    if origin is Literal:
+        # needed to select the right member of, e.g., `ConformationIndex | Literal[...]`
+        return _Walker(lambda value: value in args, _no_references)
+
+    if origin is Union or origin is UnionType:
+        members = [_walker(arg) for arg in args]
+        if all(m is None or m.walk is _no_references for m in members):
+            return None
+        # literals first, as literal strings are accepted by key walkers as well
+        members = sorted(
+            (m for m in members if m is not None),
+            key=lambda m: m.walk is not _no_references,
+        )
+        return _union_walker(members)
+
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return _MODEL_WALKER
+
+    if origin is tuple and not (len(args) == 2 and args[1] is Ellipsis):
+        items = [_walker(arg) for arg in args]
+        return None if all(i is None for i in items) else _tuple_walker(items)
+
+    if isinstance(origin, type) and issubclass(origin, Mapping):
+        key, item = (_walker(arg) for arg in args)
+        return None if key is None and item is None else _mapping_walker(key, item)
+
+    if isinstance(origin, type) and issubclass(origin, (Sequence, Set)):
+        item = _walker(args[0])
+        return None if item is None else _sequence_walker(item)
+
+    return None
+
+
+@cache
+def _model_walkers(model: type[BaseModel]) -> list[tuple[str, _Walker]]:
+    """fields of *model* that may contain references and their walkers"""
+    walkers = []
+    for name, field in model.model_fields.items():
+        annotation = field.annotation
+        if field.metadata:
+            # pydantic moves the metadata of the outermost Annotated to the field
+            annotation = Annotated[annotation, *field.metadata]
+        walker = _walker(annotation)
+        if walker is not None and walker.walk is not _no_references:
+            walkers.append((name, walker))
+    return walkers
+
+
+###############################################################################
+# public API
+###############################################################################
+
+
+def iter_item_references(
+    item: BaseModel, location: Location = ()
+) -> Iterator[KeyReference]:
+    """all references to registry items in *item* and its nested models
+
+    :param item: any RMMD model, e.g., an item of a registry
+    :param location: location of *item*, which is prepended to the locations of the
+        references
+    """
+    for name, walker in _model_walkers(type(item)):
+        value = getattr(item, name)
+        if value is not None and walker.accepts(value):
+            yield from walker.walk(value, (*location, name))
+
+
+def iter_references(schema: Schema) -> Iterator[KeyReference]:
+    """all references between the registries of a dataset"""
+    for name in REGISTRY_NAMES:
+        registry: Registry = getattr(schema, name)
+        for key, item in registry.root.items():
+            yield from iter_item_references(item, (name, key))
+
+
+def check_references(schema: Schema) -> list[DanglingReference]:
+    """Find references to items that do not exist in the referenced registry.
+
+    :param schema: dataset to check
+    :return: dangling references in the order in which they appear in the dataset
+    """
+    registries = {name: getattr(schema, name).root for name in REGISTRY_NAMES}
+    return [
+        DanglingReference(*ref)
+        for ref in iter_references(schema)
+        if ref.key not in registries[ref.registry]
+    ]
+
+
+###############################################################################
+# reverse index
+###############################################################################
+
+
+class ReverseIndex(DerivedData):
+    """References to each registry item of a dataset, i.e., "who points at this key?"
+
+    The index is built in one pass over the dataset and kept up to date through the
+    change notifications of the registries (see :meth:`Registry.subscribe`), i.e.,
+    when items are added, replaced or deleted with ``registry[key] = item``,
+    ``del registry[key]`` or ``registry.add(item)``. Changes inside of items, e.g.,
+    appending a key to ``Species.thermo``, are not tracked. Store the item again with
+    ``registry[key] = item`` to update the index in this case.
+
+    Usually, the index is used through :meth:`Schema.referrers`.
+    """
+
+    def __init__(self, schema: Schema):
+        self._incoming: dict[tuple[str, str], dict[Location, None]] = {}
+        """locations of the references to each (registry, key)"""
+        self._outgoing: dict[tuple[str, str], list[KeyReference]] = {}
+        """references in each item (needed to remove them when an item changes)"""
+        super().__init__(schema, REGISTRY_NAMES)
+
+    def _attach(self, name: str, registry: Registry) -> None:
+        for key, item in registry.root.items():
+            self._add(name, key, item)
+
+    def _add(self, registry: str, key: str, item: BaseModel) -> None:
+        refs = list(iter_item_references(item, (registry, key)))
+        if refs:
+            self._outgoing[(registry, key)] = refs
+        for ref in refs:
+            self._incoming.setdefault((ref.registry, ref.key), {})[ref.location] = None
+
+    def _remove(self, registry: str, key: str) -> None:
+        for ref in self._outgoing.pop((registry, key), ()):
+            locations = self._incoming[(ref.registry, ref.key)]
+            del locations[ref.location]
+            if not locations:
+                del self._incoming[(ref.registry, ref.key)]
+
+    def _on_change(
+        self, registry: str, key: str, old: BaseModel | None, new: BaseModel | None
+    ) -> None:
+        if old is not None:
+            self._remove(registry, key)
+        if new is not None:
+            self._add(registry, key, new)
+
+    def referrers(self, registry: str, key: str) -> list[KeyReference]:
+        """references to the item *key* in *registry*
+
+        The first two entries of each location are the registry and key of the item
+        containing the reference.
+        """
+        locations = self._incoming.get((registry, key), {})
+        return [KeyReference(location, registry, key) for location in locations]
+
+
+def reverse_index(schema: Schema) -> ReverseIndex:
+    """The reverse index of *schema*, which is built on first use.
+
+    The index is kept with the dataset and rebuilt if a registry of the dataset is
+    replaced.
+    """
+    return schema._derived_data("reverse_index", ReverseIndex)
@@ -3,18 +3,52 @@
 Provides HasKeyMixin and Registry for use in the root schema instead of plain lists.
 Each item carries an optional ``key`` field (excluded from serialization) that is
 kept in sync with its position in the mapping.
+
+Registries can have secondary indexes that group the items by the value of a key
+function, e.g., all calculations by their type::
+
+    class CalculationRegistry(
+        Registry[Calculation], prefix="calc", indexes={"type": attrgetter("type")}
+    ): ...
+
+    irc_scans = schema.calculations.lookup("type", "qm-irc")
+
+The indexes are built on the first lookup and maintained on each change through
+``__setitem__``, ``__delitem__`` or :meth:`Registry.add`, so that a lookup only costs
+O(number of results). Further indexes can be added to a registry with
+:meth:`Registry.register_index`.
+
+Registries are not thread-safe by default. :meth:`Registry.make_thread_safe` makes
+all changes of a registry object atomic, e.g., for adding items from several worker
+threads. Workers that generate many keys can reserve them in blocks, so that they only
+wait for each other once per block::
+
+    schema.calculations.make_thread_safe()
+
+    def worker(calculations):
+        keys = schema.calculations.reserved_keys(block_size=1000)
+        for calculation in calculations:
+            schema.calculations[next(keys)] = calculation
 """
 
 from __future__ import annotations
 
-from collections.abc import MutableMapping
-import itertools
-from typing import ClassVar, Generic, Self, TypeVar
-
-from pydantic import Field, PrivateAttr, RootModel, model_validator
+import threading
+from collections.abc import Hashable, Iterable, Iterator, Mapping, MutableMapping
+from contextlib import AbstractContextManager, nullcontext
+from typing import Any, Callable, ClassVar, Generic, Self, TypeVar
+
+from pydantic import (
+    Field,
+    PrivateAttr,
+    RootModel,
+    SerializerFunctionWrapHandler,
+    field_serializer,
+    model_validator,
+)
 from .keys import RegistryKey
 
-from ._base import RmmdBaseModel
+from ._base import LocalState, RmmdBaseModel
 
 
 class HasKeyMixin(RmmdBaseModel):
@@ -29,6 +63,61 @@ class HasKeyMixin(RmmdBaseModel):
 
 T = TypeVar("T", bound=HasKeyMixin)
 
+RegistryListener = Callable[[str, HasKeyMixin | None, HasKeyMixin | None], None]
+"""called as ``listener(key, old, new)`` after an item was added (old is None),
+replaced or deleted (new is None)"""
+
+_NO_LOCK = nullcontext()
+
+KeyFunction = Callable[[Any], Hashable | None]
+"""value of an item for a secondary index. Items with value None are not indexed."""
+
+
+class _RegistryState(LocalState):
+    """listeners and lock of a registry object"""
+
+    __slots__ = ("listeners", "lock")
+
+    def __init__(self):
+        self.listeners: list[RegistryListener] = []
+        self.lock: threading.RLock | None = None
+        """lock in thread-safe mode"""
+
+
+def _key_mismatch(key: RegistryKey, value: HasKeyMixin) -> ValueError:
+    return ValueError(
+        f"key mismatch: mapping key '{key}' does not match value.key '{value.key}'"
+    )
+
+
+class _SecondaryIndex:
+    """keys of the items of a registry grouped by the value of a key function"""
+
+    __slots__ = ("key_function", "by_value", "values")
+
+    def __init__(self, key_function: KeyFunction, items: Iterable[tuple[str, Any]]):
+        self.key_function = key_function
+        self.by_value: dict[Hashable, dict[str, None]] = {}
+        """keys of the items with each value (dict as ordered set)"""
+        self.values: dict[str, Hashable] = {}
+        """value of each indexed item, needed to remove it after in-place changes"""
+        for key, item in items:
+            self.add(key, item)
+
+    def add(self, key: str, item: Any) -> None:
+        value = self.key_function(item)
+        if value is not None:
+            self.values[key] = value
+            self.by_value.setdefault(value, {})[key] = None
+
+    def remove(self, key: str) -> None:
+        value = self.values.pop(key, None)
+        if value is not None:
+            keys = self.by_value[value]
+            del keys[key]
+            if not keys:
+                del self.by_value[value]
+
 
 class Registry(
     RootModel[dict[RegistryKey, T]],
@@ -46,28 +135,42 @@ class Registry(
     ``"calc-0001"``.  The counter starts above the highest index already
     present so that adding items to a loaded registry never produces
     collisions.
+
+    Secondary indexes are declared with the ``indexes`` keyword argument, which
+    maps index names to key functions, and are inherited by subclasses.
     """
 
     prefix: ClassVar[str] = "item"
+    indexes: ClassVar[dict[str, KeyFunction]] = {}
+    """key functions of the secondary indexes of all instances by index name"""
 
     root: dict[RegistryKey, T] = Field(default_factory=dict)
 
-    _counter: itertools.count[int] = PrivateAttr()
-
-    def __init_subclass__(cls, prefix: str = "item", **kwargs: object) -> None:
+    # plain int instead of itertools.count, because itertools objects can neither be
+    # pickled nor deep-copied from Python 3.14 on. None until the first key is
+    # generated to avoid parsing all keys of registries that are never extended.
+    _next_idx: int | None = PrivateAttr(default=None)
+    # key functions registered with register_index
+    _extra_indexes: dict[str, KeyFunction] = PrivateAttr(default_factory=dict)
+    # built on first lookup, None before
+    _secondary: dict[str, _SecondaryIndex] | None = PrivateAttr(default=None)
+    _state: _RegistryState = PrivateAttr(default_factory=_RegistryState)
+
+    def __init_subclass__(
+        cls,
+        prefix: str = "item",
+        indexes: dict[str, KeyFunction] | None = None,
+        **kwargs: object,
+    ) -> None:
         super().__init_subclass__(**kwargs)
         cls.prefix = prefix
+        cls.indexes = {**cls.indexes, **(indexes or {})}
 
-    def model_post_init(self, __context: object) -> None:
-        highest_idx = 0
-        p_dash = f"{self.prefix}-"
-        for k in self.root:
-            if k.startswith(p_dash):
-                try:
-                    highest_idx = max(highest_idx, int(k[len(p_dash) :]))
-                except ValueError:
-                    pass
-        self._counter = itertools.count(highest_idx + 1)
+    @property
+    def _local(self) -> _RegistryState:
+        # much faster than pydantic's lookup of private attributes, which matters
+        # for adding millions of items one by one
+        return self.__pydantic_private__["_state"]  # type: ignore[index]
 
     ##########################################################################
     # MutableMapping ABC
@@ -83,7 +186,20 @@ class Registry(
         return len(self.root)
 
     def __delitem__(self, key: RegistryKey) -> None:
-        del self.root[key]
+        state = self._local
+        with state.lock or _NO_LOCK:
+            # the old item is only needed by listeners, and reading it may be
+            # expensive for other storage backends than dict (see rmmd.sqlite)
+            old = None
+            if state.listeners:
+                old = self.root.pop(key)
+            else:
+                del self.root[key]
+            if self._secondary is not None:
+                for index in self._secondary.values():
+                    index.remove(key)
+            if state.listeners:
+                self._notify(key, old, None)
 
     def __contains__(self, key: object) -> bool:
         return key in self.root
@@ -92,21 +208,88 @@ class Registry(
         if value.key is None:
             object.__setattr__(value, "key", key)
         elif value.key != key:
-            raise ValueError(
-                f"key mismatch: mapping key '{key}' does not match "
-                f"value.key '{value.key}'"
-            )
-        self.root[key] = value
+            raise _key_mismatch(key, value)
+        state = self._local
+        with state.lock or _NO_LOCK:
+            old = self.root.get(key) if state.listeners else None
+            self.root[key] = value
+            if self._secondary is not None:
+                for index in self._secondary.values():
+                    index.remove(key)
+                    index.add(key, value)
+            if state.listeners:
+                self._notify(key, old, value)
+
+    def __eq__(self, other: object) -> bool:
+        # compare only the items, not the internal state (counter, indexes)
+        if not isinstance(other, Registry):
+            return NotImplemented
+        return type(self) is type(other) and self.root == other.root
+
+    def __copy__(self) -> Self:
+        return super().__copy__()._detach_private()
+
+    def __deepcopy__(self, memo: dict[int, Any] | None = None) -> Self:
+        return super().__deepcopy__(memo)._detach_private()
+
+    def _detach_private(self) -> Self:
+        """give a new copy its own private attributes, state and indexes"""
+        # RootModel keeps the private attributes in __dict__, which a shallow copy
+        # shares with the original
+        private = self.__pydantic_private__
+        assert private is not None
+        private = {
+            **private,
+            "_state": _RegistryState(),
+            # the indexes are rebuilt on the first lookup in the copy
+            "_secondary": None,
+            "_extra_indexes": dict(private["_extra_indexes"]),
+        }
+        object.__setattr__(self, "__pydantic_private__", private)
+        return self
 
     ##########################################################################
     # Convenience API
     ##########################################################################
 
+    def _highest_index(self) -> int:
+        """highest index of the auto-generated keys in the registry, 0 if there are none"""
+        highest_idx = 0
+        p_dash = f"{self.prefix}-"
+        for k in self.root:
+            if k.startswith(p_dash):
+                try:
+                    highest_idx = max(highest_idx, int(k[len(p_dash) :]))
+                except ValueError:
+                    pass
+        return highest_idx
+
+    def _next_keys(self, n: int) -> list[str]:
+        """Return the next *n* auto-generated keys that are not already in use."""
+        with self._lock():
+            idx = self._next_idx
+            if idx is None:
+                idx = self._highest_index() + 1
+
+            root, prefix = self.root, self.prefix
+            # same as f"{prefix}-{i:04d}", but faster for millions of keys
+            keys = [f"{prefix}-" + str(i).zfill(4) for i in range(idx, idx + n)]
+            idx += n
+            if not root.keys().isdisjoint(keys):
+                # some keys were assigned explicitly -> skip them
+                keys = [key for key in keys if key not in root]
+                while len(keys) < n:
+                    key = f"{prefix}-{idx:04d}"
+                    idx += 1
+                    if key not in root:
+                        keys.append(key)
+
+            self._next_idx = idx
+            return keys
+
     def _next_key(self) -> str:
         """Return the next auto-generated key that is not already in use."""
-        while (key := f"{self.prefix}-{next(self._counter):04d}") in self.root:
-            pass
-        return key
+        return self._next_keys(1)[0]
 
     def add(self, value: T) -> RegistryKey:
         """Add *value*, auto-assigning a key when ``value.key`` is ``None``.
@@ -115,19 +298,202 @@ class Registry(
         already has a ``key``, that key is used unchanged.  An existing
         entry with the same key is overwritten.
         """
-        if value.key is None:
-            object.__setattr__(value, "key", self._next_key())
-            assert value.key is not None  # for type checker
-        self[value.key] = value
-        return value.key
+        with self._lock():  # no other thread may use the key in between
+            if value.key is None:
+                object.__setattr__(value, "key", self._next_key())
+                assert value.key is not None  # for type checker
+            self[value.key] = value
+            return value.key
+
+    def add_many(self, values: Iterable[T]) -> list[RegistryKey]:
+        """Add multiple items like :meth:`add`, but generate the keys in one batch.
+
+        The items are not validated again, i.e., they should be instances of the
+        item type of the registry.
+
+        :return: keys under which the items were stored, in the order of *values*
+        """
+        values = list(values)
+        with self._lock():
+            missing = [value for value in values if value.key is None]
+            for value, key in zip(missing, self._next_keys(len(missing))):
+                object.__setattr__(value, "key", key)
+            keys: list[str] = [value.key for value in values]  # type: ignore[misc]
+
+            root, secondary = self.root, self._secondary
+            listeners = self._local.listeners
+            if listeners:
+                for key, value in zip(keys, values):
+                    old = root.get(key)
+                    root[key] = value
+                    for listener in list(listeners):
+                        listener(key, old, value)
+            else:
+                root.update(zip(keys, values))
+
+            if secondary is not None:
+                for index in secondary.values():
+                    for key, value in zip(keys, values):
+                        index.remove(key)
+                        index.add(key, value)
+            return keys
+
+    @classmethod
+    def from_trusted(cls, items: Mapping[RegistryKey, T] | Iterable[T]) -> Self:
+        """Construct a registry from items that were already validated.
+
+        In contrast to ``model_validate``, neither the items nor the keys are
+        validated, which makes constructing large registries from programmatically
+        generated items much faster.
+
+        :param items: items by key or items to add with :meth:`add_many`. For a
+            mapping, the ``key`` field of the items has to be None or match the key.
+        :raises ValueError: if the ``key`` field of an item does not match its key
+        """
+        if not isinstance(items, Mapping):
+            registry = cls.model_construct({})
+            registry.add_many(items)
+            return registry
+
+        for key, value in items.items():
+            if value.key is None:
+                object.__setattr__(value, "key", key)
+            elif value.key != key:
+                raise _key_mismatch(key, value)
+        return cls.model_construct(dict(items))
 
     def __str__(self) -> str:
         return str(self.root)
 
+    ##########################################################################
+    # Thread safety
+    ##########################################################################
+
+    def make_thread_safe(self) -> Self:
+        """Make all changes of this registry atomic.
+
+        Afterwards, items can be added, replaced and deleted from several threads,
+        e.g., with :meth:`add` or :meth:`add_many`, without losing items or
+        assigning a key twice. Reading single items is always safe. Iterating over
+        the registry while other threads change it may raise a RuntimeError, as for
+        a dict; iterate over a copy of the keys instead.
+
+        Like listeners, the thread-safe mode is not copied or pickled with the
+        registry.
+
+        :return: the registry itself
+        """
+        state = self._local
+        if state.lock is None:
+            state.lock = threading.RLock()
+        return self
+
+    @property
+    def thread_safe(self) -> bool:
+        """whether :meth:`make_thread_safe` was called"""
+        return self._local.lock is not None
+
+    def _lock(self) -> AbstractContextManager:
+        """lock of the registry in thread-safe mode, a no-op context otherwise"""
+        return self._local.lock or _NO_LOCK
+
+    def reserve_keys(self, n: int) -> list[RegistryKey]:
+        """Reserve *n* auto-generated keys, e.g., for items created later.
+
+        The keys are not in use and will not be generated again for this registry
+        object, but they are only stored once items are added with them.
+        """
+        return self._next_keys(n)
+
+    def reserved_keys(self, block_size: int = 1024) -> Iterator[RegistryKey]:
+        """Endless iterator over auto-generated keys that are reserved in blocks.
+
+        Each worker thread should use its own iterator. Workers then only wait for
+        each other once per block instead of for each key. Unused keys of the last
+        block are skipped.
+
+        :param block_size: number of keys reserved at once
+        """
+        while True:
+            yield from self.reserve_keys(block_size)
+
+    ##########################################################################
+    # Secondary indexes
+    ##########################################################################
+
+    def register_index(self, name: str, key_function: KeyFunction) -> None:
+        """Add a secondary index to this registry.
+
+        :param name: name of the index used in :meth:`lookup`
+        :param key_function: returns the (hashable) value of an item for the index
+            or None, if the item should not be indexed. Should be picklable, if
+            the registry is pickled.
+        """
+        with self._lock():
+            self._extra_indexes[name] = key_function
+            if self._secondary is not None:
+                self._secondary[name] = _SecondaryIndex(key_function, self.root.items())
+
+    def lookup(self, index: str, value: Hashable) -> list[T]:
+        """Items with the given *value* in a secondary index.
+
+        Changes inside of items, e.g., assigning a new value to a field, are not
+        tracked by the index. Store the item again with ``registry[key] = item``.
+
+        :param index: name of the index, e.g., "type"
+        :param value: value of the key function
+        :return: items in insertion order
+        :raises ValueError: if there is no index with the given name
+        """
+        with self._lock():
+            if self._secondary is None:
+                self._secondary = {
+                    name: _SecondaryIndex(key_function, self.root.items())
+                    for name, key_function in (
+                        self.indexes | self._extra_indexes
+                    ).items()
+                }
+            try:
+                keys = self._secondary[index].by_value.get(value, {})
+            except KeyError:
+                raise ValueError(f"Unknown index '{index}'.") from None
+            return [self.root[key] for key in keys]
+
+    ##########################################################################
+    # Change notifications
+    ##########################################################################
+
+    def subscribe(self, listener: RegistryListener) -> None:
+        """Call *listener* after each change through ``__setitem__``,
+        ``__delitem__`` or :meth:`add`.
+
+        Changes of ``root`` or inside of items are not reported.
+        """
+        with self._lock():
+            self._local.listeners.append(listener)
+
+    def unsubscribe(self, listener: RegistryListener) -> None:
+        """Stop calling *listener* on changes."""
+        with self._lock():
+            listeners = self._local.listeners
+            if listener in listeners:
+                listeners.remove(listener)
+
+    def _notify(self, key: str, old: T | None, new: T | None) -> None:
+        for listener in list(self._local.listeners):
+            listener(key, old, new)
+
     ##########################################################################
     # Pydantic hooks
     ##########################################################################
 
+    @field_serializer("root", mode="wrap")
+    def _serialize_root(
+        self, root: Mapping[str, T], handler: SerializerFunctionWrapHandler
+    ) -> Any:
+        # storage backends other than dict (see rmmd.sqlite) are passed as plain dict
+        return handler(root if isinstance(root, dict) else dict(root.items()))
+
     @model_validator(mode="after")
     def _sync_key_fields(self) -> Self:
         """Populate ``item.key`` for items that lack one; raise on mismatch."""
@@ -1,15 +1,33 @@
 # Full Schema
-from typing import Annotated, Literal, TypeAlias
+import weakref
+from functools import partial
+from operator import attrgetter
+from typing import (
+    TYPE_CHECKING,
+    Annotated,
+    Any,
+    Callable,
+    Iterable,
+    Literal,
+    Self,
+    TypeAlias,
+    TypeVar,
+)
 
-from pydantic import Field
+from pydantic import Field, PrivateAttr
 
-from ._base import RmmdBaseModel
+from ._base import LocalState, RmmdBaseModel
 from .calc import GeneralCalculation, NestedCalculation
 from .keys import CitationKey
 from .kinetics import KineticsParameterFitting, RateCoefficient
 from .metadata import Doi, LocalCffFile, Metadata, Reference
-from .pes import Conformation, ConformationRelation, QmCalculation
-from .registry import Registry
+from .pes import (
+    Conformation,
+    ConformationRelation,
+    QmCalculation,
+    _relation_discriminator,
+)
+from .registry import Registry, RegistryListener
 from .species import MolecularEntity, Reaction, Species, TransportProperty
 from .thermo import (
     STATE_1_BAR_298_K,
@@ -20,6 +38,11 @@ from .thermo import (
     ThermoQmCalc,
 )
 
+if TYPE_CHECKING:
+    from .refs import KeyReference, ReverseIndex
+    from .snapshot import _SnapshotTracker
+    from .stoichiometry import Stoichiometry, _CachedStoichiometry
+
 _ThermoItem: TypeAlias = Annotated[
     EmpiricalThermo | TabularThermo,
     Field(discriminator="type"),
@@ -39,6 +62,9 @@ _CalculationItem: TypeAlias = Annotated[
 # Registry subclasses
 ##############################################################################
 
+_BY_TYPE = {"type": attrgetter("type")}
+"""secondary index of the items by their type, e.g., `schema.thermo.lookup("type", "NASA7")`"""
+
 
 class SpeciesRegistry(Registry[Species], prefix="species"): ...
 
@@ -46,27 +72,36 @@ class SpeciesRegistry(Registry[Species], prefix="species"): ...
 class EntityRegistry(Registry[MolecularEntity], prefix="entity"): ...
 
 
-class ReactionRegistry(Registry[Reaction], prefix="reaction"): ...
+class ReactionRegistry(Registry[Reaction], prefix="reaction", indexes=_BY_TYPE): ...
 
 
-class ThermoRegistry(Registry[_ThermoItem], prefix="thermo"): ...
+class ThermoRegistry(Registry[_ThermoItem], prefix="thermo", indexes=_BY_TYPE): ...
 
 
 class TransportRegistry(Registry[TransportProperty], prefix="transport"): ...
 
 
 class RateCoefficientsRegistry(
-    Registry[RateCoefficient], prefix="rate-coefficient"
+    Registry[RateCoefficient], prefix="rate-coefficient", indexes=_BY_TYPE
 ): ...
 
 
-class ConformationRegistry(Registry[Conformation], prefix="conformation"): ...
+class ConformationRegistry(
+    Registry[Conformation], prefix="conformation", indexes=_BY_TYPE
+): ...
 
 
-class PesRelationRegistry(Registry[ConformationRelation], prefix="pes-relation"): ...
+class PesRelationRegistry(
+    Registry[ConformationRelation],
+    prefix="pes-relation",
+    # relations have no type field: "saddle-point", "barrierless" or "equivalence"
+    indexes={"type": _relation_discriminator},
+): ...
 
 
-class CalculationRegistry(Registry[_CalculationItem], prefix="calc"): ...
+class CalculationRegistry(
+    Registry[_CalculationItem], prefix="calc", indexes=_BY_TYPE
+): ...
 
 
 ##############################################################################
@@ -74,6 +109,68 @@ class CalculationRegistry(Registry[_CalculationItem], prefix="calc"): ...
 ##############################################################################
 
 
+class DerivedData:
+    """Base class for data derived from the registries of a dataset, e.g., an index,
+    which is kept up to date through the change notifications of the registries (see
+    :meth:`Registry.subscribe`).
+
+    Instances are stored in the private state of the dataset and rebuilt if a
+    registry of the dataset is replaced (see :meth:`Schema._derived_data`).
+    Subclasses pass the names of the registries the data is derived from to
+    ``__init__``, read them in :meth:`_attach` and handle changes in
+    :meth:`_on_change`.
+    """
+
+    def __init__(self, schema: "Schema", registries: Iterable[str]):
+        self._registries: dict[str, weakref.ref[Registry]] = {}
+        self._listeners: dict[str, RegistryListener] = {}
+        for name in registries:
+            registry: Registry = getattr(schema, name)
+            with registry._lock():  # no changes between reading and subscribing
+                self._attach(name, registry)
+                self._registries[name] = weakref.ref(registry)
+                self._listeners[name] = partial(self._on_change, name)
+                registry.subscribe(self._listeners[name])
+
+    def _attach(self, name: str, registry: Registry) -> None:
+        """read the current contents of the registry *name*"""
+
+    def _on_change(self, name: str, key: str, old: Any, new: Any) -> None:
+        """called after an item of the registry *name* was added (old is None),
+        replaced or deleted (new is None)"""
+        raise NotImplementedError
+
+    def is_current(self, schema: "Schema") -> bool:
+        """whether the data belongs to the registries currently in *schema*"""
+        return all(
+            ref() is getattr(schema, name) for name, ref in self._registries.items()
+        )
+
+    def detach(self) -> None:
+        """stop listening to changes of the registries"""
+        for name, ref in self._registries.items():
+            registry = ref()
+            if registry is not None:
+                registry.unsubscribe(self._listeners[name])
+
+
+_D = TypeVar("_D", bound=DerivedData)
+
+
+class _DerivedState(LocalState):
+    """data derived from the registries of a dataset, built on first use"""
+
+    __slots__ = ("reverse_index", "stoichiometry", "snapshot_tracker")
+
+    def __init__(self):
+        self.reverse_index: "ReverseIndex | None" = None
+        """see :func:`rmmd.refs.reverse_index`"""
+        self.stoichiometry: "_CachedStoichiometry | None" = None
+        """see :func:`rmmd.stoichiometry.stoichiometry`"""
+        self.snapshot_tracker: "_SnapshotTracker | None" = None
+        """see :func:`rmmd.snapshot.snapshot`"""
+
+
 class Schema(RmmdBaseModel, extra="forbid"):
     """The final schema, encapsulating all information"""
 
@@ -119,5 +216,73 @@ class Schema(RmmdBaseModel, extra="forbid"):
     calculations: CalculationRegistry = Field(default_factory=CalculationRegistry)
     """quantum chemistry calculations"""
 
+    _derived: _DerivedState = PrivateAttr(default_factory=_DerivedState)
+
+    def __copy__(self) -> Self:
+        copied = super().__copy__()
+        copied._derived = _DerivedState()  # pydantic shares private attributes
+        return copied
+
+    def _derived_data(self, name: str, factory: Callable[["Schema"], _D]) -> _D:
+        """the derived data *name* of the private state, built with *factory* on
+        first use and after a registry was replaced"""
+        state = self._derived
+        data = getattr(state, name)
+        if data is None or not data.is_current(self):
+            if data is not None:
+                data.detach()
+            data = factory(self)
+            setattr(state, name, data)
+            # stop updating the data with the dataset, the registries may live longer
+            weakref.finalize(self, data.detach)
+        return data
+
+    def referrers(self, registry: str, key: str) -> "list[KeyReference]":
+        """References to the item *key* in *registry*, e.g., all species and
+        calculations referencing the thermo item "thermo-0042"::
+
+            for ref in schema.referrers("thermo", "thermo-0042"):
+                registry, key, *path = ref.location
+
+        The reverse index is built in one pass on the first call and then updated
+        with each change of a registry (see :class:`rmmd.refs.ReverseIndex`).
+
+        :param registry: name of the registry, e.g., "thermo"
+        :param key: key of the item in the registry
+        :raises ValueError: if *registry* is not a registry of the schema
+        """
+        from .refs import reverse_index  # avoid circular import
+
+        if registry not in REGISTRY_NAMES:
+            raise ValueError(f"Unknown registry '{registry}'.")
+        return reverse_index(self).referrers(registry, key)
+
+    def stoichiometry(self) -> "Stoichiometry":
+        """Sparse reactant, product and net stoichiometry matrices of all reactions.
+
+        The matrices are cached until species or reactions are added, deleted or
+        replaced, see :mod:`rmmd.stoichiometry`.
+        """
+        from .stoichiometry import stoichiometry  # avoid circular import
+
+        return stoichiometry(self)
+
+    def snapshot(self) -> "Schema":
+        """Immutable snapshot of the dataset for concurrent readers.
+
+        Unchanged items are shared with the dataset, so that a snapshot only costs
+        O(number of items changed since the last snapshot), see :mod:`rmmd.snapshot`.
+        """
+        from .snapshot import snapshot  # avoid circular import
+
+        return snapshot(self)
+
 
 Schema.model_rebuild()
+
+REGISTRY_NAMES: tuple[str, ...] = tuple(
+    name
+    for name, field in Schema.model_fields.items()
+    if isinstance(field.annotation, type) and issubclass(field.annotation, Registry)
+)
+"""names of the registries of the root schema, e.g., "species" and "calculations"."""
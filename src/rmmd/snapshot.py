@@ -0,0 +1,234 @@
+"""Immutable snapshots of datasets for concurrent readers.
+
+A snapshot is a :class:`~rmmd.schema.Schema` with the contents of all registries at
+the time it was taken. It shares the items with the original dataset instead of
+copying them, so that many readers can use snapshots while one editor keeps changing
+the dataset::
+
+    view = schema.snapshot()  # hand to reader threads
+    schema.reactions.add(reaction)  # does not change view
+    changes = diff(view, schema.snapshot())
+    changes["reactions"].added  # [key of reaction]
+
+The registries of a snapshot are read-only. Their contents consist of the contents at
+an earlier snapshot and the items changed since then, so taking a snapshot costs
+O(number of changed items) (amortized). The first snapshot of a dataset copies the
+registries once.
+
+As for :class:`~rmmd.refs.ReverseIndex`, changes are tracked through the change
+notifications of the registries, i.e., items have to be added, replaced or deleted
+with ``registry[key] = item``, ``del registry[key]``, :meth:`Registry.add` or
+:meth:`Registry.add_many`. Items are shared, so they must not be changed in place.
+Fields that are not registries, e.g., ``metadata``, are shared as well.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping
+from typing import Any, NamedTuple
+
+from .registry import Registry
+from .schema import REGISTRY_NAMES, DerivedData, Schema
+
+_DELETED: Any = object()
+"""marks deleted items in the layers of :class:`FrozenContents`"""
+
+_MISSING: Any = object()
+
+
+class FrozenContents(Mapping[str, Any]):
+    """Read-only contents of a registry in a snapshot.
+
+    The contents are a base dict with layers of changes on top of it. Neither the base
+    nor the layers are changed after creation, so that they can be shared between
+    snapshots. The keys are in insertion order, except that deleted keys that were
+    added again keep their original position.
+    """
+
+    __slots__ = ("base", "layers", "_len")
+
+    def __init__(
+        self, base: dict[str, Any], layers: tuple[dict[str, Any], ...], n: int
+    ):
+        """
+        :param base: items by key
+        :param layers: changed items by key, oldest first. Deleted items are
+            marked with ``_DELETED``.
+        :param n: number of items
+        """
+        self.base = base
+        self.layers = layers
+        self._len = n
+
+    def __getitem__(self, key: str) -> Any:
+        for layer in reversed(self.layers):
+            item = layer.get(key, _MISSING)
+            if item is not _MISSING:
+                if item is _DELETED:
+                    raise KeyError(key)
+                return item
+        return self.base[key]
+
+    def __contains__(self, key: object) -> bool:
+        return self.get(key, _MISSING) is not _MISSING  # type: ignore[arg-type]
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[str]:
+        for key in self.base:
+            if key in self:
+                yield key
+        seen: set[str] = set()
+        for layer in self.layers:
+            for key in layer:
+                if key not in self.base and key not in seen:
+                    seen.add(key)
+                    if key in self:
+                        yield key
+
+    def with_changes(self, changes: dict[str, Any], n: int) -> FrozenContents:
+        """contents after *changes* (oldest layer of the result)
+
+        Layers are merged like the levels of a log-structured merge tree, i.e., a
+        layer is merged with all layers above it that are not larger, which keeps the
+        number of layers logarithmic in the number of snapshots.
+        """
+        layers = list(self.layers)
+        while layers and len(layers[-1]) <= len(changes):
+            changes = {**layers.pop(), **changes}
+        layers.append(changes)
+        return FrozenContents(self.base, tuple(layers), n)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self.items())!r})"
+
+
+###############################################################################
+# change tracking
+###############################################################################
+
+
+class _SnapshotTracker(DerivedData):
+    """registry contents at the last snapshot and the changes since then"""
+
+    def __init__(self, schema: Schema):
+        self._contents: dict[str, FrozenContents] = {}
+        """contents of each registry at the last snapshot"""
+        self._changes: dict[str, dict[str, Any]] = {}
+        """changed items of each registry since the last snapshot"""
+        super().__init__(schema, REGISTRY_NAMES)
+
+    def _attach(self, name: str, registry: Registry) -> None:
+        self._contents[name] = FrozenContents(
+            dict(registry.root), (), len(registry.root)
+        )
+        self._changes[name] = {}
+
+    def _on_change(self, name: str, key: str, old: Any, new: Any) -> None:
+        self._changes[name][key] = _DELETED if new is None else new
+
+    def contents(self, name: str, registry: Registry) -> FrozenContents:
+        """current contents of the registry *name*"""
+        with registry._lock():
+            changes = self._changes[name]
+            if not changes:
+                return self._contents[name]
+            self._changes[name] = {}
+
+            contents = self._contents[name]
+            n_changed = len(changes) + sum(len(layer) for layer in contents.layers)
+            if n_changed > len(contents.base) // 2:
+                # compact to keep lookups fast; amortized O(1) per change
+                contents = FrozenContents(dict(registry.root), (), len(registry.root))
+            else:
+                contents = contents.with_changes(changes, len(registry.root))
+            self._contents[name] = contents
+            return contents
+
+
+###############################################################################
+# public API
+###############################################################################
+
+
+def snapshot(schema: Schema) -> Schema:
+    """An immutable snapshot of *schema* sharing unchanged items with it.
+
+    Should be called from the thread changing the dataset, unless its registries are
+    thread-safe (see :meth:`Registry.make_thread_safe`).
+
+    :param schema: dataset to take a snapshot of
+    :return: dataset with read-only registries, see :class:`FrozenContents`
+    """
+    tracker = schema._derived_data("snapshot_tracker", _SnapshotTracker)
+    fields = dict(schema.__dict__)
+    for name in REGISTRY_NAMES:
+        registry: Registry = getattr(schema, name)
+        contents = tracker.contents(name, registry)
+        fields[name] = type(registry).model_construct(contents)
+    return Schema.model_construct(schema.model_fields_set, **fields)
+
+
+class RegistryDiff(NamedTuple):
+    """keys of the items that differ between two versions of a registry"""
+
+    added: list[str]
+    """keys only in the new version"""
+    removed: list[str]
+    """keys only in the old version"""
+    changed: list[str]
+    """keys of items that were replaced by different items"""
+
+
+def _candidate_keys(old: Mapping, new: Mapping) -> Iterator[str] | None:
+    """keys that may differ between two snapshots, None if all may differ"""
+    if old is new:
+        return iter(())
+    if (
+        not isinstance(old, FrozenContents)
+        or not isinstance(new, FrozenContents)
+        or old.base is not new.base
+    ):
+        return None
+    shared = {id(layer) for layer in old.layers} & {id(layer) for layer in new.layers}
+    candidates: dict[str, None] = {}
+    for layer in (*old.layers, *new.layers):
+        if id(layer) not in shared:
+            candidates.update(dict.fromkeys(layer))
+    return iter(candidates)
+
+
+def diff(old: Schema, new: Schema) -> dict[str, RegistryDiff]:
+    """Differences between the registries of two versions of a dataset.
+
+    For two snapshots of the same dataset, only the items changed in between are
+    compared. Otherwise, all items are compared.
+
+    :param old: earlier version, e.g., a snapshot
+    :param new: later version, e.g., a newer snapshot or the dataset itself
+    :return: differences by registry name for the registries that differ
+    """
+    diffs = {}
+    for name in REGISTRY_NAMES:
+        old_items: Mapping = getattr(old, name).root
+        new_items: Mapping = getattr(new, name).root
+        keys = _candidate_keys(old_items, new_items)
+        if keys is None:
+            keys = iter({**dict.fromkeys(old_items), **dict.fromkeys(new_items)})
+
+        added, removed, changed = [], [], []
+        for key in keys:
+            old_item = old_items.get(key, _MISSING)
+            new_item = new_items.get(key, _MISSING)
+            if old_item is _MISSING:
+                if new_item is not _MISSING:
+                    added.append(key)
+            elif new_item is _MISSING:
+                removed.append(key)
+            elif old_item is not new_item and old_item != new_item:
+                changed.append(key)
+
+        if added or removed or changed:
+            diffs[name] = RegistryDiff(added, removed, changed)
+    return diffs
@@ -3,8 +3,6 @@
 from __future__ import annotations
 
 import logging
-import re
-from collections import defaultdict
 from typing import Annotated, Any, Literal, Self, TypeAlias
 
 from annotated_types import Gt, Le, MinLen
@@ -18,6 +16,7 @@ from pydantic import (
 
 from ._base import RmmdFrozenBaseModel
 from .identifiers import FixedHInChI
+from .inchi import ParsedInChI, parse_inchi
 from .keys import (
     ConformationIndex,
     EntityKey,
@@ -92,15 +91,20 @@ class MolecularEntity(HasKeyMixin):
     """
 
     # some helpers
+    @property
+    def parsed_inchi(self) -> ParsedInChI:
+        """layers of the InChI-fixedH, shared by all entities with the same InChI"""
+        return parse_inchi(self.inchi_fixedh.value)
+
     @property
     def constitution(self) -> Constitution:
         """element count, e.g. {'C': 1, 'H': 4}"""
-        return _consitution_from_inchi(self.inchi_fixedh.value)
+        return dict(self.parsed_inchi.constitution)
 
     @property
     def charge(self) -> int:
         """total charge of the molecule"""
-        return _get_charge_from_inchi(self.inchi_fixedh.value)
+        return self.parsed_inchi.charge
 
 
 class TransportProperty(HasKeyMixin):
@@ -222,22 +226,7 @@ def _get_charge_from_inchi(inchi: str) -> int:
     """extract charge from InChI main layer
 
     :param inchi: InChI string (asumed valid)"""
-    charge = 0
-
-    for part in inchi.split("/"):
-        if part.startswith("p") or part.startswith("q"):
-            fragment_charges = part[1:].split(";")
-
-            for fragment_charge in fragment_charges:
-                if fragment_charge != "":
-                    charge += int(fragment_charge)
-
-        # the remaining layers should not change the total charge, so we only
-        # check the /p and /q sublayers of the main layer
-        if part[0] in {"b", "t", "m", "s", "i", "f"}:
-            break
-
-    return charge
+    return parse_inchi(inchi).charge
 
 
 def _consitution_from_inchi(inchi_or_other: str | Any) -> dict[str, int]:
@@ -249,41 +238,7 @@ def _consitution_from_inchi(inchi_or_other: str | Any) -> dict[str, int]:
     if not isinstance(inchi_or_other, str):
         return inchi_or_other
 
-    layers = inchi_or_other.split("/")
-
-    main_layer = layers[1]
-    p_layer = None
-
-    for layer in layers[2:]:
-        if layer.startswith("p"):
-            p_layer = layer
-            break
-
-    constitution = defaultdict(int)
-
-    # Parse main layer for elements and counts
-    pattern = r"([A-Z][a-z]?)(\d*)"
-    matches = re.findall(pattern, main_layer)
-
-    for element, count_str in matches:
-        count = int(count_str) if count_str else 1
-        constitution[element] += count
-
-    # Parse p layer if present (protonation layer)
-    if p_layer:
-        # p+3 -> 3 additional protons, p-1 -> 1 less proton
-
-        sign = p_layer[1]
-        count_str = int(p_layer[2:])
-
-        if sign == "+":
-            constitution["H"] += count_str
-        elif sign == "-":
-            constitution["H"] -= count_str
-        else:
-            raise ValueError(f"Invalid p layer in InChI: {p_layer}")
-
-    return constitution
+    return dict(parse_inchi(inchi_or_other).constitution)
 
 
 # TODO use "Composition" instead of "Constitution"?
@@ -0,0 +1,408 @@
+"""Out-of-core storage of RMMD datasets in SQLite databases.
+
+Datasets that do not fit into memory as validated models, e.g., large archives of
+quantum chemistry calculations, can be stored in a SQLite database with one table per
+registry. Each row contains the key and the JSON serialization of one item::
+
+    dump_sqlite(schema, "archive.sqlite")
+
+    schema = load_sqlite("archive.sqlite")
+    calc = schema.calculations["calc-0042"]  # read and validated on access
+    with transaction(schema):
+        schema.calculations.add_many(new_calculations)  # one transaction
+
+The registries of a schema loaded with :func:`load_sqlite` are the usual registry
+classes of :mod:`rmmd.schema`, but their ``root`` is a :class:`SqliteStore` instead of
+a dict. Items are validated when they are read and the most recently used items of
+each registry are kept in memory. Writes are committed immediately, unless they are
+made inside of :func:`transaction`.
+
+Only the registries are stored out-of-core. Changes to other fields of the schema,
+e.g., ``metadata``, are not written to the database; use :func:`dump_sqlite` to write
+a complete schema.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from collections import OrderedDict
+from collections.abc import (
+    ItemsView,
+    Iterable,
+    Iterator,
+    KeysView,
+    Mapping,
+    MutableMapping,
+    ValuesView,
+)
+from contextlib import contextmanager
+from functools import cache
+from itertools import chain
+from pathlib import Path
+from typing import Any, Generic, TypeVar, get_args
+
+from pydantic import TypeAdapter
+
+from .registry import HasKeyMixin, Registry
+from .schema import REGISTRY_NAMES, Schema
+
+T = TypeVar("T", bound=HasKeyMixin)
+R = TypeVar("R", bound=Registry)
+
+DEFAULT_CACHE_SIZE = 1024
+"""default number of validated items kept in memory per registry"""
+
+_BATCH_SIZE = 500
+"""number of keys per query when looking up many keys"""
+
+_ROOT_TABLE = "rmmd"
+"""table containing the fields of the root schema that are not registries"""
+
+
+@cache
+def _adapter(item_type: Any) -> TypeAdapter:
+    return TypeAdapter(item_type)
+
+
+def _item_type(registry_type: type[Registry]) -> Any:
+    """type of the items of a registry class, e.g., ``Species``"""
+    return get_args(registry_type.model_fields["root"].annotation)[1]
+
+
+class SqliteDatabase:
+    """Connection to a SQLite database storing registries, see :meth:`registry`."""
+
+    def __init__(self, path: str | Path, *, cache_size: int = DEFAULT_CACHE_SIZE):
+        """
+        :param path: path of the database file, created if it does not exist
+        :param cache_size: number of validated items kept in memory per registry
+        """
+        self.path = Path(path)
+        self.cache_size = cache_size
+        self.connection = sqlite3.connect(self.path)
+        self._depth = 0
+        """number of nested :meth:`transaction` contexts"""
+        self._stores: list[SqliteStore] = []
+
+    def registry(self, registry_type: type[R], table: str, context: Any = None) -> R:
+        """Registry of type *registry_type* storing its items in *table*.
+
+        :param registry_type: registry class, e.g., ``rmmd.schema.SpeciesRegistry``
+        :param table: name of the table, created if it does not exist
+        :param context: validation context for reading items, e.g., the
+            ``base_path`` of external arrays
+        """
+        store = SqliteStore(self, table, _item_type(registry_type), context)
+        return registry_type.model_construct(store)
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Commit all writes in this context at once or none of them on errors.
+
+        Transactions can be nested, in which case the outermost one commits.
+        """
+        self._depth += 1
+        try:
+            yield
+        except BaseException:
+            if self._depth == 1:
+                self.connection.rollback()
+                for store in self._stores:
+                    store.clear_cache()  # may contain items that were rolled back
+            raise
+        else:
+            if self._depth == 1:
+                self.connection.commit()
+        finally:
+            self._depth -= 1
+
+    def _commit(self) -> None:
+        """commit the last write unless it is part of a transaction"""
+        if self._depth == 0:
+            self.connection.commit()
+
+    def close(self) -> None:
+        """close the connection; the registries cannot be used afterwards"""
+        self.connection.close()
+
+
+class SqliteStore(MutableMapping[str, T], Generic[T]):
+    """Items of a registry stored in a table of a SQLite database.
+
+    Used as ``root`` of a :class:`~rmmd.registry.Registry`, see
+    :meth:`SqliteDatabase.registry`. Items are stored as JSON and validated when they
+    are read. The last ``cache_size`` items that were read or written are kept in
+    memory, i.e., changes inside of an item, e.g., assigning a new value to a field,
+    can get lost. Store the item again with ``registry[key] = item``.
+
+    The items are kept in insertion order, like in a dict.
+    """
+
+    def __init__(
+        self, database: SqliteDatabase, table: str, item_type: Any, context: Any = None
+    ):
+        """
+        :param database: database containing the table
+        :param table: name of the table, created if it does not exist
+        :param item_type: type of the items, e.g., ``Species``
+        :param context: validation context for reading items
+        """
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name '{table}'.")
+        self._database = database
+        self._table = table
+        self._adapter = _adapter(item_type)
+        self._context = context
+        self._cache: OrderedDict[str, T] = OrderedDict()
+
+        database.connection.execute(
+            f'CREATE TABLE IF NOT EXISTS "{table}" '
+            "(key TEXT PRIMARY KEY NOT NULL, data BLOB NOT NULL)"
+        )
+        database._commit()
+        database._stores.append(self)
+        # the upsert keeps the rowid and thus the position of replaced items
+        self._upsert = (
+            f'INSERT INTO "{table}" (key, data) VALUES (?, ?) '
+            "ON CONFLICT (key) DO UPDATE SET data = excluded.data"
+        )
+
+    def _execute(self, sql: str, parameters: Iterable[Any] = ()) -> sqlite3.Cursor:
+        return self._database.connection.execute(sql, parameters)
+
+    def _validate(self, key: str, data: bytes) -> T:
+        item = self._adapter.validate_json(data, context=self._context)
+        object.__setattr__(item, "key", key)
+        return item
+
+    def _dump(self, item: T) -> bytes:
+        return self._adapter.dump_json(item, by_alias=True, exclude_none=True)
+
+    def _remember(self, key: str, item: T) -> T:
+        cache = self._cache
+        cache[key] = item
+        cache.move_to_end(key)
+        if len(cache) > self._database.cache_size:
+            cache.popitem(last=False)
+        return item
+
+    def clear_cache(self) -> None:
+        """drop all items kept in memory"""
+        self._cache.clear()
+
+    ##########################################################################
+    # MutableMapping ABC
+    ##########################################################################
+
+    def __getitem__(self, key: str) -> T:
+        try:
+            item = self._cache[key]
+        except KeyError:
+            pass
+        else:
+            self._cache.move_to_end(key)
+            return item
+
+        row = self._execute(
+            f'SELECT data FROM "{self._table}" WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return self._remember(key, self._validate(key, row[0]))
+
+    def __setitem__(self, key: str, value: T) -> None:
+        self._execute(self._upsert, (key, self._dump(value)))
+        self._database._commit()
+        self._remember(key, value)
+
+    def __delitem__(self, key: str) -> None:
+        cursor = self._execute(f'DELETE FROM "{self._table}" WHERE key = ?', (key,))
+        self._database._commit()
+        self._cache.pop(key, None)
+        if cursor.rowcount == 0:
+            raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        if key in self._cache:
+            return True
+        return (
+            self._execute(
+                f'SELECT 1 FROM "{self._table}" WHERE key = ?', (key,)
+            ).fetchone()
+            is not None
+        )
+
+    def __iter__(self) -> Iterator[str]:
+        # keys are read at once, so that the registry can be changed while iterating
+        keys = self._execute(f'SELECT key FROM "{self._table}" ORDER BY rowid')
+        return iter([key for (key,) in keys])
+
+    def __len__(self) -> int:
+        return self._execute(f'SELECT count(*) FROM "{self._table}"').fetchone()[0]
+
+    ##########################################################################
+    # bulk operations
+    ##########################################################################
+
+    def _iter_items(self) -> Iterator[tuple[str, T]]:
+        """all items in one scan of the table; does not evict the cached items"""
+        cache = self._cache
+        rows = self._database.connection.cursor()
+        rows.execute(f'SELECT key, data FROM "{self._table}" ORDER BY rowid')
+        for key, data in rows:
+            item = cache.get(key)
+            yield key, item if item is not None else self._validate(key, data)
+
+    def _existing_keys(self, keys: Iterable[str]) -> set[str]:
+        """those of *keys* that are in the table, looked up in batches"""
+        keys, existing = list(keys), set()
+        for start in range(0, len(keys), _BATCH_SIZE):
+            batch = keys[start : start + _BATCH_SIZE]
+            existing.update(
+                key
+                for (key,) in self._execute(
+                    f'SELECT key FROM "{self._table}" WHERE key IN '
+                    f"({', '.join('?' * len(batch))})",
+                    batch,
+                )
+            )
+        return existing
+
+    def keys(self) -> KeysView[str]:
+        return _KeysView(self)
+
+    def items(self) -> ItemsView[str, T]:
+        return _ItemsView(self)
+
+    def values(self) -> ValuesView[T]:
+        return _ValuesView(self)
+
+    def update(self, other: Any = (), /, **kwargs: T) -> None:
+        """Store many items in one transaction."""
+        items = other.items() if isinstance(other, Mapping) else other
+        self.write(chain(items, kwargs.items()))
+
+    def write(self, items: Iterable[tuple[str, T]], *, cache: bool = True) -> None:
+        """Store many items in one transaction.
+
+        :param items: pairs of key and item, consumed lazily
+        :param cache: keep the items in memory. If False, the items are not kept,
+            e.g., to copy a registry into the database.
+        """
+
+        def rows() -> Iterator[tuple[str, bytes]]:
+            for key, item in items:
+                if cache:
+                    self._remember(key, item)
+                else:
+                    self._cache.pop(key, None)
+                yield key, self._dump(item)
+
+        with self._database.transaction():
+            self._database.connection.executemany(self._upsert, rows())
+
+    def clear(self) -> None:
+        self._execute(f'DELETE FROM "{self._table}"')
+        self._database._commit()
+        self._cache.clear()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({str(self._database.path)!r}, {self._table!r})"
+
+
+class _KeysView(KeysView):
+    def isdisjoint(self, other: Iterable[Any]) -> bool:
+        # one query per batch instead of one per key, e.g., for Registry.add_many
+        return not self._mapping._existing_keys(other)
+
+
+class _ItemsView(ItemsView):
+    def __iter__(self):
+        return self._mapping._iter_items()
+
+
+class _ValuesView(ValuesView):
+    def __iter__(self):
+        return (item for _, item in self._mapping._iter_items())
+
+
+###############################################################################
+# datasets
+###############################################################################
+
+
+def load_sqlite(path: str | Path, *, cache_size: int = DEFAULT_CACHE_SIZE) -> Schema:
+    """Open an RMMD dataset stored in a SQLite database.
+
+    Only the fields that are not registries are validated immediately; registry items
+    are validated when they are accessed.
+
+    :param path: path of the database written by :func:`dump_sqlite`
+    :param cache_size: number of validated items kept in memory per registry
+    :raises FileNotFoundError: if the database does not exist
+    :raises ValueError: if the database does not contain an RMMD dataset
+    :raises pydantic.ValidationError: if the non-registry fields are invalid
+    """
+    path = Path(path)
+    if not path.is_file():
+        raise FileNotFoundError(f"No such file: '{path}'")
+
+    database = SqliteDatabase(path, cache_size=cache_size)
+    try:
+        (root,) = database.connection.execute(
+            f'SELECT data FROM "{_ROOT_TABLE}"'
+        ).fetchone()
+    except (sqlite3.DatabaseError, TypeError):
+        database.close()
+        raise ValueError(f"'{path}' does not contain an RMMD dataset.") from None
+
+    context = {"base_path": path.parent}
+    schema = Schema.model_validate_json(root, context=context)
+    for name in REGISTRY_NAMES:
+        registry_type = Schema.model_fields[name].annotation
+        schema.__dict__[name] = database.registry(registry_type, name, context)
+        schema.__pydantic_fields_set__.add(name)
+    return schema
+
+
+def dump_sqlite(schema: Schema, path: str | Path) -> None:
+    """Write *schema* to a SQLite database with one table per registry.
+
+    An existing file at *path* is replaced. Fields that are None are omitted.
+
+    :param schema: RMMD data to write, can be loaded with :func:`load_sqlite`
+    :param path: path of the database file
+    """
+    path = Path(path)
+    path.unlink(missing_ok=True)
+
+    database = SqliteDatabase(path)
+    try:
+        with database.transaction():
+            root = schema.model_dump_json(
+                by_alias=True, exclude_none=True, exclude=set(REGISTRY_NAMES)
+            )
+            database.connection.execute(f'CREATE TABLE "{_ROOT_TABLE}" (data BLOB)')
+            database.connection.execute(
+                f'INSERT INTO "{_ROOT_TABLE}" VALUES (?)', (root,)
+            )
+            for name in REGISTRY_NAMES:
+                registry: Registry = getattr(schema, name)
+                store = SqliteStore(database, name, _item_type(type(registry)))
+                store.write(registry.root.items(), cache=False)
+    finally:
+        database.close()
+
+
+@contextmanager
+def transaction(schema: Schema) -> Iterator[None]:
+    """Commit all writes to the registries of *schema* in this context at once.
+
+    :param schema: dataset opened with :func:`load_sqlite`
+    :raises ValueError: if the registries of *schema* are not stored in a database
+    """
+    store = schema.species.root
+    if not isinstance(store, SqliteStore):
+        raise ValueError("The schema is not stored in a SQLite database.")
+    with store._database.transaction():
+        yield
@@ -0,0 +1,201 @@
+"""Stoichiometry matrices of the reactions in a dataset.
+
+The reactants and products of all reactions are stored in sparse reaction × species
+matrices in CSR format (see :class:`rmmd._sparse.CsrMatrix`)::
+
+    stoichiometry = schema.stoichiometry()
+    i = stoichiometry.reaction_index["R1"]
+    j = stoichiometry.species_index["OH"]
+    net = stoichiometry.net.to_scipy()  # scipy.sparse.csr_array without copies
+    stoichiometry.save_npz("network.npz")
+
+The matrices are built once per dataset and cached until a species or reaction is
+added, replaced or deleted (see :meth:`Registry.subscribe`). Rows and columns follow
+the order of the reaction and species registry. Catalysts and solvents are not part of
+the stoichiometry.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import cached_property
+from itertools import chain, repeat
+from os import PathLike
+
+import numpy as np
+
+from ._sparse import CsrMatrix
+from .keys import ReactionIndex, SpeciesName
+from .schema import DerivedData, Schema
+from .species import Reaction, Species
+
+
+@dataclass(frozen=True, eq=False)
+class Stoichiometry:
+    """reactants and products of all reactions of a dataset"""
+
+    reactions: tuple[ReactionIndex, ...]
+    """row labels, in the order of the reaction registry. Reactions referencing
+    unknown species are not included."""
+    species: tuple[SpeciesName, ...]
+    """column labels, in the order of the species registry"""
+    reactants: CsrMatrix
+    """(n_reactions, n_species) stoichiometric coefficients of the reactants"""
+    products: CsrMatrix
+    """(n_reactions, n_species) stoichiometric coefficients of the products"""
+
+    @cached_property
+    def net(self) -> CsrMatrix:
+        """(n_reactions, n_species) net stoichiometric coefficients, i.e., products
+        minus reactants"""
+        return _read_only(self.products - self.reactants)
+
+    @cached_property
+    def reaction_index(self) -> dict[ReactionIndex, int]:
+        """row of each reaction"""
+        return {key: i for i, key in enumerate(self.reactions)}
+
+    @cached_property
+    def species_index(self) -> dict[SpeciesName, int]:
+        """column of each species"""
+        return {name: j for j, name in enumerate(self.species)}
+
+    def save_npz(self, path: str | PathLike, compressed: bool = True) -> None:
+        """Store the matrices and labels in a NumPy ``.npz`` file.
+
+        The arrays of each matrix are stored as ``<name>_data``, ``<name>_indices``,
+        ``<name>_indptr`` and ``<name>_shape`` for "reactants", "products" and "net",
+        the labels as ``reactions`` and ``species``. Use :meth:`load_npz` to read it.
+        """
+        arrays = {
+            "reactions": np.array(self.reactions, dtype=str),
+            "species": np.array(self.species, dtype=str),
+        }
+        for name in ("reactants", "products", "net"):
+            matrix: CsrMatrix = getattr(self, name)
+            arrays[f"{name}_data"] = matrix.data
+            arrays[f"{name}_indices"] = matrix.indices
+            arrays[f"{name}_indptr"] = matrix.indptr
+            arrays[f"{name}_shape"] = np.array(matrix.shape)
+        (np.savez_compressed if compressed else np.savez)(path, **arrays)
+
+    @classmethod
+    def load_npz(cls, path: str | PathLike) -> Stoichiometry:
+        """Read matrices stored with :meth:`save_npz`."""
+        with np.load(path, allow_pickle=False) as archive:
+
+            def matrix(name: str) -> CsrMatrix:
+                n_rows, n_cols = archive[f"{name}_shape"].tolist()
+                return _read_only(
+                    CsrMatrix(
+                        archive[f"{name}_data"],
+                        archive[f"{name}_indices"],
+                        archive[f"{name}_indptr"],
+                        (n_rows, n_cols),
+                    )
+                )
+
+            return cls(
+                tuple(archive["reactions"].tolist()),
+                tuple(archive["species"].tolist()),
+                matrix("reactants"),
+                matrix("products"),
+            )
+
+
+def _read_only(matrix: CsrMatrix) -> CsrMatrix:
+    """*matrix* with read-only arrays, so that shared matrices cannot be changed"""
+    for array in (matrix.data, matrix.indices, matrix.indptr):
+        array.flags.writeable = False
+    return matrix
+
+
+def _coordinates(
+    species_lists: list[list[SpeciesName]], column: dict[SpeciesName, int]
+) -> tuple[np.ndarray, np.ndarray]:
+    """row and column index of each species in *species_lists*, -1 if unknown"""
+    lengths = np.fromiter(map(len, species_lists), np.int64, len(species_lists))
+    names = chain.from_iterable(species_lists)
+    cols = np.fromiter(map(column.get, names, repeat(-1)), np.int64, lengths.sum())
+    return np.repeat(np.arange(len(species_lists)), lengths), cols
+
+
+def stoichiometry_matrices(schema: Schema) -> Stoichiometry:
+    """Build the stoichiometry matrices of all reactions in *schema*.
+
+    Species listed several times, e.g., ``[OH, OH]``, are summed up. Usually,
+    the cached matrices of :func:`stoichiometry` should be used instead.
+    """
+    species = tuple(schema.species.root)
+    column = {name: j for j, name in enumerate(species)}
+    keys = tuple(schema.reactions.root)
+    reactions = list(schema.reactions.root.values())
+    coordinates = [
+        _coordinates([reaction.reactants for reaction in reactions], column),
+        _coordinates([reaction.products for reaction in reactions], column),
+    ]
+
+    # skip reactions with dangling references
+    dangling = np.zeros(len(keys), dtype=bool)
+    for rows, cols in coordinates:
+        dangling[rows[cols < 0]] = True
+    new_rows = np.cumsum(~dangling) - 1
+    shape = (len(keys) - int(dangling.sum()), len(species))
+
+    reactants, products = (
+        _read_only(
+            CsrMatrix.from_coo(
+                new_rows[rows[~dangling[rows]]],
+                cols[~dangling[rows]],
+                np.ones(np.count_nonzero(~dangling[rows]), dtype=np.int64),
+                shape,
+            )
+        )
+        for rows, cols in coordinates
+    )
+    return Stoichiometry(
+        tuple(key for key, skip in zip(keys, dangling) if not skip),
+        species,
+        reactants,
+        products,
+    )
+
+
+###############################################################################
+# cache
+###############################################################################
+
+
+class _CachedStoichiometry(DerivedData):
+    """stoichiometry of a dataset, discarded when its species or reactions change"""
+
+    def __init__(self, schema: Schema):
+        self.value: Stoichiometry | None = None
+        super().__init__(schema, ("species", "reactions"))
+
+    def _on_change(
+        self,
+        name: str,
+        key: str,
+        old: Species | Reaction | None,
+        new: Species | Reaction | None,
+    ) -> None:
+        if isinstance(old, Reaction) and isinstance(new, Reaction):
+            if old.reactants == new.reactants and old.products == new.products:
+                return  # e.g., only the rate constants changed
+        elif old is not None and new is not None:
+            return  # species replaced, columns stay the same
+        self.value = None
+
+
+def stoichiometry(schema: Schema) -> Stoichiometry:
+    """The stoichiometry matrices of *schema*, built on first use.
+
+    The matrices are kept with the dataset and rebuilt after species or reactions
+    were added, deleted or replaced with different reactants or products. Changes
+    inside of items, e.g., appending to ``Reaction.products``, are not tracked.
+    """
+    cache = schema._derived_data("stoichiometry", _CachedStoichiometry)
+    if cache.value is None:
+        cache.value = stoichiometry_matrices(schema)
+    return cache.value
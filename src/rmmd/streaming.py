@@ -0,0 +1,178 @@
+"""Validation of large RMMD files with bounded memory.
+
+Loading an RMMD file with :func:`rmmd.io.load` keeps the parsed YAML document and the
+validated model in memory at the same time. For datasets with thousands of
+calculations, this can exceed the available memory. Here, the YAML event stream is
+processed item by item instead: each entry of a registry (``species``,
+``calculations``, ...) is composed, validated against the item type of the registry
+and discarded before the next entry is read. Hence, the memory needed is proportional
+to the largest single item rather than to the whole dataset.
+
+The error locations are the same as for ``Schema.model_validate``, e.g.,
+``("calculations", "calc-0001", "qm-irc", "software", "version")``.
+
+.. note::
+
+    YAML anchors and aliases may be used across items. Anchored nodes are kept in
+    memory until the end of the file.
+"""
+
+from __future__ import annotations
+
+from functools import cache
+from pathlib import Path
+from typing import Any, Iterator, get_args
+
+import yaml
+from pydantic import TypeAdapter, ValidationError
+from pydantic_core import ErrorDetails
+from yaml.composer import Composer
+from yaml.constructor import SafeConstructor
+from yaml.events import Event, MappingEndEvent, MappingStartEvent
+from yaml.resolver import Resolver
+
+from .io import SafeLoader
+from .keys import RegistryKey
+from .registry import Registry
+from .schema import Schema
+
+
+class _EventLoader(Composer, SafeConstructor, Resolver):
+    """YAML loader that composes nodes from an iterator over parser events.
+
+    Allows composing and constructing parts of a document, e.g., single registry
+    items, while the events are produced by the (C-accelerated) parser.
+    """
+
+    def __init__(self, events: Iterator[Event]):
+        Composer.__init__(self)
+        SafeConstructor.__init__(self)
+        Resolver.__init__(self)
+        self._events = events
+        self._peeked: Event | None = None
+
+    # parser interface used by Composer
+    def peek_event(self) -> Event:
+        if self._peeked is None:
+            self._peeked = next(self._events)
+        return self._peeked
+
+    def check_event(self, *choices: type[Event]) -> bool:
+        event = self.peek_event()
+        return not choices or isinstance(event, choices)
+
+    def get_event(self) -> Event:
+        event = self.peek_event()
+        self._peeked = None
+        return event
+
+    def load_value(self) -> Any:
+        """compose and construct the next node"""
+        node = self.compose_node(None, None)
+        return self.construct_document(node)
+
+
+@cache
+def _registry_fields() -> dict[str, TypeAdapter]:
+    """item type adapters of all registries in the root schema by field name"""
+    adapters = {}
+    for name, field in Schema.model_fields.items():
+        if isinstance(field.annotation, type) and issubclass(
+            field.annotation, Registry
+        ):
+            root_type = field.annotation.model_fields["root"].annotation
+            _, item_type = get_args(root_type)
+            adapters[name] = TypeAdapter(item_type)
+    return adapters
+
+
+_KEY_ADAPTER = TypeAdapter(RegistryKey)
+
+
+def _prefixed(
+    err: ValidationError, prefix: tuple[str | int, ...]
+) -> Iterator[ErrorDetails]:
+    for details in err.errors():
+        details["loc"] = prefix + tuple(details["loc"])
+        yield details
+
+
+def _iter_registry_errors(
+    loader: _EventLoader, name: str, adapter: TypeAdapter, context: dict[str, Any]
+) -> Iterator[ErrorDetails]:
+    """validate the items of a registry one by one"""
+    loader.get_event()  # MappingStartEvent
+
+    while not loader.check_event(MappingEndEvent):
+        key = loader.load_value()
+        value = loader.load_value()
+
+        try:
+            _KEY_ADAPTER.validate_python(key)
+        except ValidationError as err:
+            yield from _prefixed(err, (name, key, "[key]"))
+
+        try:
+            item = adapter.validate_python(value, context=context)
+        except ValidationError as err:
+            yield from _prefixed(err, (name, key))
+            continue
+
+        # same check as Registry._sync_key_fields
+        if item.key is not None and item.key != key:
+            msg = f"key mismatch: mapping key '{key}' != item.key '{item.key}'"
+            yield ErrorDetails(
+                type="value_error",
+                loc=(name,),
+                msg=f"Value error, {msg}",
+                input=value,
+            )
+
+    loader.get_event()  # MappingEndEvent
+
+
+def iter_errors(path: str | Path) -> Iterator[ErrorDetails]:
+    """Validate a YAML RMMD file item by item and yield all validation errors.
+
+    :param path: path to the RMMD file (YAML)
+    """
+    registries = _registry_fields()
+    context = {"base_path": Path(path).parent}
+
+    with open(path, "rb") as f:
+        loader = _EventLoader(yaml.parse(f, Loader=SafeLoader))
+        loader.get_event()  # StreamStartEvent
+
+        if loader.check_event(yaml.StreamEndEvent):  # empty file
+            document: Any = None
+        else:
+            loader.get_event()  # DocumentStartEvent
+
+            if not loader.check_event(MappingStartEvent):
+                # not a mapping -> let the schema report the error
+                document = loader.load_value()
+            else:
+                loader.get_event()
+                # everything except registries, e.g., metadata
+                document = {}
+                while not loader.check_event(MappingEndEvent):
+                    key = loader.load_value()
+                    if key in registries and loader.check_event(MappingStartEvent):
+                        yield from _iter_registry_errors(
+                            loader, key, registries[key], context
+                        )
+                    else:
+                        document[key] = loader.load_value()
+
+    try:
+        Schema.model_validate(document, context=context)
+    except ValidationError as err:
+        yield from err.errors()
+
+
+def format_error(error: ErrorDetails) -> str:
+    """format an error as "<location>: <message>", e.g., "species.CH4.entities: ..." """
+    loc = ""
+    for entry in error["loc"]:
+        loc += f"[{entry}]" if isinstance(entry, int) else f".{entry}"
+    return f"{loc.removeprefix('.')}: {error['msg']}"
@@ -8,6 +8,7 @@ from annotated_types import MaxLen, MinLen
 from pydantic import Discriminator, Tag, model_validator
 
 from ._base import RmmdBaseModel
+from .arrays import ExternalArray, ExternalArray2D
 from .calc import CalculationBase, CalculationInputBase, CalculationOutputBase
 from .keys import CalcIndex, CitationKey, ConformationIndex, SpeciesName, ThermoIndex
 from .registry import HasKeyMixin
@@ -223,7 +224,7 @@ def _fitted_to_discriminator(value: dict | RmmdBaseModel) -> str | None:
 
 _FittedToUnion = Annotated[
     Annotated[FittedToLiterature, Tag("literature")]
-    | Annotated[FittedToThermoData, Tag("thermo")]
+    | Annotated[FittedToThermoData, Tag("thermo data")]
     | Annotated[FittedToOtherCalculation, Tag("calculation output")],
     Discriminator(_fitted_to_discriminator),
 ]
@@ -270,18 +271,18 @@ class _ThermoTableBase(_ThermoPropertyBase):
     p: Annotated[list[float], MinLen(1)]
     """Pressure points in Pa"""
 
-    H: list[list[float]] | None = None
+    H: list[list[float]] | ExternalArray2D | None = None
     """enthalpy in J/mol
 
     n x m array of enthalpies, where n is the number of
     pressure points and m is the number of temperature points.
     """
-    S: list[list[float]] | None = None
+    S: list[list[float]] | ExternalArray2D | None = None
     """entropy in J/(mol K)
 
     n x m array of entropies, where n is the number of
     pressure points and m is the number of temperature points."""
-    G: list[list[float]] | None = None
+    G: list[list[float]] | ExternalArray2D | None = None
     """Gibbs free energy in J/mol
 
     n x m array of Gibbs free energies, where n is the number of
@@ -302,12 +303,15 @@ class _ThermoTableBase(_ThermoPropertyBase):
                         f"Number of rows in {prop_name} must be equal to the"
                         "number of pressure points"
                     )
-                for row in prop:
-                    if len(row) != n_T:
-                        raise ValueError(
-                            f"Number of columns in {prop_name} must be equal "
-                            "to the number of temperature points"
-                        )
+                if isinstance(prop, ExternalArray):
+                    n_columns = {prop.shape[1]}
+                else:
+                    n_columns = {len(row) for row in prop}
+                if n_columns - {n_T}:
+                    raise ValueError(
+                        f"Number of columns in {prop_name} must be equal "
+                        "to the number of temperature points"
+                    )
 
         return self
 
@@ -324,7 +328,7 @@ class ThermoTableNoRef(_ThermoTableBase):
 
     type: Literal["tabular thermo"] = "tabular thermo"
 
-    Cp: list[list[float]] | None = None
+    Cp: list[list[float]] | ExternalArray2D | None = None
     """heat capacity in J/(mol K)
 
     n x m array of isobaric heat capacities, where n is the number of
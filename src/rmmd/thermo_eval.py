@@ -0,0 +1,321 @@
+"""Batched evaluation of empirical thermochemistry models.
+
+A :class:`ThermoBank` packs the coefficients of all :data:`rmmd.thermo.EmpiricalThermo`
+models of a dataset into arrays grouped by model type, so that heat capacities,
+enthalpies, entropies and Gibbs free energies of all models can be evaluated at many
+temperatures at once::
+
+    bank = ThermoBank.from_schema(schema)
+    T = np.linspace(300, 2000, 100)
+    H = bank.h(T)  # (n_models, 100) array in J/mol
+    H_CH4 = H[bank.index["thermo-0001"]]
+
+Each property of each model type is a linear combination of temperature-dependent
+basis functions, e.g., ``Cp/R = a1 + a2 T + ... + a5 T^4`` for NASA7 polynomials.
+Hence, a property of all models of a type is a matrix product of the coefficients
+and the basis functions evaluated at all temperatures, one product per temperature
+range. The temperature ranges are selected with a single ``searchsorted`` of the
+range bounds of all models in the sorted temperatures.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Iterable, NamedTuple
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from .schema import Schema
+from .thermo import ConstantCp, Nasa7, Nasa9, ReferenceState, Shomate
+
+R = 8.314462618
+"""molar gas constant in J/(mol K)"""
+
+EvaluableThermo = Nasa7 | Nasa9 | Shomate | ConstantCp
+"""thermochemistry models that can be evaluated"""
+
+
+class ThermoProperties(NamedTuple):
+    """thermochemical properties of all models at all temperatures
+
+    Each property is an (n_models, n_temperatures) array.
+    """
+
+    cp: np.ndarray
+    """isobaric heat capacity in J/(mol K)"""
+    h: np.ndarray
+    """enthalpy in J/mol"""
+    s: np.ndarray
+    """entropy in J/(mol K)"""
+    g: np.ndarray
+    """Gibbs free energy in J/mol"""
+
+
+###############################################################################
+# basis functions
+###############################################################################
+
+_Bases = tuple[np.ndarray, np.ndarray, np.ndarray]
+"""basis functions for Cp, H and S; each of shape (n_coefficients, n_temperatures)"""
+
+
+def _nasa7_bases(T: np.ndarray) -> _Bases:
+    one, zero, lnT = np.ones_like(T), np.zeros_like(T), np.log(T)
+    cp = [one, T, T**2, T**3, T**4, zero, zero]
+    h = [T, T**2 / 2, T**3 / 3, T**4 / 4, T**5 / 5, one, zero]
+    s = [lnT, T, T**2 / 2, T**3 / 3, T**4 / 4, zero, one]
+    return R * np.array(cp), R * np.array(h), R * np.array(s)
+
+
+def _nasa9_bases(T: np.ndarray) -> _Bases:
+    one, zero, lnT = np.ones_like(T), np.zeros_like(T), np.log(T)
+    cp = [T**-2, 1 / T, one, T, T**2, T**3, T**4, zero, zero]
+    h = [-1 / T, lnT, T, T**2 / 2, T**3 / 3, T**4 / 4, T**5 / 5, one, zero]
+    s = [-(T**-2) / 2, -1 / T, lnT, T, T**2 / 2, T**3 / 3, T**4 / 4, zero, one]
+    return R * np.array(cp), R * np.array(h), R * np.array(s)
+
+
+def _shomate_bases(T: np.ndarray) -> _Bases:
+    # NIST form with t = T/1000 and H in kJ/mol
+    t = T / 1000
+    one, zero = np.ones_like(t), np.zeros_like(t)
+    cp = [one, t, t**2, t**3, t**-2, zero, zero]
+    h = [t, t**2 / 2, t**3 / 3, t**4 / 4, -1 / t, one, zero]
+    s = [np.log(t), t, t**2 / 2, t**3 / 3, -(t**-2) / 2, zero, one]
+    return np.array(cp), 1000 * np.array(h), np.array(s)
+
+
+def _constant_cp_bases(T: np.ndarray) -> _Bases:
+    # coefficients: [H0 - Cp T0, S0 - Cp ln(T0), Cp]
+    one, zero = np.ones_like(T), np.zeros_like(T)
+    return (
+        np.array([zero, zero, one]),
+        np.array([one, zero, T]),
+        np.array([zero, one, np.log(T)]),
+    )
+
+
+_BASES: dict[str, Callable[[np.ndarray], _Bases]] = {
+    "NASA7": _nasa7_bases,
+    "NASA9": _nasa9_bases,
+    "Shomate": _shomate_bases,
+    "constant-cp": _constant_cp_bases,
+}
+
+
+###############################################################################
+# thermo bank
+###############################################################################
+
+
+@dataclass
+class _ModelGroup:
+    """coefficients of all models of one type, padded to the same number of ranges"""
+
+    bases: Callable[[np.ndarray], _Bases]
+    rows: np.ndarray
+    """(n,) rows of the models in the output arrays"""
+    T_upper: np.ndarray
+    """(n, n_ranges) upper temperature bounds of the ranges, padded with the last"""
+    T_min: np.ndarray
+    """(n,) lowest temperature of the first range"""
+    n_ranges: np.ndarray
+    """(n,) number of temperature ranges of each model"""
+    coefficients: np.ndarray
+    """(n, n_ranges, n_coefficients) coefficients, padded with NaN"""
+
+
+def _ranges_and_coefficients(
+    model: EvaluableThermo, T_ref: float
+) -> tuple[list[tuple[float, float]], list[list[float]]]:
+    if isinstance(model, ConstantCp):
+        coefficients = [
+            model.H0 - model.Cp * T_ref,
+            model.S0 - model.Cp * np.log(T_ref),
+            model.Cp,
+        ]
+        return [model.T_range], [coefficients]
+
+    # ranges may be given in any order
+    ranges = sorted(zip(model.T_ranges, model.coefficients))
+    return [r for r, _ in ranges], [c for _, c in ranges]
+
+
+def _pack(
+    models: list[EvaluableThermo], rows: list[int], T_refs: list[float]
+) -> _ModelGroup:
+    packed = [_ranges_and_coefficients(m, T) for m, T in zip(models, T_refs)]
+    n_ranges = max(len(ranges) for ranges, _ in packed)
+    n_coeffs = len(packed[0][1][0])
+
+    T_upper = np.empty((len(models), n_ranges))
+    T_min = np.empty(len(models))
+    n_ranges_per_model = np.array([len(ranges) for ranges, _ in packed])
+    coefficients = np.full((len(models), n_ranges, n_coeffs), np.nan)
+    for i, (ranges, coeffs) in enumerate(packed):
+        T_min[i] = ranges[0][0]
+        T_upper[i, : len(ranges)] = [T_hi for _, T_hi in ranges]
+        T_upper[i, len(ranges) :] = ranges[-1][1]
+        coefficients[i, : len(ranges)] = coeffs
+
+    return _ModelGroup(
+        bases=_BASES[models[0].type],
+        rows=np.asarray(rows),
+        T_upper=T_upper,
+        T_min=T_min,
+        n_ranges=n_ranges_per_model,
+        coefficients=coefficients,
+    )
+
+
+class ThermoBank:
+    """Empirical thermochemistry models packed into arrays for batched evaluation.
+
+    The rows of all results follow the order of :attr:`keys`.
+    """
+
+    def __init__(
+        self,
+        models: dict[str, EvaluableThermo],
+        reference_states: dict[str, ReferenceState],
+    ):
+        """
+        :param models: models by their key in the thermo registry
+        :param reference_states: (resolved) reference state of each model. The
+            reference temperature is used by :class:`~rmmd.thermo.ConstantCp`.
+        """
+        self.keys: list[str] = list(models)
+        """keys of the models in the thermo registry, in the order of the rows"""
+        self.index: dict[str, int] = {key: i for i, key in enumerate(self.keys)}
+        """row of each model by its key"""
+        self.reference_states: list[ReferenceState] = [
+            reference_states[key] for key in self.keys
+        ]
+        """reference state of each model"""
+
+        by_type: dict[str, list[str]] = {}
+        for key, model in models.items():
+            by_type.setdefault(model.type, []).append(key)
+
+        self._groups = [
+            _pack(
+                [models[key] for key in keys],
+                [self.index[key] for key in keys],
+                [reference_states[key].T for key in keys],
+            )
+            for keys in by_type.values()
+        ]
+
+    @classmethod
+    def from_schema(cls, schema: Schema, keys: Iterable[str] | None = None):
+        """Collect thermochemistry models from ``schema.thermo``.
+
+        :param schema: dataset containing the models
+        :param keys: keys of the models to include. By default, all NASA7, NASA9,
+            Shomate and constant-Cp models are included, other items are skipped.
+        :raises TypeError: if one of the *keys* refers to a model that cannot be
+            evaluated, e.g., tabular data
+        """
+        if keys is None:
+            keys = [
+                key
+                for key, item in schema.thermo.items()
+                if isinstance(item, EvaluableThermo)
+            ]
+
+        models = {}
+        reference_states = {}
+        for key in keys:
+            model = schema.thermo[key]
+            if not isinstance(model, EvaluableThermo):
+                raise TypeError(
+                    f"Thermo item '{key}' of type '{model.type}' cannot be evaluated."
+                )
+            models[key] = model
+            if model.reference_state == "dataset default":
+                reference_states[key] = schema.default_reference_state
+            else:
+                reference_states[key] = model.reference_state
+
+        return cls(models, reference_states)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def evaluate(self, T: ArrayLike, extrapolate: bool = False) -> ThermoProperties:
+        """Evaluate Cp, H, S and G of all models at the temperatures *T*.
+
+        :param T: temperatures in K, scalar or 1D array
+        :param extrapolate: use the closest temperature range outside of the valid
+            range of a model. Otherwise, the results are NaN there.
+        :return: properties as (n_models, n_temperatures) arrays
+        """
+        T = np.atleast_1d(np.asarray(T, dtype=np.float64))
+        if T.ndim != 1:
+            raise ValueError("T must be a scalar or a 1D array")
+
+        # range selection on sorted temperatures: the temperatures of each range
+        # are a contiguous block of columns
+        order = np.argsort(T, kind="stable")
+        T_sorted = T[order]
+        columns = np.arange(T.size)
+
+        shape = (len(self.keys), T.size)
+        cp, h, s = (np.full(shape, np.nan) for _ in range(3))
+
+        for group in self._groups:
+            bases = group.bases(T_sorted)
+            n, n_ranges = group.T_upper.shape
+            last = group.n_ranges - 1
+
+            # columns [start, end) of each range
+            end = np.searchsorted(T_sorted, group.T_upper.ravel(), side="right")
+            end = end.reshape(n, n_ranges)
+            start = np.zeros_like(end)
+            start[:, 1:] = end[:, :-1]
+            if extrapolate:
+                end[np.arange(n), last] = T.size
+            else:
+                start[:, 0] = np.searchsorted(T_sorted, group.T_min, side="left")
+
+            if np.array_equal(group.rows, np.arange(group.rows[0], group.rows[0] + n)):
+                # write directly into the output (no copy)
+                rows = slice(group.rows[0], group.rows[0] + n)
+                results = [cp[rows], h[rows], s[rows]]
+            else:
+                rows = group.rows
+                results = [np.full((n, T.size), np.nan) for _ in range(3)]
+            for r in range(n_ranges):
+                in_range = (columns >= start[:, r, None]) & (columns < end[:, r, None])
+                if not in_range.any():
+                    continue
+                coefficients = group.coefficients[:, r, :]
+                for result, basis in zip(results, bases):
+                    np.copyto(result, coefficients @ basis, where=in_range)
+
+            if not isinstance(rows, slice):
+                cp[rows], h[rows], s[rows] = results
+
+        if np.any(order != columns):
+            # restore the original order of the temperatures
+            inverse = np.empty_like(order)
+            inverse[order] = columns
+            cp, h, s = cp[:, inverse], h[:, inverse], s[:, inverse]
+        return ThermoProperties(cp, h, s, h - T * s)
+
+    def cp(self, T: ArrayLike, extrapolate: bool = False) -> np.ndarray:
+        """isobaric heat capacities in J/(mol K) as (n_models, n_temperatures) array"""
+        return self.evaluate(T, extrapolate).cp
+
+    def h(self, T: ArrayLike, extrapolate: bool = False) -> np.ndarray:
+        """enthalpies in J/mol as (n_models, n_temperatures) array"""
+        return self.evaluate(T, extrapolate).h
+
+    def s(self, T: ArrayLike, extrapolate: bool = False) -> np.ndarray:
+        """entropies in J/(mol K) as (n_models, n_temperatures) array"""
+        return self.evaluate(T, extrapolate).s
+
+    def g(self, T: ArrayLike, extrapolate: bool = False) -> np.ndarray:
+        """Gibbs free energies in J/mol as (n_models, n_temperatures) array"""
+        return self.evaluate(T, extrapolate).g
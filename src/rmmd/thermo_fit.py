@@ -0,0 +1,322 @@
+"""Batched fitting of NASA polynomials to tabular thermochemistry data.
+
+Two-range NASA7 or NASA9 polynomials are fitted to the Cp, H and S values of many
+thermo tables at once, and added to a dataset together with their provenance::
+
+    added = add_nasa_fits(schema, type_="NASA7", T_mid=1000.0, jobs=8)
+    for table_key, (thermo_key, calc_key) in added.items():
+        ...  # schema.thermo[thermo_key] was fitted to schema.thermo[table_key]
+
+Each fit is a linear least-squares problem in the coefficients of both temperature
+ranges, with the residuals ``Cp/R``, ``H/(RT)`` and ``S/R`` at each temperature of the
+table, subject to the continuity of Cp, H and S at the breakpoint ``T_mid``. The
+constraints are homogeneous, so the solution lies in the null space of the constraint
+matrix. Thus, the fits of a batch of tables are solved at once with stacked SVDs of
+numpy, with the tables padded to the same number of temperatures by rows of zeros.
+Batches are distributed over a process pool.
+
+Only the values at the first pressure of a table are used. Missing H or S values are
+computed from G if possible. If a table contains neither H nor S (nor G), the
+corresponding integration constant of the lower range (a6 or a7 of NASA7) is zero.
+Tables whose data do not determine all other coefficients, e.g., with fewer
+temperatures than coefficients, are rejected.
+
+Tables without reference state (:class:`~rmmd.thermo.ThermoTableNoRef`) may hold
+relative data, e.g., reaction enthalpies, which cannot be expressed by a NASA
+polynomial with a reference state. Thus, only their Cp is fitted, i.e., both
+integration constants of the lower range are zero, and the fits are not assigned to
+species.
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Literal, Mapping
+
+import numpy as np
+
+from .cache import _rmmd_version
+from .calc import Software
+from .keys import CalcIndex, ThermoIndex
+from .schema import Schema
+from .thermo import (
+    FittedToThermoData,
+    Nasa7,
+    Nasa9,
+    TabularThermo,
+    ThermoParameterFitting,
+    ThermoParameterFittingInput,
+    ThermoParameterFittingOutput,
+    ThermoTable,
+    ThermoTableNoRef,
+)
+from .thermo_eval import _BASES, R
+
+NasaType = Literal["NASA7", "NASA9"]
+
+_N_COEFFICIENTS = {"NASA7": 7, "NASA9": 9}
+
+DEFAULT_BATCH_SIZE = 256
+"""number of tables fitted in one batched solve"""
+
+_RCOND = 1e-12
+"""relative cutoff of the singular values of the least-squares problems"""
+
+
+###############################################################################
+# data
+###############################################################################
+
+
+def _table_data(table: TabularThermo) -> tuple[np.ndarray, np.ndarray]:
+    """sorted temperatures and (3, n_T) Cp, H, S at the first pressure, NaN if
+    missing"""
+    T = np.asarray(table.T, dtype=np.float64)
+    values = {}
+    for name in ("Cp", "H", "S", "G"):
+        prop = getattr(table, name, None)
+        if prop is not None:
+            values[name] = np.asarray(prop, dtype=np.float64)[0]
+
+    if "G" in values:
+        if "H" not in values and "S" in values:
+            values["H"] = values["G"] + T * values["S"]
+        elif "S" not in values and "H" in values:
+            values["S"] = (values["H"] - values["G"]) / T
+
+    missing = np.full_like(T, np.nan)
+    data = np.array([values.get(name, missing) for name in ("Cp", "H", "S")])
+    order = np.argsort(T)
+    return T[order], data[:, order]
+
+
+###############################################################################
+# batched least squares
+###############################################################################
+
+
+def _residual_bases(type_: NasaType, T: np.ndarray) -> np.ndarray:
+    """(3, n_coefficients, *T.shape) bases of Cp/R, H/(RT) and S/R"""
+    cp, h, s = _BASES[type_](T.ravel())
+    bases = np.array([cp / R, h / (R * T.ravel()), s / R])
+    return bases.reshape(bases.shape[:2] + T.shape)
+
+
+def fit_batch(
+    type_: NasaType, T: np.ndarray, data: np.ndarray, T_mid: np.ndarray
+) -> np.ndarray:
+    """Fit two-range NASA polynomials to many tables at once.
+
+    :param type_: "NASA7" or "NASA9"
+    :param T: (n, m) temperatures of each table, padded with any finite value
+    :param data: (n, 3, m) Cp in J/(mol K), H in J/mol and S in J/(mol K) at the
+        temperatures, NaN if missing or padded
+    :param T_mid: (n,) breakpoint between the ranges of each table
+    :return: (n, 2, n_coefficients) coefficients of the lower and upper range, NaN
+        for tables whose data do not determine all coefficients, e.g., fewer
+        temperatures than coefficients
+    """
+    n, m = T.shape
+    k = _N_COEFFICIENTS[type_]
+
+    # design matrix: one row per temperature and property, one column per
+    # coefficient of the lower and upper range
+    bases = np.moveaxis(_residual_bases(type_, T), 1, -1)  # (3, n, m, k)
+    low = (T <= T_mid[:, None])[None, :, :, None]
+    A = np.concatenate([bases * low, bases * ~low], axis=-1)  # (3, n, m, 2k)
+    A = np.moveaxis(A, 0, 1).reshape(n, 3 * m, 2 * k)
+    b = data / np.stack([np.full_like(T, R), R * T, np.full_like(T, R)], axis=1)
+    b = b.reshape(n, 3 * m)
+    missing = np.isnan(b)
+    A[missing] = 0.0
+    b[missing] = 0.0
+
+    # continuity of Cp, H and S at T_mid: [basis, -basis] x = 0
+    at_mid = _residual_bases(type_, T_mid[:, None])[..., 0].transpose(2, 0, 1)
+    C = np.concatenate([at_mid, -at_mid], axis=-1)  # (n, 3, 2k)
+
+    # scale the columns, otherwise T^4 terms dominate the conditioning
+    scale = np.linalg.norm(A, axis=1)
+    scale[scale == 0] = 1.0
+    A /= scale[:, None, :]
+    C /= scale[:, None, :]
+
+    # x = N z with the null space N of C, then min |A N z - b| with the
+    # pseudo-inverse of A N from its SVD, whose singular values give the rank
+    null_space = np.linalg.svd(C)[2][:, C.shape[1] :, :].transpose(0, 2, 1)
+    U, sigma, Vt = np.linalg.svd(A @ null_space, full_matrices=False)
+    nonzero = sigma > _RCOND * sigma[:, :1]
+    inverse = np.divide(1.0, sigma, out=np.zeros_like(sigma), where=nonzero)
+    z = Vt.transpose(0, 2, 1) @ (
+        inverse[..., None] * (U.transpose(0, 2, 1) @ b[..., None])
+    )
+    x = ((null_space @ z)[..., 0] / scale).reshape(n, 2, k)
+
+    # without H (S) data, only the difference of the integration constants of both
+    # ranges is determined by the continuity -> constant of the lower range is zero
+    no_data = np.all(np.isnan(data[:, 1:]), axis=2)  # (n, 2): H, S
+    x[:, :, k - 2 :] -= np.where(no_data, x[:, 0, k - 2 :], 0.0)[:, None, :]
+
+    underdetermined = nonzero.sum(axis=1) < null_space.shape[2] - no_data.sum(axis=1)
+    x[underdetermined] = np.nan
+    return x
+
+
+def _fit_tables(
+    type_: NasaType, tables: list[tuple[np.ndarray, np.ndarray, float]]
+) -> np.ndarray:
+    """pad the tables of a batch and fit them with :func:`fit_batch`"""
+    m = max(T.size for T, _, _ in tables)
+    T = np.empty((len(tables), m))
+    data = np.full((len(tables), 3, m), np.nan)
+    for i, (T_i, data_i, _) in enumerate(tables):
+        T[i, : T_i.size], T[i, T_i.size :] = T_i, T_i[-1]
+        data[i, :, : T_i.size] = data_i
+    T_mid = np.array([T_mid for _, _, T_mid in tables])
+    return fit_batch(type_, T, data, T_mid)
+
+
+def fit_nasa(
+    tables: Mapping[str, TabularThermo],
+    type_: NasaType = "NASA7",
+    T_mid: float = 1000.0,
+    *,
+    jobs: int | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> dict[str, Nasa7 | Nasa9]:
+    """Fit two-range NASA polynomials to thermo tables.
+
+    :param tables: thermo tables by their key
+    :param type_: "NASA7" or "NASA9"
+    :param T_mid: breakpoint between the two temperature ranges in K. For tables
+        without temperatures on both sides of *T_mid*, the median temperature is used.
+    :param jobs: number of worker processes, one per CPU core by default
+    :param batch_size: number of tables fitted in one batched solve
+    :return: fitted polynomials by the key of their table. Polynomials fitted to
+        absolute tables have the same reference state as the table.
+        Only the Cp of tables without reference state is fitted.
+    :raises ValueError: if the data of a table do not determine the coefficients
+    """
+    prepared = []
+    for table in tables.values():
+        T, data = _table_data(table)
+        if isinstance(table, ThermoTableNoRef):
+            data[1:] = np.nan  # relative H and S
+        mid = T_mid if T[0] < T_mid < T[-1] else float(np.median(T))
+        prepared.append((T, data, mid))
+
+    batches = [
+        prepared[i : i + batch_size] for i in range(0, len(prepared), batch_size)
+    ]
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(batches) <= 1:
+        coefficients = [_fit_tables(type_, batch) for batch in batches]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            coefficients = list(pool.map(_fit_tables, [type_] * len(batches), batches))
+
+    model_type = Nasa7 if type_ == "NASA7" else Nasa9
+    models: dict[str, Nasa7 | Nasa9] = {}
+    all_coefficients = (c for batch in coefficients for c in batch)
+    for (key, table), (T, _, mid), coeffs in zip(
+        tables.items(), prepared, all_coefficients
+    ):
+        if np.isnan(coeffs).any():
+            raise ValueError(
+                f"The data of thermo table '{key}' do not determine the "
+                f"{coeffs.size} coefficients of a two-range {type_} polynomial, e.g., "
+                f"it has too few temperatures ({T.size})."
+            )
+        models[key] = model_type(
+            T_ranges=[(float(T[0]), mid), (mid, float(T[-1]))],
+            coefficients=coeffs.tolist(),
+            reference_state=(
+                table.reference_state
+                if isinstance(table, ThermoTable)
+                else "dataset default"
+            ),
+        )
+    return models
+
+
+###############################################################################
+# fits with provenance
+###############################################################################
+
+
+def add_nasa_fits(
+    schema: Schema,
+    keys: Iterable[ThermoIndex] | None = None,
+    type_: NasaType = "NASA7",
+    T_mid: float = 1000.0,
+    *,
+    software: Software | None = None,
+    jobs: int | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> dict[ThermoIndex, tuple[ThermoIndex, CalcIndex]]:
+    """Fit NASA polynomials to thermo tables of *schema* and add them to it.
+
+    For each table, the polynomial is added to ``schema.thermo`` and a
+    :class:`~rmmd.thermo.ThermoParameterFitting` with the table as input and the
+    polynomial as output is added to ``schema.calculations``. Species listing an
+    absolute table in their ``thermo`` also get the polynomial.
+
+    :param schema: dataset containing the tables
+    :param keys: keys of the tables, by default all tabular thermo items. Only the
+        Cp of tables without reference state is fitted, see :func:`fit_nasa`.
+    :param type_: "NASA7" or "NASA9"
+    :param T_mid: breakpoint between the two temperature ranges in K
+    :param software: software recorded for the fits, by default rmmd
+    :param jobs: number of worker processes, one per CPU core by default
+    :param batch_size: number of tables fitted in one batched solve
+    :return: key of the polynomial and of the fitting calculation by table key
+    :raises TypeError: if one of the *keys* does not refer to a thermo table
+    :raises ValueError: see :func:`fit_nasa`
+    """
+    if keys is None:
+        keys = [
+            key
+            for key, item in schema.thermo.items()
+            if isinstance(item, TabularThermo)
+        ]
+    tables = {}
+    for key in keys:
+        table = schema.thermo[key]
+        if not isinstance(table, TabularThermo):
+            raise TypeError(f"Thermo item '{key}' of type '{table.type}' is no table.")
+        tables[key] = table
+
+    models = fit_nasa(tables, type_, T_mid, jobs=jobs, batch_size=batch_size)
+    model_keys = schema.thermo.add_many(models.values())
+
+    software = software or Software(name="rmmd", version=_rmmd_version())
+    fittings = [
+        ThermoParameterFitting(
+            software=software,
+            description=f"least-squares fit of a two-range {type_} polynomial"
+            + (
+                " to Cp only" if isinstance(tables[table_key], ThermoTableNoRef) else ""
+            ),
+            input=ThermoParameterFittingInput(
+                fitted_to=FittedToThermoData(thermo=[table_key])
+            ),
+            output=ThermoParameterFittingOutput(thermo=model_key),
+        )
+        for table_key, model_key in zip(models, model_keys)
+    ]
+    calc_keys = schema.calculations.add_many(fittings)
+    added = dict(zip(models, zip(model_keys, calc_keys)))
+
+    absolute = {
+        key: thermo_key
+        for key, (thermo_key, _) in added.items()
+        if isinstance(tables[key], ThermoTable)
+    }
+    for name, species in list(schema.species.items()):
+        fitted = [absolute[key] for key in species.thermo if key in absolute]
+        if fitted:
+            schema.species[name] = species.model_copy(
+                update={"thermo": species.thermo + fitted}
+            )
+    return added
@@ -0,0 +1,171 @@
+"""Tests for arrays stored in binary sidecar files (rmmd.arrays)."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+from click.testing import CliRunner
+from pydantic import ValidationError
+
+from rmmd import io
+from rmmd.arrays import ExternalArray, externalize_arrays, inline_arrays
+from rmmd.cli import rmmd
+from rmmd.kinetics import RateTable
+from rmmd.pes import Geometries, Geometry, QmFreqCalc
+
+_EXAMPLES_DIR = Path(__file__).parent.parent.parent.resolve() / "examples"
+
+_FREQ_CALC = {"type": "qm-frequency", "software": {"name": "ORCA", "version": "6"}}
+
+
+def _freq_calc(hessian, base_path: Path) -> QmFreqCalc:
+    return QmFreqCalc.model_validate(
+        _FREQ_CALC | {"output": {"hessian": hessian}},
+        context={"base_path": base_path},
+    )
+
+
+def test_npy_is_validated_from_header_and_memory_mapped(tmp_path):
+    hessian = np.arange(9.0).reshape(3, 3)
+    (tmp_path / "arrays").mkdir()
+    np.save(tmp_path / "arrays" / "h.npy", hessian)
+
+    calc = _freq_calc("./arrays/h.npy", tmp_path)
+    array = calc.output.hessian
+    assert isinstance(array, ExternalArray)
+    assert array.shape == (3, 3)
+    assert isinstance(array.load(), np.memmap)
+    np.testing.assert_array_equal(np.asarray(array), hessian)
+    assert calc.model_dump(mode="json")["output"]["hessian"] == "./arrays/h.npy"
+
+
+def test_npz_member(tmp_path):
+    np.savez(tmp_path / "data.npz", hessian=np.eye(3), other=np.zeros(2))
+    calc = _freq_calc("./data.npz#hessian", tmp_path)
+    np.testing.assert_array_equal(np.asarray(calc.output.hessian), np.eye(3))
+
+    with pytest.raises(ValidationError, match="does not contain an array 'missing'"):
+        _freq_calc("./data.npz#missing", tmp_path)
+
+
+@pytest.mark.parametrize(
+    "array, msg",
+    [
+        (np.zeros(3), "must have 2 dimension"),
+        (np.zeros((3, 3), dtype=int), "must contain floats"),
+    ],
+)
+def test_header_is_checked(tmp_path, array, msg):
+    np.save(tmp_path / "h.npy", array)
+    with pytest.raises(ValidationError, match=msg):
+        _freq_calc("./h.npy", tmp_path)
+
+
+@pytest.mark.parametrize("ref", ["./missing.npy", "./h.txt", "h.npy"])
+def test_invalid_references(tmp_path, ref):
+    with pytest.raises(ValidationError):
+        _freq_calc(ref, tmp_path)
+
+
+def test_shape_checks_of_models(tmp_path):
+    np.save(tmp_path / "coords.npy", np.zeros((4, 2, 3)))
+    geometries = Geometries.model_validate(
+        {"atoms": ["H", "H"], "coordinates": "./coords.npy"},
+        context={"base_path": tmp_path},
+    )
+    assert len(geometries.coordinates) == 4
+
+    with pytest.raises(ValidationError, match="Number of atoms and coordinates"):
+        Geometries.model_validate(
+            {"atoms": ["H"], "coordinates": "./coords.npy"},
+            context={"base_path": tmp_path},
+        )
+
+    np.save(tmp_path / "k.npy", np.ones((2, 3)))
+    table = RateTable.model_validate(
+        {"T": [300, 400, 500], "p": [1e5, 1e6], "k": "./k.npy"},
+        context={"base_path": tmp_path},
+    )
+    assert table.k.shape == (2, 3)
+
+
+def test_externalize_and_inline(tmp_path):
+    schema = io.load(_EXAMPLES_DIR / "methanimine.yaml")
+    expected = io.load(_EXAMPLES_DIR / "methanimine.yaml")
+
+    assert externalize_arrays(schema, tmp_path, min_size=1) > 0
+    assert list((tmp_path / "arrays").glob("*.npy"))
+    io.dump(schema, tmp_path / "data.yaml")
+
+    loaded = io.load(tmp_path / "data.yaml")
+    assert loaded == schema
+    assert inline_arrays(loaded) > 0
+    assert loaded == expected
+
+
+def test_convert_cli(tmp_path):
+    runner = CliRunner()
+    source = tmp_path / "source" / "data.json"
+    target = tmp_path / "target" / "data.yaml"
+    source.parent.mkdir()
+
+    args = ["convert", str(_EXAMPLES_DIR / "methanimine.yaml"), str(source)]
+    result = runner.invoke(rmmd, args + ["--externalize-arrays", "1"])
+    assert result.exit_code == 0, result.output
+    assert (source.parent / "arrays").is_dir()
+
+    # arrays are inlined when the RMMD file is written to another directory
+    result = runner.invoke(rmmd, ["convert", str(source), str(target)])
+    assert result.exit_code == 0, result.output
+    assert io.load(target) == io.load(_EXAMPLES_DIR / "methanimine.yaml")
+
+
+##############################################################################
+# in-memory arrays
+##############################################################################
+
+
+def test_geometries_are_float64_arrays():
+    coordinates = [[[0, 0, 0], [0, 0, 0.74]], [[0, 0, 0], [0, 0, "0.8"]]]
+    geometries = Geometries(atoms=["H", "H"], coordinates=coordinates)
+    assert geometries.coordinates.dtype == np.float64
+    assert geometries.coordinates.shape == (2, 2, 3)
+    assert geometries.coordinates.flags.c_contiguous
+
+    dumped = geometries.model_dump(mode="json")["coordinates"]
+    assert dumped == [[[0.0, 0.0, 0.0], [0.0, 0.0, 0.74]], [[0.0] * 3, [0.0, 0.0, 0.8]]]
+    assert Geometries.model_validate_json(geometries.model_dump_json()) == geometries
+
+
+def test_geometry_from_array():
+    geometry = Geometry(atoms=["H"], coordinates=np.zeros((1, 3), dtype=np.float32))
+    assert geometry.coordinates.dtype == np.float64
+    assert geometry == Geometry(atoms=["H"], coordinates=[[0.0, 0.0, 0.0]])
+    assert geometry != Geometry(atoms=["H"], coordinates=[[0.0, 0.0, 1.0]])
+
+    with pytest.raises(ValidationError, match="3 cartesian coordinates"):
+        Geometry(atoms=["H"], coordinates=np.zeros((1, 2)))
+
+
+def test_invalid_elements_are_reported_per_element():
+    with pytest.raises(ValidationError) as err:
+        Geometry(atoms=["H"], coordinates=[[0.0, "x", 0.0]])
+    assert err.value.errors()[0]["loc"] == ("coordinates", 0, 1)
+
+
+@pytest.mark.parametrize("value", [None, True, False, float("nan"), "x"])
+def test_invalid_coordinates_are_rejected(value):
+    with pytest.raises(ValidationError) as err:
+        Geometry(atoms=["H"], coordinates=[[0.0, value, 0.0]])
+    assert err.value.errors()[0]["loc"] == ("coordinates", 0, 1)
+
+    with pytest.raises(ValidationError):
+        Geometries(atoms=["H"], coordinates=[[[0.0, 0.0, 0.0]], [[0.0, value, 0.0]]])
+
+    with pytest.raises(ValidationError):
+        Geometry(atoms=["H"], coordinates=np.array([[0.0, value, 0.0]], dtype=object))
+
+
+def test_bool_arrays_are_rejected():
+    with pytest.raises(ValidationError):
+        Geometry(atoms=["H"], coordinates=np.zeros((1, 3), dtype=bool))
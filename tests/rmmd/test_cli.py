@@ -0,0 +1,143 @@
+"""Tests for the command-line interface (rmmd.cli)."""
+
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from rmmd import cli
+from rmmd.cli import rmmd
+
+_EXAMPLES_DIR = Path(__file__).parent.parent.parent.resolve() / "examples"
+
+_MINIMAL = "schema_version: 0.1.0b0\nmetadata:\n  license: MIT\n  title: test\n"
+
+
+@pytest.fixture
+def runner() -> CliRunner:
+    return CliRunner()
+
+
+##############################################################################
+# validate
+##############################################################################
+
+
+class TestValidate:
+    def test_single_valid_file(self, runner, tmp_path):
+        f = tmp_path / "valid.yaml"
+        f.write_text(_MINIMAL)
+        result = runner.invoke(rmmd, ["validate", str(f)])
+        assert result.exit_code == 0
+        assert "1 of 1 file(s) valid" in result.output
+
+    def test_invalid_file_sets_exit_code(self, runner, tmp_path):
+        valid = tmp_path / "valid.yaml"
+        valid.write_text(_MINIMAL)
+        invalid = tmp_path / "invalid.yaml"
+        invalid.write_text("schema_version: 0.1.0b0\n")
+        result = runner.invoke(rmmd, ["validate", str(valid), str(invalid)])
+        assert result.exit_code == 1
+        assert "1 of 2 file(s) valid, 1 failed" in result.output
+        assert "metadata" in result.output  # missing field is reported
+
+    def test_unreadable_yaml_is_reported(self, runner, tmp_path):
+        f = tmp_path / "broken.yaml"
+        f.write_text("species: [unclosed\n")
+        result = runner.invoke(rmmd, ["validate", str(f)])
+        assert result.exit_code == 1
+        assert "FAILED" in result.output
+
+    def test_directory_and_parallel_jobs(self, runner):
+        result = runner.invoke(rmmd, ["validate", "--jobs", "2", str(_EXAMPLES_DIR)])
+        assert result.exit_code == 0, result.output
+        n_examples = len(list(_EXAMPLES_DIR.glob("*.yaml")))
+        assert f"{n_examples} of {n_examples} file(s) valid" in result.output
+
+    def test_crashed_worker_is_reported(self, runner, monkeypatch):
+        # threads instead of processes, so that the patched function is used
+        monkeypatch.setattr(cli, "ProcessPoolExecutor", ThreadPoolExecutor)
+
+        def validate_file(path, *args):
+            if path.name == "minimal.yaml":
+                raise BrokenProcessPool("worker died")
+            return original(path, *args)
+
+        original = cli.validate_file
+        monkeypatch.setattr(cli, "validate_file", validate_file)
+        result = runner.invoke(rmmd, ["validate", "--jobs", "2", str(_EXAMPLES_DIR)])
+        assert result.exit_code == 1, result.output
+        assert "BrokenProcessPool: worker died" in result.output
+        n_examples = len(list(_EXAMPLES_DIR.glob("*.yaml")))
+        assert f"{n_examples - 1} of {n_examples} file(s) valid" in result.output
+
+    def test_glob_pattern(self, runner):
+        result = runner.invoke(rmmd, ["validate", str(_EXAMPLES_DIR / "m*.yaml")])
+        assert result.exit_code == 0, result.output
+        assert "minimal.yaml" in result.output
+        assert "methanimine.yaml" in result.output
+
+    def test_stream(self, runner, tmp_path):
+        invalid = tmp_path / "invalid.yaml"
+        invalid.write_text(_MINIMAL + "species:\n  a: {entities: []}\n")
+        args = ["validate", "--stream", str(_EXAMPLES_DIR), str(invalid)]
+        result = runner.invoke(rmmd, args)
+        assert result.exit_code == 1
+        assert "species.a.entities: List should have at least 1 item" in result.output
+
+    def test_check_refs(self, runner, tmp_path):
+        f = tmp_path / "dangling.yaml"
+        f.write_text(_MINIMAL + "species:\n  CH4:\n    entities: [methane]\n")
+        assert runner.invoke(rmmd, ["validate", str(f)]).exit_code == 0
+
+        result = runner.invoke(rmmd, ["validate", "--check-refs", str(f)])
+        assert result.exit_code == 1
+        assert (
+            "species.CH4.entities[0]: 'methane' not found in entities" in result.output
+        )
+
+    def test_check_balance(self, runner, tmp_path):
+        f = tmp_path / "unbalanced.yaml"
+        f.write_text(
+            (_EXAMPLES_DIR / "methanimine.yaml")
+            .read_text()
+            .replace("products: [CH2N, HOOH]", "products: [CH2N, HO2]")
+        )
+        assert runner.invoke(rmmd, ["validate", str(f)]).exit_code == 0
+
+        result = runner.invoke(rmmd, ["validate", "--check-balance", str(f)])
+        assert result.exit_code == 1
+        assert "reactions.reactions:0: H: -1 (products - reactants)" in result.output
+
+    def test_missing_path_is_usage_error(self, runner, tmp_path):
+        result = runner.invoke(rmmd, ["validate", str(tmp_path / "missing.yaml")])
+        assert result.exit_code == 2
+
+
+##############################################################################
+# convert
+##############################################################################
+
+
+class TestConvert:
+    def test_yaml_to_json_and_back(self, runner, tmp_path):
+        json_file = tmp_path / "methanimine.json.gz"
+        yaml_file = tmp_path / "methanimine.yaml"
+        result = runner.invoke(
+            rmmd, ["convert", str(_EXAMPLES_DIR / "methanimine.yaml"), str(json_file)]
+        )
+        assert result.exit_code == 0, result.output
+        result = runner.invoke(rmmd, ["convert", str(json_file), str(yaml_file)])
+        assert result.exit_code == 0, result.output
+
+        result = runner.invoke(rmmd, ["validate", str(json_file), str(yaml_file)])
+        assert result.exit_code == 0, result.output
+
+    def test_invalid_source(self, runner, tmp_path):
+        source = tmp_path / "invalid.yaml"
+        source.write_text("schema_version: 0.1.0b0\n")
+        result = runner.invoke(rmmd, ["convert", str(source), str(tmp_path / "x.json")])
+        assert result.exit_code == 1
+        assert not (tmp_path / "x.json").exists()
@@ -0,0 +1,91 @@
+"""Tests for the element and charge balance of reactions (rmmd.composition)."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from rmmd import io
+from rmmd.composition import (
+    Imbalance,
+    check_balance,
+    composition_matrix,
+    molecular_weights,
+)
+from rmmd.schema import Schema
+
+_EXAMPLES_DIR = Path(__file__).parent.parent.parent.resolve() / "examples"
+
+_INCHIS = {
+    "H": "InChI=1/H",
+    "H2": "InChI=1/H2/h1H",
+    "OH": "InChI=1/HO/h1H",
+    "H2O": "InChI=1/H2O/h1H2",
+    "H+": "InChI=1/p+1",
+    "OH-": "InChI=1/H2O/h1H2/p-1",
+    "D2O": "InChI=1/H2O/h1H2/i/hD2/f/i1D2",
+}
+
+
+@pytest.fixture
+def schema() -> Schema:
+    reactions = {
+        "ok": (["H2", "OH"], ["H2O", "H"]),
+        "twice": (["OH", "OH"], ["H2O", "O"]),  # O is unknown
+        "missing-h": (["H2", "OH"], ["H2O"]),
+        "charge": (["H2O"], ["OH-", "H"]),
+        "ions": (["H2O"], ["OH-", "H+"]),
+        "dangling": (["H2"], ["nonexistent"]),
+    }
+    return Schema.model_validate(
+        {
+            "metadata": {"license": "MIT", "title": "test"},
+            "entities": {
+                name: {
+                    "inchi_fixedh": {"value": inchi},
+                    "electronic_spin": "unkown-electronic-ground-state",
+                }
+                for name, inchi in _INCHIS.items()
+            },
+            "species": {name: {"entities": [name]} for name in _INCHIS}
+            | {"O": {"entities": ["unknown-entity"]}},
+            "reactions": {
+                key: {"reactants": reactants, "products": products}
+                for key, (reactants, products) in reactions.items()
+            },
+        }
+    )
+
+
+def test_composition_matrix(schema):
+    composition = composition_matrix(schema)
+    assert composition.elements == ("H", "O")
+    water = composition.keys.index("H2O")
+    assert composition.counts[water].tolist() == [2, 1]
+    assert composition.charges[composition.keys.index("H+")] == 1
+    assert composition.known.tolist() == [True] * len(_INCHIS) + [False]
+
+
+def test_molecular_weights(schema):
+    weights = molecular_weights(schema)
+    assert weights[list(schema.species).index("H2O")] == pytest.approx(18.015)
+    assert weights[list(schema.species).index("D2O")] == pytest.approx(
+        20.0272, abs=1e-4
+    )
+    assert np.isnan(weights[-1])  # unknown entity
+    assert molecular_weights(schema, "entities").tolist() == weights[:-1].tolist()
+
+
+def test_check_balance(schema):
+    assert check_balance(schema) == [
+        Imbalance("missing-h", {"H": -1}, 0),
+        Imbalance("charge", {}, -1),
+    ]
+    assert str(check_balance(schema)[0]) == (
+        "reactions.missing-h: H: -1 (products - reactants)"
+    )
+
+
+@pytest.mark.parametrize("example", sorted(_EXAMPLES_DIR.glob("*.yaml")))
+def test_examples_are_balanced(example):
+    assert check_balance(io.load(example)) == []
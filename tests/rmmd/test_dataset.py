@@ -0,0 +1,122 @@
+"""Tests for split-file datasets (rmmd.dataset)."""
+
+import copy
+import pickle
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+from pydantic import ValidationError
+
+from rmmd import io
+from rmmd.cli import rmmd
+from rmmd.dataset import LazySchema, dump_dataset, load_dataset
+from rmmd.schema import Schema
+
+_EXAMPLES_DIR = Path(__file__).parent.parent.parent.resolve() / "examples"
+
+_ROOT = "schema_version: 0.1.0b0\nmetadata: {license: MIT, title: test}\n"
+
+
+@pytest.fixture
+def methanimine() -> Schema:
+    return io.load(_EXAMPLES_DIR / "methanimine.yaml")
+
+
+@pytest.mark.parametrize("suffix", [".yaml", ".json", ".json.gz"])
+@pytest.mark.parametrize(
+    "example", sorted(_EXAMPLES_DIR.glob("*.yaml")), ids=lambda p: p.name
+)
+def test_round_trip(tmp_path, example, suffix):
+    schema = io.load(example)
+    dump_dataset(schema, tmp_path, suffix=suffix)
+    assert load_dataset(tmp_path) == schema
+    assert load_dataset(tmp_path, lazy=False) == schema
+
+
+def test_one_shard_per_registry(tmp_path, methanimine):
+    dump_dataset(methanimine, tmp_path)
+    files = {p.name for p in tmp_path.iterdir()}
+    assert {"rmmd.yaml", "species.yaml", "calculations.yaml"} <= files
+    assert "thermo.yaml" not in files  # empty
+
+
+def test_registries_are_loaded_on_access(tmp_path, methanimine):
+    dump_dataset(methanimine, tmp_path)
+    (tmp_path / "calculations.yaml").write_text("c1: {type: foo}\n")
+
+    schema = io.load(tmp_path)
+    assert isinstance(schema, LazySchema)
+    assert "species" not in schema.loaded_registries
+    assert schema.metadata.title == methanimine.metadata.title
+
+    assert schema.species == methanimine.species
+    assert "species" in schema.loaded_registries
+    assert "calculations" not in schema.loaded_registries
+
+    for _ in range(2):  # failed registries are loaded again on the next access
+        with pytest.raises(ValidationError, match="CalculationRegistry") as err:
+            schema.calculations  # noqa: B018
+        assert "(calculations.yaml)" in str(err.value)
+        assert err.value.errors()[0]["loc"][:2] == ("calculations", "c1")
+        assert "calculations" not in schema.loaded_registries
+    with pytest.raises(ValidationError):
+        load_dataset(tmp_path, lazy=False)
+
+
+def test_serialization_loads_all_registries(tmp_path, methanimine):
+    dump_dataset(methanimine, tmp_path)
+    expected = methanimine.model_dump()
+
+    assert load_dataset(tmp_path).model_dump() == expected
+    assert pickle.loads(pickle.dumps(load_dataset(tmp_path))) == methanimine
+    assert copy.deepcopy(load_dataset(tmp_path)) == methanimine
+    assert load_dataset(tmp_path).model_copy() == methanimine
+
+
+def test_assignment_replaces_unloaded_registry(tmp_path, methanimine):
+    dump_dataset(methanimine, tmp_path)
+    (tmp_path / "species.yaml").write_text("not: [valid\n")
+    schema = load_dataset(tmp_path)
+    schema.species = methanimine.species
+    assert schema.species is methanimine.species
+
+
+def test_shard_directory_and_inline_items(tmp_path):
+    (tmp_path / "rmmd.yaml").write_text(_ROOT + "species:\n  a: {entities: [x]}\n")
+    (tmp_path / "species.json").write_text('{"b": {"entities": ["y"]}}')
+    (tmp_path / "species").mkdir()
+    (tmp_path / "species" / "more.yaml").write_text("c: {entities: [z]}\n")
+    (tmp_path / "species" / "README.md").write_text("ignored")
+
+    schema = load_dataset(tmp_path)
+    assert list(schema.species) == ["a", "b", "c"]
+
+
+def test_duplicate_keys_across_shards(tmp_path):
+    (tmp_path / "rmmd.yaml").write_text(_ROOT)
+    (tmp_path / "species.yaml").write_text("a: {entities: [x]}\n")
+    (tmp_path / "species").mkdir()
+    (tmp_path / "species" / "more.yaml").write_text("a: {entities: [y]}\n")
+
+    with pytest.raises(ValueError, match="Duplicate key 'a'"):
+        load_dataset(tmp_path, lazy=False)
+
+
+def test_missing_root_file(tmp_path):
+    with pytest.raises(ValueError, match="root file"):
+        load_dataset(tmp_path)
+
+
+def test_cli(tmp_path):
+    runner = CliRunner()
+    target = tmp_path / "datasets" / "methanimine"
+    args = ["convert", str(_EXAMPLES_DIR / "methanimine.yaml"), str(target)]
+    result = runner.invoke(rmmd, args + ["--shard-format", ".json.gz"])
+    assert result.exit_code == 0, result.output
+    assert (target / "species.json.gz").exists()
+    (tmp_path / "datasets" / "minimal.yaml").write_text(_ROOT)
+
+    result = runner.invoke(rmmd, ["validate", str(tmp_path / "datasets")])
+    assert result.exit_code == 0, result.output
+    assert "2 of 2 file(s) valid" in result.output
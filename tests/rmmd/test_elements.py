@@ -0,0 +1,26 @@
+"""Tests for the element property table (rmmd.elements)."""
+
+import pytest
+
+from rmmd.elements import element_table
+
+
+def test_element_table():
+    table = element_table()
+    assert table.symbols[table.index["C"]] == "C"
+    assert table.atomic_numbers[table.index["Og"]] == 118
+    assert table.atomic_masses[table.index["O"]] == pytest.approx(15.999)
+    assert table.most_common_isotopes[table.index["Cl"]] == 35
+    assert table.isotope_mass_numbers[table.isotopes("H")].tolist()[:3] == [1, 2, 3]
+    assert table.isotope_mass("C", 13) == pytest.approx(13.00335)
+    with pytest.raises(KeyError):
+        table.isotope_mass("C", 1)
+    with pytest.raises(ValueError):
+        table.atomic_masses[0] = 0.0  # shared table is read-only
+
+
+def test_abundances_sum_to_100_percent():
+    table = element_table()
+    for symbol in ["H", "C", "N", "O", "Cl", "U"]:
+        total = table.isotope_abundances[table.isotopes(symbol)].sum()
+        assert total == pytest.approx(100.0, abs=0.01)
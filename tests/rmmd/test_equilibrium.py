@@ -0,0 +1,101 @@
+"""Tests for equilibrium constants and reverse rates (rmmd.equilibrium)."""
+
+import numpy as np
+import pytest
+
+from rmmd.equilibrium import EquilibriumBank
+from rmmd.schema import Schema
+from rmmd.thermo_eval import R
+
+_P_STANDARD = 1e5
+
+
+def _constant_cp(H0: float, S0: float, Cp: float, **kwargs) -> dict:
+    model = {"type": "constant-cp", "T_range": [200, 3000], "H0": H0, "S0": S0}
+    return model | {"Cp": Cp, **kwargs}
+
+
+def _g(H0: float, S0: float, Cp: float, T: np.ndarray, T0: float = 298.15):
+    return H0 + Cp * (T - T0) - T * (S0 + Cp * np.log(T / T0))
+
+
+@pytest.fixture
+def schema() -> Schema:
+    atm = {"T": 298.15, "p": 101325.0}
+    qc = {"T": 298.15, "p": _P_STANDARD, "element_reference": "quantum chemistry"}
+    return Schema.model_validate(
+        {
+            "metadata": {"license": "MIT", "title": "test"},
+            "species": {
+                "A": {"entities": ["a"], "thermo": ["table", "A"]},
+                "B": {"entities": ["b"], "thermo": ["B"]},
+                "C": {"entities": ["c"], "thermo": ["C"]},
+                "D": {"entities": ["d"], "thermo": ["D"]},
+                "E": {"entities": ["e"]},
+            },
+            "thermo": {
+                "table": {
+                    "type": "tabular thermo",
+                    "T": [300],
+                    "p": [1e5],
+                    "Cp": [[1]],
+                },
+                "A": _constant_cp(-1e5, 200.0, 40.0),
+                "B": _constant_cp(-4e4, 150.0, 30.0),
+                "C": _constant_cp(1e4, 100.0, 20.0, reference_state=atm),
+                "D": _constant_cp(0.0, 100.0, 20.0, reference_state=qc),
+            },
+            "reactions": {
+                "A=2B": {
+                    "reactants": ["A"],
+                    "products": ["B", "B"],
+                    "rate_constants": ["k"],
+                },
+                "B=C": {"reactants": ["B"], "products": ["C"]},
+                "B=D": {"reactants": ["B"], "products": ["D"], "rate_constants": ["k"]},
+                "A=E": {"reactants": ["A"], "products": ["E"]},
+            },
+            "rate_constants": {
+                "k": {"type": "modified Arrhenius", "A": 1e13, "b": 0.0, "Ea": 1e5}
+            },
+        }
+    )
+
+
+def test_equilibrium_constants(schema):
+    bank = EquilibriumBank.from_schema(schema)
+    T = np.array([300.0, 1000.0, 2000.0])
+    eq = bank.evaluate(T)
+
+    dG = 2 * _g(-4e4, 150.0, 30.0, T) - _g(-1e5, 200.0, 40.0, T)
+    row = bank.index["A=2B"]
+    assert eq.dG[row] == pytest.approx(dG)
+    assert eq.Kp[row] == pytest.approx(np.exp(-dG / (R * T)))
+    assert eq.Kc[row] == pytest.approx(eq.Kp[row] * _P_STANDARD / (R * T))
+
+    # reference pressure of C is converted to the standard pressure
+    dG = _g(1e4, 100.0, 20.0, T) + R * T * np.log(_P_STANDARD / 101325.0)
+    dG -= _g(-4e4, 150.0, 30.0, T)
+    assert eq.dG[bank.index["B=C"]] == pytest.approx(dG)
+    assert eq.Kc[bank.index["B=C"]] == pytest.approx(eq.Kp[bank.index["B=C"]])
+
+    # different element references and missing thermo
+    assert np.isnan(eq.dG[bank.index["B=D"]]).all()
+    assert np.isnan(eq.dG[bank.index["A=E"]]).all()
+
+
+def test_reverse_rate_coefficients(schema):
+    bank = EquilibriumBank.from_schema(schema)
+    T = np.array([500.0, 1500.0])
+    k_rev = bank.reverse_rate_coefficients(T, p=1e5)
+
+    k_fwd = 1e13 * np.exp(-1e5 / (R * T))
+    row = bank.index["A=2B"]
+    assert k_rev[row] == pytest.approx(k_fwd / bank.Kc(T)[row])
+    assert np.isnan(k_rev[bank.index["B=C"]]).all()  # no forward rate
+
+
+def test_extrapolation(schema):
+    bank = EquilibriumBank.from_schema(schema)
+    assert np.isnan(bank.dG(5000.0)[bank.index["A=2B"]]).all()
+    assert np.isfinite(bank.dG(5000.0, extrapolate=True)[bank.index["A=2B"]]).all()
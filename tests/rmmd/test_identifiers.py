@@ -0,0 +1,114 @@
+"""Tests for the recalculation of identifiers (rmmd.identifiers)."""
+
+import json
+import pickle
+
+import pytest
+from pydantic import ValidationError
+
+from rmmd import identifiers
+from rmmd.cache import IdentifierCache
+from rmmd.identifiers import (
+    FixedHInChI,
+    recalculate_identifier,
+    recalculate_parallel,
+    validate_parallel,
+)
+from rmmd.schema import Schema
+
+_METHANIMINE = "InChI=1/CH3N/c1-2/h2H,1H2"
+
+
+@pytest.fixture
+def disk_cache(tmp_path):
+    cache = IdentifierCache(tmp_path / "identifiers.sqlite")
+    identifiers.use_identifier_cache(cache)
+    recalculate_identifier.cache_clear()
+    yield cache
+    identifiers.use_identifier_cache(False)
+    recalculate_identifier.cache_clear()
+
+
+def test_full_validation():
+    FixedHInChI(value=_METHANIMINE, validation_strategy="full")
+    with pytest.raises(ValidationError, match="does not match"):
+        FixedHInChI(
+            value="InChI=1/C2H4O2/c1-2(3)4/h1H3,(H,3,4)", validation_strategy="full"
+        )
+
+
+def test_recalculation_is_cached(disk_cache, monkeypatch):
+    calls = []
+    original = identifiers._RECALCULATIONS["InChI-fixedH"]
+    monkeypatch.setitem(
+        identifiers._RECALCULATIONS,
+        "InChI-fixedH",
+        lambda value: calls.append(value) or original(value),
+    )
+
+    for _ in range(3):
+        FixedHInChI(value=_METHANIMINE, validation_strategy="full")
+    assert calls == [_METHANIMINE]  # in-memory cache
+
+    recalculate_identifier.cache_clear()
+    FixedHInChI(value=_METHANIMINE, validation_strategy="full")
+    assert calls == [_METHANIMINE]  # on-disk cache
+    assert disk_cache.get("InChI-fixedH", _METHANIMINE) == _METHANIMINE
+
+
+def test_disk_cache_is_keyed_by_rdkit_version(disk_cache):
+    disk_cache.put("SMILES", "OC", "CO")
+    assert disk_cache.get("SMILES", "OC") == "CO"
+
+    other = pickle.loads(pickle.dumps(disk_cache))
+    other.rdkit_version = "0.0.0"
+    assert other.get("SMILES", "OC") is None
+
+
+def _entities(inchis: list[str], strategy: str = "full") -> dict:
+    return {
+        "metadata": {"license": "MIT", "title": "t"},
+        "entities": {
+            f"e{i}": {
+                "inchi_fixedh": {"value": inchi, "validation_strategy": strategy},
+                "electronic_spin": "unkown-electronic-ground-state",
+            }
+            for i, inchi in enumerate(inchis)
+        },
+    }
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_validate_parallel(jobs):
+    inchis = [_METHANIMINE, "InChI=1/C2H4O2/c1-2(3)4/h1H3,(H,3,4)/f/h3H"] * 50
+    schema = validate_parallel(Schema, _entities(inchis), jobs=jobs)
+    assert schema == Schema.model_validate(_entities(inchis))
+
+    recalculated = validate_parallel(
+        Schema, json.dumps(_entities(inchis, "recalculate")), jobs=jobs
+    )
+    assert recalculated.entities["e1"].inchi_fixedh.value == inchis[1]
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_validate_parallel_errors(jobs):
+    data = _entities(
+        [_METHANIMINE, "InChI=1/C2H4O2/c1-2(3)4/h1H3,(H,3,4)"] * 40 + [_METHANIMINE]
+    )
+    data["entities"]["e3"]["conformations"] = "not a list"
+
+    with pytest.raises(ValidationError) as serial:
+        Schema.model_validate(data)
+    with pytest.raises(ValidationError) as parallel:
+        validate_parallel(Schema, data, jobs=jobs)
+    assert parallel.value.json() == serial.value.json()
+
+
+def test_recalculate_parallel():
+    identifiers = [("SMILES", "OC"), ("SMILES", "NC"), ("SMILES", "not a smiles")]
+    results = recalculate_parallel(identifiers * 3, jobs=2, chunk_size=1)
+    assert results == {
+        ("SMILES", "OC"): "CO",
+        ("SMILES", "NC"): "CN",
+        ("SMILES", "not a smiles"): None,
+    }
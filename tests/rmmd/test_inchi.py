@@ -0,0 +1,86 @@
+"""Tests for the parsing of InChIs (rmmd.inchi)."""
+
+import pytest
+
+from rmmd.inchi import parse_inchi
+from rmmd.species import MolecularEntity
+
+ACETATE = "InChI=1/C2H4O2/c1-2(3)4/h1H3,(H,3,4)/p-1/fC2H3O2/h3h/q-1"
+
+
+@pytest.mark.parametrize(
+    "inchi, constitution, charge",
+    [
+        ("InChI=1S/CH4/h1H4", {"C": 1, "H": 4}, 0),
+        (ACETATE, {"C": 2, "H": 3, "O": 2}, -1),
+        ("InChI=1S/H3N/h1H3/p+1", {"H": 4, "N": 1}, 1),
+        ("InChI=1S/p+1", {"H": 1}, 1),
+        ("InChI=1S/2CH4.Cl2/c;;1-2/h2*1H4;", {"C": 2, "H": 8, "Cl": 2}, 0),
+        ("InChI=1S/Na.H2O/h;1H2/q+1;/p-1", {"H": 1, "Na": 1, "O": 1}, 0),
+        (  # Na2SO4 with a multiplied charge layer
+            "InChI=1S/2Na.H2O4S/c;;1-5(2,3)4/h;;(H2,1,2,3,4)/q2*+1;/p-2",
+            {"H": 0, "Na": 2, "O": 4, "S": 1},
+            0,
+        ),
+        ("InChI=1S/2Na.O/q2*+1;-2", {"Na": 2, "O": 1}, 0),
+        (
+            "InChI=1S/CH4.2ClH.2Na/h1H4;2*1H;;/q;;;2*+1/p-2/i1+1;;;;",
+            {"C": 1, "H": 4, "Cl": 2, "Na": 2},
+            0,
+        ),
+    ],
+)
+def test_parse_inchi(inchi, constitution, charge):
+    parsed = parse_inchi(inchi)
+    assert parsed.constitution == constitution
+    assert parsed.charge == charge
+
+
+def test_layers():
+    parsed = parse_inchi(ACETATE)
+    assert parsed.version == "1"
+    assert parsed.formula == "C2H4O2"
+    assert parsed.protonation == -1
+    assert [prefix for prefix, _ in parsed.layers] == ["c", "h", "p", "f", "h", "q"]
+
+
+@pytest.mark.parametrize(
+    "inchi, isotopic_atoms",
+    [
+        ("InChI=1S/CH4/h1H4", ()),
+        ("InChI=1/H2O/h1H2/i/hD2/f/i1D2", (("H", 1), ("H", 1))),
+        ("InChI=1/CH3Br/c1-2/h1H3/i2-1", (("Br", -1),)),
+        ("InChI=1S/CH4.2ClH.2Na/h1H4;2*1H;;/q;;;2*+1/p-2/i1+1;;;;", (("C", 1),)),
+        ("InChI=1/CH3Cl/c1-2/h1H3/i1TD", (("H", 2), ("H", 1))),
+        ("InChI=1/H2/h1H/i1+1D", (("H", 1), ("H", 1))),
+        (
+            "InChI=1/2CH4.H2O/h2*1H4;1H2/i2*1+1;/hD2/f/i2m;1D2",
+            (("C", 1), ("C", 1), ("H", 1), ("H", 1)),
+        ),
+        (
+            "InChI=1/C2H4O2/c1-2(3)4/h1H3,(H,3,4)/i1+1/hD/f/h3H/i1+1,3D",
+            (("C", 1), ("H", 1)),
+        ),
+    ],
+)
+def test_isotopic_atoms(inchi, isotopic_atoms):
+    assert parse_inchi(inchi).isotopic_atoms == isotopic_atoms
+
+
+def test_interning():
+    entities = [
+        MolecularEntity(
+            inchi_fixedh={"value": ACETATE},
+            electronic_spin="unkown-electronic-ground-state",
+        )
+        for _ in range(2)
+    ]
+    assert entities[0].parsed_inchi is entities[1].parsed_inchi
+    # the shared constitution cannot be changed through an entity
+    entities[0].constitution["C"] = 0
+    assert entities[1].constitution["C"] == 2
+
+
+def test_not_an_inchi():
+    with pytest.raises(ValueError, match="Not an InChI"):
+        parse_inchi("CH4")
@@ -0,0 +1,192 @@
+"""Tests for reading and writing RMMD files (rmmd.io)."""
+
+import gzip
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pytest
+import yaml
+from pydantic import ValidationError
+
+from rmmd import io
+from rmmd.arrays import externalize_arrays
+from rmmd.cache import SchemaCache
+from rmmd.schema import Schema
+
+_EXAMPLES_DIR = Path(__file__).parent.parent.parent.resolve() / "examples"
+
+
+##############################################################################
+# YAML loader
+##############################################################################
+
+
+class TestYamlLoader:
+    @pytest.mark.parametrize(
+        "path", sorted(_EXAMPLES_DIR.glob("*.yaml")), ids=lambda p: p.name
+    )
+    def test_same_result_as_pure_python_loader(self, path):
+        text = path.read_text(encoding="utf-8")
+        assert io.load_yaml(text) == yaml.load(text, Loader=yaml.SafeLoader)
+
+    def test_quoted_no_is_string(self):
+        data = io.load_yaml('"NO": 1\nNO: 2\n')
+        assert data == {"NO": 1, False: 2}
+
+    def test_underscore_integers(self):
+        assert io.load_yaml("p: 100_000") == {"p": 100000}
+
+    def test_load_all(self):
+        docs = list(io.load_yaml_all("a: 1\n---\nb: 2\n"))
+        assert docs == [{"a": 1}, {"b": 2}]
+
+    def test_dump_round_trips_and_keeps_order(self):
+        data = {"species": {"NO": {"entities": ["x"]}}, "a": [1.5, 100000]}
+        text = io.dump_yaml(data)
+        assert text.index("species") < text.index("a:")
+        assert io.load_yaml(text) == data
+
+
+##############################################################################
+# load & schema cache
+##############################################################################
+
+
+class TestLoadCache:
+    def test_load_without_cache(self):
+        schema = io.load(_EXAMPLES_DIR / "methanimine.yaml")
+        assert "CH2NH" in schema.species
+
+    def test_cache_hit_skips_validation(self, tmp_path, monkeypatch):
+        cache = SchemaCache(tmp_path / "cache")
+        path = _EXAMPLES_DIR / "butane_thermo.yaml"
+        first = io.load(path, cache=cache)
+        assert len(list(cache.directory.iterdir())) == 1
+
+        def fail(*args, **kwargs):
+            raise AssertionError("validation should have been skipped")
+
+        monkeypatch.setattr(Schema, "model_validate", fail)
+        second = io.load(path, cache=cache)
+        assert second == first
+        assert second is not first
+        assert second.entities["IJDNQMDRQITEOD-UHFFFAOYNA-N"].key == (
+            "IJDNQMDRQITEOD-UHFFFAOYNA-N"
+        )
+
+    def test_cached_registry_can_add_items(self, tmp_path):
+        cache = SchemaCache(tmp_path)
+        path = _EXAMPLES_DIR / "methanimine.yaml"
+        io.load(path, cache=cache)
+        schema = io.load(path, cache=cache)
+        key = schema.calculations.add(
+            schema.calculations["calculations:0"].model_copy(update={"key": None})
+        )
+        assert key == "calc-0001"
+
+    def test_changed_file_is_a_miss(self, tmp_path):
+        cache = SchemaCache(tmp_path / "cache")
+        f = tmp_path / "data.yaml"
+        f.write_text("metadata: {license: MIT, title: first}\n")
+        assert io.load(f, cache=cache).metadata.title == "first"
+        f.write_text("metadata: {license: MIT, title: second}\n")
+        assert io.load(f, cache=cache).metadata.title == "second"
+
+    def test_corrupted_entry_is_ignored(self, tmp_path):
+        cache = SchemaCache(tmp_path / "cache")
+        f = tmp_path / "data.yaml"
+        f.write_text("metadata: {license: MIT, title: test}\n")
+        io.load(f, cache=cache)
+        (entry,) = cache.directory.iterdir()
+        entry.write_bytes(b"garbage")
+        assert io.load(f, cache=cache).metadata.title == "test"
+
+    @staticmethod
+    def _with_external_array(directory: Path) -> tuple[Path, Path]:
+        schema = io.load(_EXAMPLES_DIR / "methanimine.yaml")
+        assert externalize_arrays(schema, directory, min_size=1) == 1
+        io.dump(schema, directory / "data.yaml")
+        (array_file,) = (directory / "arrays").iterdir()
+        return directory / "data.yaml", array_file
+
+    def test_copy_without_arrays_is_a_miss(self, tmp_path):
+        cache = SchemaCache(tmp_path / "cache")
+        (tmp_path / "a").mkdir()
+        (tmp_path / "b").mkdir()
+        f, _ = self._with_external_array(tmp_path / "a")
+        io.load(f, cache=cache)
+
+        copy = tmp_path / "b" / "data.yaml"
+        shutil.copy(f, copy)
+        with pytest.raises(ValidationError, match="not found"):
+            io.load(copy, cache=cache)
+
+    def test_rewritten_array_file_is_a_miss(self, tmp_path):
+        cache = SchemaCache(tmp_path / "cache")
+        f, array_file = self._with_external_array(tmp_path)
+        schema = io.load(f, cache=cache)
+        table = schema.rate_constants["table_1_ali_et_al"]
+        assert table.k.dtype == np.float64
+
+        np.save(array_file, np.load(array_file).astype(np.float32))
+        schema = io.load(f, cache=cache)
+        assert schema.rate_constants[table.key].k.dtype == np.float32
+
+    def test_lru_eviction(self, tmp_path):
+        cache = SchemaCache(tmp_path / "cache")
+        schema = io.load(_EXAMPLES_DIR / "minimal.yaml")
+        cache.put("a", schema)
+        entry_size = (cache.directory / "a.pickle").stat().st_size
+        cache.max_bytes = 2 * entry_size
+
+        cache.put("b", schema)
+        os.utime(cache.directory / "a.pickle", (0, 0))  # a is least recently used
+        os.utime(cache.directory / "b.pickle", (1, 1))
+        cache.put("c", schema)
+
+        assert cache.get("a") is None
+        assert cache.get("b") is not None
+        assert cache.get("c") is not None
+
+
+##############################################################################
+# file formats
+##############################################################################
+
+
+class TestFileFormats:
+    @pytest.mark.parametrize("suffix", [".yaml", ".json", ".json.gz"])
+    @pytest.mark.parametrize(
+        "example", sorted(_EXAMPLES_DIR.glob("*.yaml")), ids=lambda p: p.name
+    )
+    def test_round_trip(self, tmp_path, example, suffix):
+        schema = io.load(example)
+        path = tmp_path / f"data{suffix}"
+        io.dump(schema, path)
+        assert io.load(path) == schema
+
+    def test_json_is_validated(self, tmp_path):
+        path = tmp_path / "invalid.json"
+        path.write_text('{"schema_version": "0.1.0b0"}')
+        with pytest.raises(ValidationError, match="metadata"):
+            io.load(path)
+
+    def test_gzip_is_compressed(self, tmp_path):
+        schema = io.load(_EXAMPLES_DIR / "methanimine.yaml")
+        io.dump(schema, tmp_path / "data.json")
+        io.dump(schema, tmp_path / "data.json.gz")
+        assert (
+            gzip.decompress((tmp_path / "data.json.gz").read_bytes())
+            == (tmp_path / "data.json").read_bytes()
+        )
+
+    def test_unknown_suffix(self, tmp_path):
+        with pytest.raises(ValueError, match="Unknown RMMD file format"):
+            io.load(tmp_path / "data.txt")
+
+    def test_quoted_keys_survive_yaml_dump(self, tmp_path):
+        schema = io.load(_EXAMPLES_DIR / "stepwise.yaml")
+        io.dump(schema, tmp_path / "stepwise.yaml")
+        assert "NO" in io.load(tmp_path / "stepwise.yaml").species
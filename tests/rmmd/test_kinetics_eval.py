@@ -0,0 +1,134 @@
+"""Tests for the batched evaluation of rate coefficients (rmmd.kinetics_eval)."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from rmmd.io import load
+from rmmd.kinetics_eval import R, KineticsBank
+from rmmd.schema import Schema
+
+EXAMPLES = Path(__file__).parents[2] / "examples"
+
+
+def _schema(rate_constants: dict) -> Schema:
+    return Schema.model_validate(
+        {
+            "metadata": {"license": "MIT", "title": "t"},
+            "rate_constants": rate_constants,
+        }
+    )
+
+
+def _k(A, b, Ea, T):
+    return A * T**b * np.exp(-Ea / (R * T))
+
+
+@pytest.fixture
+def bank() -> KineticsBank:
+    schema = _schema(
+        {
+            "arrhenius": {"type": "modified Arrhenius", "A": 1e10, "b": 0.5, "Ea": 5e4},
+            "plog": {
+                "type": "pressure-dependent Arrhenius",
+                # unsorted, with two expressions at 1e5 Pa
+                "p": [1e5, 1e3, 1e5],
+                "A": [1e8, 1e6, 2e8],
+                "b": [0.0, 1.0, 0.0],
+                "Ea": [1e4, 0.0, 2e4],
+            },
+            "table": {
+                "type": "rate table",
+                "T": [500.0, 1000.0],
+                "p": [1e3, 1e5],
+                "k": [[1.0, 100.0], [10.0, 1000.0]],
+            },
+            "arrhenius-2": {"type": "modified Arrhenius", "A": 2.0, "b": 0, "Ea": 0},
+        }
+    )
+    return KineticsBank.from_schema(schema)
+
+
+def test_shape_and_order(bank):
+    k = bank.evaluate([500.0, 1000.0, 1500.0], 1e5)
+    assert k.shape == (4, 3)
+    assert bank.keys == ["arrhenius", "plog", "table", "arrhenius-2"]
+    np.testing.assert_allclose(k[bank.index["arrhenius-2"]], 2.0)
+
+
+def test_arrhenius(bank):
+    T = np.array([300.0, 1000.0, 2000.0])
+    k = bank.evaluate(T, p=1e5)[bank.index["arrhenius"]]
+    np.testing.assert_allclose(k, _k(1e10, 0.5, 5e4, T))
+
+
+def test_plog(bank):
+    T = np.full(4, 800.0)
+    p = np.array([1e2, 1e3, 1e4, 1e6])
+    k = bank.evaluate(T, p)[bank.index["plog"]]
+
+    k_low = _k(1e6, 1.0, 0.0, 800.0)
+    k_high = _k(1e8, 0.0, 1e4, 800.0) + _k(2e8, 0.0, 2e4, 800.0)
+    # clamped outside of the pressure range, log-log interpolation in between
+    np.testing.assert_allclose(k, [k_low, k_low, np.sqrt(k_low * k_high), k_high])
+
+
+def test_empty_plog_is_rejected():
+    empty = {
+        "type": "pressure-dependent Arrhenius",
+        "p": [],
+        "A": [],
+        "b": [],
+        "Ea": [],
+    }
+    with pytest.raises(ValidationError, match="at least one pressure point"):
+        _schema({"plog": empty})
+
+
+def test_rate_table(bank):
+    row = bank.index["table"]
+    # grid points are reproduced
+    k = bank.evaluate([500.0, 1000.0, 500.0, 1000.0], [1e3, 1e3, 1e5, 1e5])[row]
+    np.testing.assert_allclose(k, [1.0, 100.0, 10.0, 1000.0])
+
+    # interpolation of ln k, linear in 1/T and ln p
+    T_mid = 1 / (0.5 / 500 + 0.5 / 1000)
+    k = bank.evaluate([T_mid, 500.0, T_mid], [1e3, 1e4, 1e4])[row]
+    np.testing.assert_allclose(k, [10.0, np.sqrt(10.0), np.sqrt(1000.0)])
+
+    # clamped outside of the grid
+    k = bank.evaluate([100.0, 5000.0], [1.0, 1e9])[row]
+    np.testing.assert_allclose(k, [1.0, 1000.0])
+
+
+def test_example_rate_table():
+    schema = load(EXAMPLES / "methanimine.yaml")
+    bank = KineticsBank.from_schema(schema)
+    tables = [key for key, k in schema.rate_constants.items() if k.type == "rate table"]
+    assert tables
+    for key in tables:
+        table = schema.rate_constants[key]
+        T, p = np.meshgrid(table.T, table.p)
+        k = bank.evaluate(T.ravel(), p.ravel())[bank.index[key]]
+        np.testing.assert_allclose(k, np.ravel(table.k))
+
+
+def test_subset_of_keys(bank):
+    schema = _schema({"a": {"type": "modified Arrhenius", "A": 1, "b": 0, "Ea": 0}})
+    assert KineticsBank.from_schema(schema, keys=[]).evaluate(300, 1e5).shape == (0, 1)
+
+
+def test_rate_tables_on_different_grids():
+    tables = {
+        "a": {"type": "rate table", "T": [300, 600], "p": [1e5], "k": [[1, 2]]},
+        "b": {"type": "rate table", "T": [300, 400, 500], "p": [1e5], "k": [[1, 2, 3]]},
+        "c": {"type": "rate table", "T": [300, 600], "p": [1e5], "k": [[4, 8]]},
+    }
+    bank = KineticsBank.from_schema(_schema(tables))
+    k = bank.evaluate([300.0, 400.0, 600.0], 1e5)
+    np.testing.assert_allclose(k[:, [0, 2]], [[1, 2], [1, 3], [4, 8]])
+    np.testing.assert_allclose(k[1, 1], 2.0)
+    assert 1 < k[0, 1] < 2
+    np.testing.assert_allclose(k[2, 1], 4 * k[0, 1])
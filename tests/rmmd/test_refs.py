@@ -0,0 +1,113 @@
+"""Tests for the cross-reference checks (rmmd.refs)."""
+
+from pathlib import Path
+
+import pytest
+
+from rmmd.io import load
+from rmmd.refs import DanglingReference, check_references, iter_references
+from rmmd.schema import Schema
+
+_EXAMPLES_DIR = Path(__file__).parent.parent.parent.resolve() / "examples"
+
+
+@pytest.mark.parametrize("path", sorted(_EXAMPLES_DIR.glob("*.yaml")), ids=str)
+def test_examples_have_no_dangling_references(path):
+    assert check_references(load(path)) == []
+
+
+def test_references_of_example():
+    refs = list(iter_references(load(_EXAMPLES_DIR / "methanimine.yaml")))
+    registries = {ref.registry for ref in refs}
+    assert {"species", "entities", "conformations", "rate_constants"} <= registries
+    assert (("species", "HO2", "entities", 0), "entities", "OOH") in refs
+
+
+def test_dangling_references():
+    schema = Schema.model_validate(
+        {
+            "metadata": {"license": "MIT", "title": "t"},
+            "species": {"A": {"entities": ["a"], "thermo": ["thermo-1"]}},
+            "reactions": {
+                "r1": {"reactants": ["A"], "products": ["B"], "steps": ["r1"]}
+            },
+            "pes_relations": {
+                "rel": {
+                    "end_points": [["c1"], ["c2"]],
+                    "saddle_point": "barrierless",
+                },
+            },
+        }
+    )
+    dangling = check_references(schema)
+    assert [d.location for d in dangling] == [
+        ("species", "A", "entities", 0),
+        ("species", "A", "thermo", 0),
+        ("reactions", "r1", "products", 0),
+        ("pes_relations", "rel", "end_points", 0, 0),
+        ("pes_relations", "rel", "end_points", 1, 0),
+    ]
+    assert all(isinstance(d, DanglingReference) for d in dangling)
+    assert str(dangling[1]) == "species.A.thermo[0]: 'thermo-1' not found in thermo"
+
+
+##############################################################################
+# reverse index
+##############################################################################
+
+
+@pytest.fixture
+def schema() -> Schema:
+    return Schema.model_validate(
+        {
+            "metadata": {"license": "MIT", "title": "t"},
+            "species": {
+                "A": {"entities": ["a"], "thermo": ["thermo-1"]},
+                "B": {"entities": ["b"], "thermo": ["thermo-1", "thermo-2"]},
+            },
+            "reactions": {"r1": {"reactants": ["A"], "products": ["B"]}},
+        }
+    )
+
+
+def test_referrers(schema):
+    assert [ref.location for ref in schema.referrers("thermo", "thermo-1")] == [
+        ("species", "A", "thermo", 0),
+        ("species", "B", "thermo", 0),
+    ]
+    assert schema.referrers("species", "B")[0].location[:2] == ("reactions", "r1")
+    assert schema.referrers("thermo", "unused") == []
+
+    with pytest.raises(ValueError, match="Unknown registry"):
+        schema.referrers("thermos", "thermo-1")
+
+
+def test_referrers_are_updated(schema):
+    schema.referrers("thermo", "thermo-1")  # build the index
+
+    del schema.species["A"]
+    assert len(schema.referrers("thermo", "thermo-1")) == 1
+
+    species_b = schema.species["B"]
+    species_b.thermo.remove("thermo-1")
+    schema.species["B"] = species_b  # changes inside of items require storing again
+    assert schema.referrers("thermo", "thermo-1") == []
+
+    key = schema.species.add(species_b.model_copy(update={"key": None}))
+    assert [ref.location[1] for ref in schema.referrers("thermo", "thermo-2")] == [
+        "B",
+        key,
+    ]
+
+
+def test_replaced_registry_and_copies(schema):
+    assert len(schema.referrers("entities", "a")) == 1
+
+    schema.species = type(schema.species)()
+    assert schema.referrers("entities", "a") == []
+
+    copy = schema.model_copy(deep=True)
+    assert copy == schema
+    copy.reactions.clear()
+    assert copy.referrers("species", "A") == []
+    assert len(schema.referrers("species", "A")) == 1
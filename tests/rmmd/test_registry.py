@@ -1,5 +1,10 @@
 """Tests for rmmd.registry (HasKeyMixin and Registry)."""
 
+import copy
+import pickle
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 from pydantic import ValidationError
 
@@ -125,6 +130,45 @@ class TestAdd:
         assert i.key == "item-0001"
 
 
+class TestBulkInsertion:
+    def test_add_many(self):
+        r = ItemRegistry({"item-0002": Item(name="existing")})
+        keys = r.add_many(
+            [Item(name="a"), Item(name="b", key="custom"), Item(name="c")]
+        )
+        assert keys == ["item-0003", "custom", "item-0004"]
+        assert [r[k].name for k in keys] == ["a", "b", "c"]
+        assert r.add(Item(name="d")) == "item-0005"
+
+    def test_add_many_updates_indexes_and_listeners(self):
+        r = TypedRegistry()
+        r.lookup("type", "x")
+        changes = []
+        r.subscribe(lambda key, old, new: changes.append(key))
+        keys = r.add_many([TypedItem(type="x"), TypedItem(type="y")])
+        assert [item.key for item in r.lookup("type", "x")] == keys[:1]
+        assert changes == keys
+
+    def test_from_trusted_mapping(self):
+        item = Item(name="foo")
+        r = ItemRegistry.from_trusted({"item-0007": item})
+        assert r["item-0007"] is item
+        assert item.key == "item-0007"
+        assert r.add(Item(name="bar")) == "item-0008"
+        assert r == ItemRegistry(
+            {"item-0007": Item(name="foo"), "item-0008": Item(name="bar")}
+        )
+
+    def test_from_trusted_key_mismatch(self):
+        with pytest.raises(ValueError, match="key mismatch"):
+            ItemRegistry.from_trusted({"k1": Item(key="k2", name="foo")})
+
+    def test_from_trusted_items(self):
+        r = ItemRegistry.from_trusted(Item(name=str(i)) for i in range(3))
+        assert list(r) == ["item-0001", "item-0002", "item-0003"]
+        assert r == ItemRegistry.model_validate(r.model_dump())
+
+
 ##############################################################################
 # Subclass prefix isolation
 ##############################################################################
@@ -173,3 +217,199 @@ class TestSerialization:
         p2 = Parent.model_validate(d)
         assert p2.items["k1"].name == "foo"
         assert p2.items["k1"].key == "k1"
+
+
+##############################################################################
+# Change notifications
+##############################################################################
+
+
+class TestSubscribe:
+    def test_listener_is_called_on_changes(self):
+        r = ItemRegistry({"k1": Item(name="foo")})
+        changes = []
+        listener = lambda key, old, new: changes.append((key, old, new))  # noqa: E731
+        r.subscribe(listener)
+
+        old = r["k1"]
+        new = Item(name="bar")
+        r["k1"] = new
+        key = r.add(Item(name="baz"))
+        del r["k1"]
+        assert changes == [("k1", old, new), (key, None, r[key]), ("k1", new, None)]
+
+        r.unsubscribe(listener)
+        r.add(Item(name="qux"))
+        assert len(changes) == 3
+
+    def test_listeners_are_not_part_of_the_registry(self):
+        r = ItemRegistry({"k1": Item(name="foo")})
+        changes = []
+        r.subscribe(lambda key, old, new: changes.append(key))
+        assert r == ItemRegistry({"k1": Item(name="foo")})
+        assert pickle.loads(pickle.dumps(r)) == r
+        copy.deepcopy(r)["k2"] = Item(name="bar")
+        copy.copy(r)["k3"] = Item(name="baz")
+        r.model_copy()["k4"] = Item(name="baz")
+        assert changes == []
+        # the original keeps its listeners
+        r["k5"] = Item(name="qux")
+        assert changes == ["k5"]
+
+
+##############################################################################
+# Secondary indexes
+##############################################################################
+
+
+class TypedItem(HasKeyMixin):
+    type: str
+    size: int = 0
+
+
+class TypedRegistry(
+    Registry[TypedItem], prefix="typed", indexes={"type": lambda item: item.type}
+): ...
+
+
+class TestSecondaryIndexes:
+    @pytest.fixture
+    def registry(self) -> TypedRegistry:
+        return TypedRegistry.model_validate(
+            {
+                "a": {"type": "x", "size": 1},
+                "b": {"type": "y", "size": 2},
+                "c": {"type": "x", "size": 3},
+            }
+        )
+
+    def test_lookup(self, registry):
+        assert [item.key for item in registry.lookup("type", "x")] == ["a", "c"]
+        assert registry.lookup("type", "z") == []
+        with pytest.raises(ValueError, match="Unknown index"):
+            registry.lookup("size", 1)
+
+    def test_index_is_maintained(self, registry):
+        registry.lookup("type", "x")  # build the indexes
+        registry["a"] = TypedItem(type="y")
+        del registry["c"]
+        key = registry.add(TypedItem(type="x"))
+        assert [item.key for item in registry.lookup("type", "x")] == [key]
+        assert [item.key for item in registry.lookup("type", "y")] == ["b", "a"]
+
+    def test_register_index(self, registry):
+        registry.register_index("large", lambda item: item.size > 1 or None)
+        assert [item.key for item in registry.lookup("large", True)] == ["b", "c"]
+        # only for this instance
+        with pytest.raises(ValueError, match="Unknown index"):
+            TypedRegistry().lookup("large", True)
+
+    @pytest.mark.parametrize("copy_", [copy.copy, copy.deepcopy])
+    def test_copies_have_their_own_indexes(self, registry, copy_):
+        registry.register_index("large", lambda item: item.size > 1 or None)
+        registry.lookup("type", "x")  # build the indexes
+        copied = copy_(registry)
+        copied["d"] = TypedItem(type="x", size=4)
+        copied.register_index("small", lambda item: item.size < 2 or None)
+        assert [item.key for item in registry.lookup("type", "x")] == ["a", "c"]
+        assert [item.key for item in copied.lookup("type", "x")] == ["a", "c", "d"]
+        assert [item.key for item in copied.lookup("large", True)] == ["b", "c", "d"]
+        with pytest.raises(ValueError, match="Unknown index"):
+            registry.lookup("small", True)
+
+    def test_indexes_are_inherited(self):
+        class SubRegistry(TypedRegistry, indexes={"size": lambda item: item.size}): ...
+
+        assert set(SubRegistry.indexes) == {"type", "size"}
+        assert set(TypedRegistry.indexes) == {"type"}
+
+    def test_equality_ignores_indexes(self, registry):
+        other = registry.model_copy(deep=True)
+        registry.lookup("type", "x")
+        assert registry == other
+
+
+##############################################################################
+# Thread safety
+##############################################################################
+
+
+N_THREADS = 32
+N_PER_THREAD = 300
+
+
+@pytest.fixture
+def frequent_thread_switches():
+    """switch threads as often as possible to provoke races"""
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def _run_workers(worker) -> list:
+    with ThreadPoolExecutor(N_THREADS) as pool:
+        futures = [pool.submit(worker, i) for i in range(N_THREADS)]
+        return [future.result() for future in futures]
+
+
+def _assert_nothing_lost(registry: ItemRegistry, keys: list[str]) -> None:
+    n = N_THREADS * N_PER_THREAD
+    assert len(keys) == len(set(keys)) == len(registry) == n
+    assert {item.name for item in registry.values()} == {
+        f"{i}-{j}" for i in range(N_THREADS) for j in range(N_PER_THREAD)
+    }
+    assert all(registry[key].key == key for key in keys)
+
+
+@pytest.mark.usefixtures("frequent_thread_switches")
+class TestThreadSafety:
+    def test_concurrent_add(self):
+        registry = ItemRegistry().make_thread_safe()
+
+        def worker(i):
+            return [registry.add(Item(name=f"{i}-{j}")) for j in range(N_PER_THREAD)]
+
+        _assert_nothing_lost(registry, sum(_run_workers(worker), []))
+
+    def test_concurrent_add_many(self):
+        registry = ItemRegistry().make_thread_safe()
+        registry.register_index("thread", lambda item: item.name.split("-")[0])
+
+        def worker(i):
+            keys = []
+            for j in range(0, N_PER_THREAD, 10):
+                items = [Item(name=f"{i}-{j + k}") for k in range(10)]
+                keys += registry.add_many(items)
+            return keys
+
+        _assert_nothing_lost(registry, sum(_run_workers(worker), []))
+        assert len(registry.lookup("thread", "0")) == N_PER_THREAD
+
+    def test_reserved_keys(self):
+        registry = ItemRegistry({"item-0005": Item(name="existing")})
+        registry.make_thread_safe()
+
+        def worker(i):
+            keys = registry.reserved_keys(block_size=64)
+            result = []
+            for j in range(N_PER_THREAD):
+                key = next(keys)
+                registry[key] = Item(name=f"{i}-{j}")
+                result.append(key)
+            return result
+
+        keys = sum(_run_workers(worker), [])
+        del registry["item-0005"]
+        _assert_nothing_lost(registry, keys)
+        # generated keys start above the highest existing key
+        assert min(keys) == "item-0006"
+
+    def test_thread_safe_mode_is_not_copied(self):
+        registry = ItemRegistry({"k1": Item(name="foo")}).make_thread_safe()
+        assert registry.thread_safe
+        assert not copy.deepcopy(registry).thread_safe
+        assert not copy.copy(registry).thread_safe
+        assert not pickle.loads(pickle.dumps(registry)).thread_safe
+        assert registry.thread_safe  # the original keeps its lock
+        assert registry == ItemRegistry({"k1": Item(name="foo")})
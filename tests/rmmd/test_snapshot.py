@@ -0,0 +1,103 @@
+"""Tests for copy-on-write snapshots of datasets (rmmd.snapshot)."""
+
+import threading
+from pathlib import Path
+
+import pytest
+
+from rmmd import io
+from rmmd.schema import Schema
+from rmmd.snapshot import FrozenContents, RegistryDiff, diff
+from rmmd.species import Species
+
+_EXAMPLES_DIR = Path(__file__).parent.parent.parent.resolve() / "examples"
+
+
+@pytest.fixture
+def schema() -> Schema:
+    return io.load(_EXAMPLES_DIR / "methanimine.yaml")
+
+
+def _species(name: str) -> Species:
+    return Species(names=[name], entities=["entity-0001"])
+
+
+def test_snapshot_is_isolated(schema):
+    original = schema.model_copy(deep=True)
+    view = schema.snapshot()
+    assert view == original
+
+    key = next(iter(schema.species))
+    del schema.species[key]
+    new_key = schema.species.add(_species("X"))
+    assert view == original
+    assert key in view.species and new_key not in view.species
+
+    with pytest.raises(TypeError):
+        view.species["other"] = _species("Y")
+
+
+def test_unchanged_items_are_shared(schema):
+    first = schema.snapshot()
+    schema.species.add(_species("X"))
+    second = schema.snapshot()
+
+    assert second.calculations.root is first.calculations.root
+    key = next(iter(schema.species))
+    assert second.species[key] is first.species[key] is schema.species[key]
+
+
+def test_diff(schema):
+    old = schema.snapshot()
+    removed, changed = list(schema.species)[:2]
+    added = schema.species.add(_species("X"))
+    del schema.species[removed]
+    schema.species[changed] = _species("Y")
+    schema.species[added] = _species("Z")
+    new = schema.snapshot()
+
+    expected = {"species": RegistryDiff([added], [removed], [changed])}
+    assert diff(old, new) == expected
+    assert diff(old, schema) == expected  # compares all items
+    assert diff(new, schema.snapshot()) == {}
+
+
+def test_many_snapshots(schema):
+    """layers are merged and compacted; contents match the registry in order"""
+    views, keys = [], []
+    for i in range(200):
+        keys.append(schema.species.add(_species(str(i))))
+        if i % 3 == 0:
+            del schema.species[next(iter(schema.species))]
+        views.append(schema.snapshot())
+        assert list(views[-1].species.items()) == list(schema.species.items())
+
+    contents = views[-1].species.root
+    assert isinstance(contents, FrozenContents)
+    assert len(contents.layers) < 10
+    assert diff(views[100], views[101]) == {
+        "species": RegistryDiff([keys[101]], [], [])
+    }
+
+
+def test_concurrent_readers(schema):
+    schema.species.make_thread_safe()
+    stop = threading.Event()
+    errors = []
+
+    def reader():
+        while not stop.is_set():
+            view = schema.snapshot()
+            n = len(view.species)
+            if len(list(view.species.values())) != n:
+                errors.append(n)
+
+    threads = [threading.Thread(target=reader) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for i in range(500):
+        schema.species.add(_species(str(i)))
+    stop.set()
+    for thread in threads:
+        thread.join()
+    assert errors == []
@@ -0,0 +1,117 @@
+"""Tests for datasets stored in SQLite databases (rmmd.sqlite)."""
+
+from pathlib import Path
+
+import pytest
+
+from rmmd import io
+from rmmd.schema import Schema, SpeciesRegistry
+from rmmd.species import Species
+from rmmd.sqlite import (
+    SqliteDatabase,
+    SqliteStore,
+    dump_sqlite,
+    load_sqlite,
+    transaction,
+)
+
+_EXAMPLES_DIR = Path(__file__).parent.parent.parent.resolve() / "examples"
+
+
+@pytest.fixture
+def methanimine() -> Schema:
+    return io.load(_EXAMPLES_DIR / "methanimine.yaml")
+
+
+@pytest.fixture
+def registry(tmp_path) -> SpeciesRegistry:
+    return SqliteDatabase(tmp_path / "db.sqlite", cache_size=2).registry(
+        SpeciesRegistry, "species"
+    )
+
+
+def _species(name: str) -> Species:
+    return Species(names=[name], entities=["entity-0001"])
+
+
+@pytest.mark.parametrize(
+    "example", sorted(_EXAMPLES_DIR.glob("*.yaml")), ids=lambda p: p.name
+)
+def test_round_trip(tmp_path, example):
+    schema = io.load(example)
+    dump_sqlite(schema, tmp_path / "db.sqlite")
+    loaded = io.load(tmp_path / "db.sqlite")
+    assert isinstance(loaded.species.root, SqliteStore)
+    assert loaded == schema
+    data = loaded.model_dump(mode="json", by_alias=True, exclude_none=True)
+    assert Schema.model_validate(data) == schema
+
+
+def test_registry_api(methanimine, tmp_path):
+    dump_sqlite(methanimine, tmp_path / "db.sqlite")
+    schema = load_sqlite(tmp_path / "db.sqlite")
+
+    key = next(iter(methanimine.species))
+    assert list(schema.species) == list(methanimine.species)
+    assert schema.species[key] == methanimine.species[key]
+    assert schema.species[key].key == key
+    assert len(schema.referrers("species", key)) > 0
+
+    new_key = schema.species.add(_species("X"))
+    del schema.species[key]
+    reloaded = load_sqlite(tmp_path / "db.sqlite")
+    assert new_key in reloaded.species and key not in reloaded.species
+
+
+def test_lru_cache(registry):
+    keys = registry.add_many([_species(name) for name in "ABC"])
+    store: SqliteStore = registry.root
+    assert list(store._cache) == keys[1:]
+
+    a = registry[keys[0]]  # validated from the database
+    assert a.names == ["A"] and a.key == keys[0]
+    assert registry[keys[0]] is a
+    assert list(store._cache) == [keys[2], keys[0]]
+
+
+def test_replace_keeps_order(registry):
+    keys = registry.add_many([_species(name) for name in "ABC"])
+    registry[keys[0]] = _species("D")
+    assert list(registry) == keys
+    assert [s.names[0] for s in registry.values()] == ["D", "B", "C"]
+
+
+def test_transaction(tmp_path, methanimine):
+    dump_sqlite(methanimine, tmp_path / "db.sqlite")
+    schema = load_sqlite(tmp_path / "db.sqlite")
+    n_species = len(schema.species)
+
+    with pytest.raises(RuntimeError):
+        with transaction(schema):
+            schema.species.add(_species("X"))
+            raise RuntimeError()
+    assert len(schema.species) == n_species
+
+    with transaction(schema):
+        key = schema.species.add(_species("X"))
+    assert key in load_sqlite(tmp_path / "db.sqlite").species
+
+    with pytest.raises(ValueError, match="not stored"):
+        with transaction(methanimine):
+            pass
+
+
+def test_not_a_dataset(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_sqlite(tmp_path / "missing.sqlite")
+
+    SqliteDatabase(tmp_path / "other.sqlite").close()
+    with pytest.raises(ValueError, match="does not contain an RMMD dataset"):
+        load_sqlite(tmp_path / "other.sqlite")
+
+
+def test_add_many_skips_used_keys(registry):
+    assert registry.add(_species("A")) == "species-0001"
+    registry["species-0003"] = _species("B")
+    keys = registry.add_many([_species("C"), _species("D")])
+    assert keys == ["species-0002", "species-0004"]
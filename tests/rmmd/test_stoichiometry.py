@@ -0,0 +1,113 @@
+"""Tests for the stoichiometry matrices of reactions (rmmd.stoichiometry)."""
+
+import copy
+import pickle
+
+import numpy as np
+import pytest
+
+from rmmd._sparse import CsrMatrix
+from rmmd.metadata import Metadata
+from rmmd.schema import ReactionRegistry, Schema, SpeciesRegistry
+from rmmd.species import Reaction, Species
+from rmmd.stoichiometry import Stoichiometry
+
+
+def _reaction(reactants: list[str], products: list[str]) -> Reaction:
+    return Reaction(reactants=reactants, products=products)
+
+
+@pytest.fixture
+def schema() -> Schema:
+    return Schema(
+        metadata=Metadata(license="MIT", title="test"),
+        species=SpeciesRegistry(
+            {name: Species(entities=[name]) for name in ["H", "H2", "OH", "H2O"]}
+        ),
+        reactions=ReactionRegistry(
+            {
+                "R1": _reaction(["H2", "OH"], ["H2O", "H"]),
+                "R2": _reaction(["OH", "OH"], ["H2O", "O"]),  # O does not exist
+                "R3": _reaction(["H", "H"], ["H2"]),
+            }
+        ),
+    )
+
+
+def test_matrices(schema):
+    stoichiometry = schema.stoichiometry()
+    assert stoichiometry.reactions == ("R1", "R3")
+    assert stoichiometry.species_index == {"H": 0, "H2": 1, "OH": 2, "H2O": 3}
+    row = stoichiometry.reaction_index["R3"]
+    assert stoichiometry.reactants.toarray()[row].tolist() == [2, 0, 0, 0]
+    assert stoichiometry.net.toarray().tolist() == [[1, -1, -1, 1], [-2, 1, 0, 0]]
+    assert not stoichiometry.net.data.flags.writeable
+
+
+def test_cache_is_invalidated(schema):
+    first = schema.stoichiometry()
+    assert schema.stoichiometry() is first
+
+    reaction = schema.reactions["R1"]
+    schema.reactions["R1"] = reaction.model_copy(update={"rate_constants": ["k"]})
+    schema.species["H"] = Species(entities=["H"], names=["hydrogen"])
+    assert schema.stoichiometry() is first  # same reactants, products and species
+
+    schema.species["O"] = Species(entities=["O"])
+    second = schema.stoichiometry()
+    assert second is not first
+    assert second.reactions == ("R1", "R2", "R3")
+
+    del schema.reactions["R1"]
+    assert schema.stoichiometry().reactions == ("R2", "R3")
+
+    schema.reactions = ReactionRegistry({"R4": _reaction(["O", "O"], ["H2O"])})
+    assert schema.stoichiometry().reactions == ("R4",)
+
+
+def test_cache_is_not_part_of_the_dataset(schema):
+    fresh = schema.model_copy(deep=True)
+    first = schema.stoichiometry()
+    schema.referrers("species", "H")
+    assert schema == fresh
+
+    for copied in (copy.copy(schema), copy.deepcopy(schema)):
+        assert copied == schema
+        assert copied.stoichiometry() is not first
+    assert pickle.loads(pickle.dumps(schema)).stoichiometry() is not first
+
+
+def test_npz(schema, tmp_path):
+    stoichiometry = schema.stoichiometry()
+    stoichiometry.save_npz(tmp_path / "network.npz")
+    loaded = Stoichiometry.load_npz(tmp_path / "network.npz")
+
+    assert loaded.reactions == stoichiometry.reactions
+    assert loaded.species == stoichiometry.species
+    for name in ("reactants", "products", "net"):
+        expected = getattr(stoichiometry, name).toarray()
+        assert np.array_equal(getattr(loaded, name).toarray(), expected)
+
+
+def test_to_scipy(schema):
+    pytest.importorskip("scipy")
+    net = schema.stoichiometry().net
+    exported = net.to_scipy()
+    assert np.shares_memory(exported.data, net.data)
+    assert np.shares_memory(exported.indices, net.indices)
+    assert np.array_equal(exported.toarray(), net.toarray())
+
+
+def test_csr_matrix():
+    rows, cols = np.array([2, 0, 2, 0, 2]), np.array([1, 3, 1, 0, 0])
+    values = np.array([1, 2, 3, 4, -5])
+    matrix = CsrMatrix.from_coo(rows, cols, values, (4, 4))
+    dense = np.zeros((4, 4), dtype=np.int64)
+    np.add.at(dense, (rows, cols), values)
+
+    assert matrix.indptr.tolist() == [0, 2, 2, 4, 4]
+    assert np.array_equal(matrix.toarray(), dense)
+    vector = np.arange(4)
+    assert np.array_equal(matrix @ vector, dense @ vector)
+    assert np.array_equal(matrix @ np.eye(4), dense)
+    assert (matrix - matrix).nnz == 0
@@ -0,0 +1,101 @@
+"""Tests for item-by-item validation of RMMD files (rmmd.streaming)."""
+
+import tracemalloc
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+
+from rmmd import io
+from rmmd.schema import Schema
+from rmmd.streaming import format_error, iter_errors
+
+_EXAMPLES_DIR = Path(__file__).parent.parent.parent.resolve() / "examples"
+
+_INVALID = """
+schema_version: 0.1.0b0
+metadata: {title: missing license}
+species:
+  a: {entities: []}
+  "b b": {entities: [x]}
+entities:
+  e1:
+    inchi_fixedh: {value: "InChI=1/H2O/h1H2"}
+    electronic_spin: unkown-electronic-ground-state
+calculations:
+  c1: {type: qm-irc, software: {name: ORCA}}
+  c2: {type: foo}
+"""
+
+
+def _full_validation_errors(text: str) -> set:
+    try:
+        Schema.model_validate(io.load_yaml(text))
+    except ValidationError as err:
+        return {(tuple(e["loc"]), e["msg"]) for e in err.errors()}
+    return set()
+
+
+@pytest.mark.parametrize(
+    "path", sorted(_EXAMPLES_DIR.glob("*.yaml")), ids=lambda p: p.name
+)
+def test_examples_are_valid(path):
+    assert list(iter_errors(path)) == []
+
+
+def test_same_errors_as_full_validation(tmp_path):
+    path = tmp_path / "invalid.yaml"
+    path.write_text(_INVALID)
+    errors = {(tuple(e["loc"]), e["msg"]) for e in iter_errors(path)}
+
+    assert errors == _full_validation_errors(_INVALID)
+    assert {loc[0] for loc, _ in errors} == {"metadata", "species", "calculations"}
+
+
+def test_key_mismatch(tmp_path):
+    path = tmp_path / "mismatch.yaml"
+    path.write_text(
+        "metadata: {license: MIT, title: t}\nspecies:\n  a: {entities: [x], key: b}\n"
+    )
+    (error,) = iter_errors(path)
+    assert error["loc"] == ("species",)
+    assert "key mismatch" in error["msg"]
+
+
+@pytest.mark.parametrize("content", ["", "[1, 2]", "species: null"])
+def test_non_mapping_documents(tmp_path, content):
+    path = tmp_path / "data.yaml"
+    path.write_text(content)
+    assert list(iter_errors(path))
+
+
+def test_format_error():
+    error = {"loc": ("species", "a", "entities", 0), "msg": "bad"}
+    assert format_error(error) == "species.a.entities[0]: bad"
+
+
+def test_memory_is_bounded_by_item_size(tmp_path):
+    n_items = 300
+    item = """
+  c{i}:
+    type: qm-energy
+    software: {{name: ORCA, version: "6"}}
+    output:
+      sources: [{sources}]
+"""
+    sources = ", ".join(f"./data/calc-{j}.log" for j in range(50))
+    text = "metadata: {license: MIT, title: t}\ncalculations:" + "".join(
+        item.format(i=i, sources=sources) for i in range(n_items)
+    )
+    path = tmp_path / "large.yaml"
+    path.write_text(text)
+
+    tracemalloc.start()
+    io.load(path)
+    _, peak_full = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    assert list(iter_errors(path)) == []
+    _, peak_stream = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert peak_stream < peak_full / 5
@@ -0,0 +1,130 @@
+"""Tests for the batched evaluation of thermochemistry models (rmmd.thermo_eval)."""
+
+import numpy as np
+import pytest
+
+from rmmd.schema import Schema
+from rmmd.thermo_eval import R, ThermoBank
+
+# GRI-Mech 3.0 NASA7 polynomial of H2O
+_H2O_LOW = [4.19864056, -2.0364341e-03, 6.52040211e-06, -5.48797062e-09,
+            1.77197817e-12, -3.02937267e04, -8.49032208e-01]  # fmt: skip
+_H2O_HIGH = [3.03399249, 2.17691804e-03, -1.64072518e-07, -9.7041987e-11,
+             1.68200992e-14, -3.00042971e04, 4.9667701]  # fmt: skip
+
+# NIST Shomate equation of H2O (500 - 1700 K) without the H coefficient
+_H2O_SHOMATE = [30.092, 6.832514, 6.793435, -2.53448, 0.082139, -250.881, 223.3967]
+
+
+def _schema(thermo: dict, **kwargs) -> Schema:
+    return Schema.model_validate(
+        {"metadata": {"license": "MIT", "title": "t"}, "thermo": thermo, **kwargs}
+    )
+
+
+@pytest.fixture
+def bank() -> ThermoBank:
+    schema = _schema(
+        {
+            "h2o-nasa7": {
+                "type": "NASA7",
+                # reversed order to check that the ranges are sorted
+                "T_ranges": [[1000, 3500], [200, 1000]],
+                "coefficients": [_H2O_HIGH, _H2O_LOW],
+            },
+            "h2o-shomate": {
+                "type": "Shomate",
+                "T_ranges": [[500, 1700]],
+                "coefficients": [_H2O_SHOMATE],
+            },
+            "const": {
+                "type": "constant-cp",
+                "T_range": [200, 2000],
+                "H0": 1000.0,
+                "S0": 100.0,
+                "Cp": 30.0,
+            },
+            "nasa9": {
+                "type": "NASA9",
+                "T_ranges": [[200, 1000], [1000, 6000]],
+                "coefficients": [[0, 0, 2.5, 0, 0, 0, 0, 100, 1]] * 2,
+            },
+            "table": {"type": "tabular thermo", "T": [300], "p": [1e5], "Cp": [[1]]},
+        }
+    )
+    return ThermoBank.from_schema(schema)
+
+
+def test_keys_and_skipped_items(bank):
+    assert bank.keys == ["h2o-nasa7", "h2o-shomate", "const", "nasa9"]
+    assert bank.index["const"] == 2
+
+
+def test_nasa7_reference_values(bank):
+    cp, h, s, g = bank.evaluate(298.15)
+    row = bank.index["h2o-nasa7"]
+    assert cp[row, 0] == pytest.approx(33.59, abs=0.01)
+    assert h[row, 0] == pytest.approx(-241_826, abs=10)
+    assert s[row, 0] == pytest.approx(188.83, abs=0.01)
+    assert g[row, 0] == pytest.approx(h[row, 0] - 298.15 * s[row, 0])
+
+
+def test_nasa7_ranges_are_continuous(bank):
+    props = bank.evaluate([1000 - 1e-9, 1000 + 1e-9])
+    row = bank.index["h2o-nasa7"]
+    for prop in props:
+        assert prop[row, 0] == pytest.approx(prop[row, 1], rel=1e-3)
+
+
+def test_shomate_matches_nist(bank):
+    cp, h, s, _ = bank.evaluate(1000.0)
+    row = bank.index["h2o-shomate"]
+    assert cp[row, 0] == pytest.approx(41.27, abs=0.01)
+    assert s[row, 0] == pytest.approx(232.74, abs=0.01)
+    # H(1000 K) - H(298.15 K) = 26.00 kJ/mol according to NIST
+    assert h[row, 0] == pytest.approx(-241_826 + 26_000, abs=50)
+
+
+def test_constant_cp_and_nasa9(bank):
+    T = np.array([298.15, 500.0, 1500.0])
+    cp, h, s, _ = bank.evaluate(T)
+
+    row = bank.index["const"]
+    np.testing.assert_allclose(cp[row], 30.0)
+    np.testing.assert_allclose(h[row], 1000 + 30 * (T - 298.15))
+    np.testing.assert_allclose(s[row], 100 + 30 * np.log(T / 298.15))
+
+    row = bank.index["nasa9"]
+    np.testing.assert_allclose(cp[row], 2.5 * R)
+    np.testing.assert_allclose(h[row], R * (2.5 * T + 100))
+    np.testing.assert_allclose(s[row], R * (2.5 * np.log(T) + 1))
+
+
+def test_outside_of_ranges(bank):
+    row = bank.index["h2o-shomate"]
+    assert np.isnan(bank.cp([300, 2000])[row]).all()
+
+    cp = bank.cp([300, 2000], extrapolate=True)[row]
+    assert not np.isnan(cp).any()
+
+
+def test_reference_temperature_of_constant_cp():
+    thermo = {"type": "constant-cp", "T_range": [200, 2000], "H0": 0, "S0": 0, "Cp": 1}
+    schema = _schema(
+        {"a": thermo, "b": thermo | {"reference_state": {"T": 300, "p": 1e5}}},
+        default_reference_state={"T": 400, "p": 1e5},
+    )
+    bank = ThermoBank.from_schema(schema)
+    np.testing.assert_allclose(bank.h(400).ravel(), [0, 100])
+
+
+def test_non_evaluable_key(bank):
+    schema = _schema({"table": {"type": "tabular thermo", "T": [1], "p": [1]}})
+    with pytest.raises(TypeError, match="cannot be evaluated"):
+        ThermoBank.from_schema(schema, keys=["table"])
+
+
+def test_unsorted_temperatures(bank):
+    T = np.array([1500.0, 300.0, 1000.0, 700.0])
+    expected = np.stack([bank.h(t)[:, 0] for t in T], axis=1)
+    np.testing.assert_allclose(bank.h(T), expected)
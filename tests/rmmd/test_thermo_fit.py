@@ -0,0 +1,129 @@
+"""Tests for the batched fitting of NASA polynomials (rmmd.thermo_fit)."""
+
+import numpy as np
+import pytest
+
+from rmmd.schema import Schema
+from rmmd.thermo import Nasa9, ThermoParameterFitting
+from rmmd.thermo_eval import ThermoBank
+from rmmd.thermo_fit import _residual_bases, add_nasa_fits, fit_nasa
+
+# GRI-Mech 3.0 NASA7 polynomial of H2O
+_H2O_NASA7 = {
+    "type": "NASA7",
+    "T_ranges": [[200, 1000], [1000, 3500]],
+    "coefficients": [
+        [4.19864056, -2.0364341e-03, 6.52040211e-06, -5.48797062e-09,
+         1.77197817e-12, -3.02937267e04, -8.49032208e-01],
+        [3.03399249, 2.17691804e-03, -1.64072518e-07, -9.7041987e-11,
+         1.68200992e-14, -3.00042971e04, 4.9667701],
+    ],
+}  # fmt: skip
+
+
+def _schema(**kwargs) -> Schema:
+    return Schema.model_validate(
+        {"metadata": {"license": "MIT", "title": "t"}} | kwargs
+    )
+
+
+def _evaluate(thermo: dict, T: np.ndarray):
+    return ThermoBank.from_schema(_schema(thermo=thermo)).evaluate(T)
+
+
+@pytest.fixture
+def tables() -> dict:
+    """tables of different sizes and properties computed from the H2O polynomial"""
+    tables = {}
+    for n_T in (20, 35, 50):
+        T = np.linspace(300.0, 3000.0, n_T)
+        cp, h, s, g = (prop[0].tolist() for prop in _evaluate({"h2o": _H2O_NASA7}, T))
+        tables[f"table-{n_T}"] = {"type": "absolute tabular thermo", "T": T.tolist()}
+        tables[f"table-{n_T}"] |= {"p": [1e5], "H": [h], "S": [s]}
+    # unsorted table without S
+    tables["table-G"] = {
+        "type": "absolute tabular thermo",
+        "T": T.tolist()[::-1],
+        "p": [1e5],
+        "H": [h[::-1]],
+        "G": [g[::-1]],
+        "reference_state": {"T": 298.15, "p": 101325.0},
+    }
+    # table without reference state -> only Cp is fitted
+    tables["relative"] = {"type": "tabular thermo", "T": T.tolist(), "p": [1e5]}
+    tables["relative"] |= {"Cp": [cp], "H": [h], "S": [s]}
+    return tables
+
+
+@pytest.mark.parametrize("type_", ["NASA7", "NASA9"])
+def test_fit_reproduces_polynomial(tables, type_):
+    models = fit_nasa(_schema(thermo=tables).thermo.root, type_, batch_size=2, jobs=1)
+    assert models["table-20"].T_ranges == [(300.0, 1000.0), (1000.0, 3000.0)]
+    assert models["table-G"].reference_state.p == 101325.0
+
+    T = np.linspace(300.0, 3000.0, 77)
+    expected = _evaluate({"h2o": _H2O_NASA7}, T)
+    fitted = _evaluate({key: model.model_dump() for key, model in models.items()}, T)
+    assert fitted.cp == pytest.approx(np.repeat(expected.cp, 5, axis=0), abs=1e-4)
+    assert fitted.h[:4] == pytest.approx(np.repeat(expected.h, 4, axis=0), abs=1e-1)
+    assert fitted.s[:4] == pytest.approx(np.repeat(expected.s, 4, axis=0), abs=1e-4)
+
+    # relative H and S are ignored
+    assert models["relative"].coefficients[0][-2:] == [0.0, 0.0]
+
+
+def test_continuity_at_breakpoint():
+    rng = np.random.default_rng(0)
+    T = np.linspace(300.0, 2500.0, 40)
+    table = {"type": "tabular thermo", "T": T.tolist(), "p": [1e5]}
+    table |= {"Cp": [(30 + 0.01 * T + rng.normal(0, 2, T.size)).tolist()]}
+    model = fit_nasa(_schema(thermo={"t": table}).thermo.root, "NASA9", 1200.0)["t"]
+
+    assert isinstance(model, Nasa9)
+    bases = _residual_bases("NASA9", np.array([1200.0]))[..., 0]
+    low, high = (bases @ np.array(c) for c in model.coefficients)
+    assert low == pytest.approx(high)
+
+
+def test_missing_integration_constants_are_zero_in_lower_range():
+    T = np.linspace(300.0, 2500.0, 40)
+    table = {"type": "tabular thermo", "T": T.tolist(), "p": [1e5]}
+    table |= {"Cp": [np.where(T < 1000, 30 + 0.01 * T, 40 + 0.02 * T).tolist()]}
+    model = fit_nasa(_schema(thermo={"t": table}).thermo.root)["t"]
+    assert model.coefficients[0][5:] == [0.0, 0.0]
+    assert model.coefficients[1][5:] != pytest.approx([0.0, 0.0])
+
+
+def test_underdetermined_table_is_rejected():
+    table = {"type": "tabular thermo", "T": [300.0, 2000.0], "p": [1e5]}
+    table |= {"Cp": [[30.0, 50.0]]}
+    with pytest.raises(ValueError, match="'two-points'.*too few temperatures"):
+        fit_nasa(_schema(thermo={"two-points": table}).thermo.root)
+
+
+def test_add_nasa_fits(tables):
+    schema = _schema(
+        thermo=tables,
+        species={
+            "H2O": {"entities": ["h2o"], "thermo": ["table-20", "table-35"]},
+            "X": {"entities": ["x"], "thermo": ["relative"]},
+        },
+    )
+    added = add_nasa_fits(schema, jobs=2, batch_size=1)
+    assert set(added) == set(tables)
+
+    thermo_key, calc_key = added["table-35"]
+    assert schema.thermo[thermo_key].type == "NASA7"
+    fitting = schema.calculations[calc_key]
+    assert isinstance(fitting, ThermoParameterFitting)
+    assert fitting.input.fitted_to.thermo == ["table-35"]
+    assert fitting.output.thermo == thermo_key
+    assert schema.species["H2O"].thermo[2:] == [added["table-20"][0], thermo_key]
+
+    # fits of relative data are not assigned to species
+    assert schema.species["X"].thermo == ["relative"]
+    assert "Cp only" in schema.calculations[added["relative"][1]].description
+
+    # the result is a valid dataset
+    data = schema.model_dump(mode="json", by_alias=True, exclude_none=True)
+    assert Schema.model_validate(data) == schema
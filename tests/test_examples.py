@@ -1,6 +1,7 @@
 from pathlib import Path
 
 from rmmd import schema
+from rmmd.io import load_yaml
 from rmmd.test import assert_model_validation_errors
 import yaml
 import pytest
@@ -45,7 +46,7 @@ def _load_examples():
     for file in example_files:
         try:
             with open(file, "r", encoding="utf-8") as f:
-                data = yaml.safe_load(f)
+                data = load_yaml(f)
 
         except (yaml.YAMLError, OSError) as err:
             _errors_during_setup.append((str(file), f"Could not read file: {err}"))
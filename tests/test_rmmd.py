@@ -2,6 +2,7 @@ from pathlib import Path
 from typing import Any, Literal
 
 
+from rmmd.io import load_yaml_all
 from rmmd.test import ExpectedError, assert_model_validation_errors
 import yaml
 import pytest
@@ -79,7 +80,7 @@ def _load_test_cases():
     for file in example_files:
         try:
             with open(file, "rb") as f:
-                content = yaml.safe_load_all(f)
+                content = load_yaml_all(f)
                 # convert generator to list
                 content = [block for block in content]
 